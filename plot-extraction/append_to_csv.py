@@ -12,7 +12,7 @@ import csv
 import shutil
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 from collections import defaultdict, Counter
 
 # ASCII-safe print wrapper (strip emojis) for Windows console encoding
@@ -241,18 +241,23 @@ def generate_summary_report(
     }
 
 
-def main():
-    """Main append function."""
-    
-    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
-    data_path = base_path / "data"
-    output_path = base_path / "output"
-    
-    # File paths
-    target_csv = data_path / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
-    new_elements_csv = output_path / "new_design_elements.csv"
-    summary_report_path = output_path / "append_summary_report.txt"
+def run_append(
+    target_csv: Path,
+    new_elements_csv: Path,
+    summary_report_path: Path
+) -> Optional[Dict]:
+    """
+    Append new elements to DESIGNELEMENTS.csv with backup, verification and report.
     
+    Args:
+        target_csv: Path to DESIGNELEMENTS.csv
+        new_elements_csv: Path to new_design_elements.csv
+        summary_report_path: Path to save the summary report
+        
+    Returns:
+        Dictionary with 'stats', 'new_elements', 'rows_appended' and 'backup_path',
+        or None if an input file is missing
+    """
     print("="*80)
     print("CSV APPEND - STEP 5")
     print("="*80)
@@ -260,11 +265,11 @@ def main():
     # Validate files exist
     if not target_csv.exists():
         print(f"\n❌ Error: Target CSV not found: {target_csv}")
-        return False
+        return None
     
     if not new_elements_csv.exists():
         print(f"\n❌ Error: New elements CSV not found: {new_elements_csv}")
-        return False
+        return None
     
     # Count existing rows
     print(f"\n📊 Current state:")
@@ -341,7 +346,27 @@ def main():
     print(f"   Backup:      {backup_path}")
     print(f"   Report:      {summary_report_path}")
     
-    return True
+    return {
+        'stats': stats,
+        'new_elements': new_elements,
+        'rows_appended': rows_appended,
+        'backup_path': backup_path
+    }
+
+
+def main():
+    """Main append function."""
+    
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+    data_path = base_path / "data"
+    output_path = base_path / "output"
+    
+    # File paths
+    target_csv = data_path / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
+    new_elements_csv = output_path / "new_design_elements.csv"
+    summary_report_path = output_path / "append_summary_report.txt"
+    
+    return run_append(target_csv, new_elements_csv, summary_report_path) is not None
 
 
 if __name__ == "__main__":
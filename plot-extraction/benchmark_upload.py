@@ -0,0 +1,146 @@
+"""
+Upload Benchmark
+================
+
+Measures upload throughput against a local stand-in server for every
+combination of batch size and concurrency:
+1. Each run uploads the same elements to a fresh StandInServer
+2. Per-request and per-row server latency simulate the remote API
+3. Results (rows/s, requests, connections, bytes) are printed and saved
+
+Usage:
+    python benchmark_upload.py --csv output/new_design_elements.csv --batch-sizes 100,500,1000 --concurrency 1,4,8
+
+Date: October 18, 2026
+"""
+
+import argparse
+import csv
+from pathlib import Path
+from typing import Dict, List
+
+from uploader import (
+    BulkUploader,
+    StandInServer,
+    load_elements,
+    external_parent_ids
+)
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+def run_benchmark(
+    elements: List[Dict[str, str]],
+    batch_sizes: List[int],
+    concurrencies: List[int],
+    latency: float,
+    row_latency: float,
+    compress: bool = True
+) -> List[Dict]:
+    """
+    Upload elements once per (batch size, concurrency) combination.
+
+    Args:
+        elements: Elements to upload
+        batch_sizes: Batch sizes to try
+        concurrencies: Connection counts to try
+        latency: Stand-in latency per request (seconds)
+        row_latency: Stand-in latency per element (seconds)
+        compress: Gzip request bodies
+
+    Returns:
+        One result dictionary per run
+    """
+    known_ids = external_parent_ids(elements)
+    results = []
+
+    for batch_size in batch_sizes:
+        for concurrency in concurrencies:
+            with StandInServer(known_ids=known_ids, latency=latency, row_latency=row_latency) as server:
+                uploader = BulkUploader(server.url, batch_size=batch_size, concurrency=concurrency, compress=compress)
+                stats = uploader.upload(elements)
+                stored = len(server.elements)
+
+            result = {
+                'batch_size': batch_size,
+                'concurrency': concurrency,
+                'rows': stats.rows_sent,
+                'stored': stored,
+                'requests': stats.batches_sent + stats.retries,
+                'connections': stats.connections_opened,
+                'sent_bytes': stats.sent_bytes,
+                'raw_bytes': stats.raw_bytes,
+                'seconds': round(stats.seconds, 3),
+                'rows_per_second': round(stats.rows_per_second())
+            }
+            results.append(result)
+            print(f"   batch {batch_size:>5}  x{concurrency:<3} {result['seconds']:>8.2f} s  "
+                  f"{result['rows_per_second']:>10,} rows/s  {result['requests']:>5} requests  "
+                  f"{result['connections']:>3} connections")
+
+    return results
+
+
+def write_results(results: List[Dict], output_file: Path):
+    """Write benchmark results to CSV."""
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(',') if v.strip()]
+
+
+def main():
+    """Main entry point."""
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+
+    parser = argparse.ArgumentParser(description="Benchmark upload throughput against a local stand-in server.")
+    parser.add_argument("--csv", default=None, help="Elements to upload (default: output/new_design_elements.csv).")
+    parser.add_argument("--limit", type=int, default=None, help="Only upload the first N elements.")
+    parser.add_argument("--batch-sizes", type=_int_list, default=[100, 250, 500, 1000])
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 2, 4, 8])
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Stand-in latency per request (ms).")
+    parser.add_argument("--row-latency-us", type=float, default=20.0, help="Stand-in latency per element (us).")
+    parser.add_argument("--no-gzip", action="store_true", help="Send uncompressed request bodies.")
+    parser.add_argument("--output", default=None, help="Results CSV (default: output/upload_benchmark.csv).")
+    args = parser.parse_args()
+
+    csv_path = Path(args.csv) if args.csv else base_path / "output" / "new_design_elements.csv"
+    output_file = Path(args.output) if args.output else base_path / "output" / "upload_benchmark.csv"
+
+    elements = load_elements(csv_path)
+    if args.limit:
+        elements = elements[:args.limit]
+
+    print("="*80)
+    print("UPLOAD BENCHMARK")
+    print("="*80)
+    print(f"\n📄 {len(elements):,} elements, stand-in latency {args.latency_ms:g} ms/request + {args.row_latency_us:g} us/row\n")
+
+    results = run_benchmark(
+        elements,
+        args.batch_sizes,
+        args.concurrency,
+        latency=args.latency_ms / 1000,
+        row_latency=args.row_latency_us / 1e6,
+        compress=not args.no_gzip
+    )
+
+    best = max(results, key=lambda r: r['rows_per_second'])
+    print(f"\n🏁 Best: batch {best['batch_size']} x{best['concurrency']} ({best['rows_per_second']:,} rows/s)")
+
+    write_results(results, output_file)
+    print(f"💾 Results written to: {output_file}")
+
+
+if __name__ == "__main__":
+    main()
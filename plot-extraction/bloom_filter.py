@@ -0,0 +1,120 @@
+"""
+Bloom Filter
+============
+
+Probabilistic membership filter over design element keys:
+1. "Not present" answers are definite, so the lookup behind the filter
+   (a dictionary probe, or a binary search plus CSV read in key_index.py)
+   is skipped for genuinely new elements
+2. "Maybe present" answers are wrong with the configured false-positive
+   rate; the real lookup then decides
+3. Size follows from the expected number of keys and the false-positive
+   rate, optionally capped in bytes (the expected rate is then reported)
+
+Keys are 8-byte digests (lookup_builder.element_key_hash); the k bit
+positions are derived from the two halves by double hashing.
+
+Date: October 18, 2026
+"""
+
+import math
+import struct
+from typing import Dict, Optional
+
+
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+MAX_BITS = 2 ** 32
+HEADER = struct.Struct('<QIQ')
+
+
+class BloomFilter:
+    """Fixed-size bit array with k hash positions per key."""
+
+    def __init__(self, bits: int, hashes: int, data=None, count: int = 0):
+        self.bits = bits
+        self.hashes = hashes
+        self.data = data if data is not None else bytearray((bits + 7) // 8)
+        self.count = count
+
+    @classmethod
+    def for_capacity(
+        cls,
+        capacity: int,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+        max_bytes: Optional[int] = None
+    ) -> 'BloomFilter':
+        """
+        Filter sized for capacity keys at false_positive_rate.
+
+        Args:
+            capacity: Expected number of keys
+            false_positive_rate: Target rate of wrong "maybe present" answers
+            max_bytes: Optional memory cap (the rate is then higher)
+
+        >>> bloom = BloomFilter.for_capacity(1000, 0.01)
+        >>> bloom.bits, bloom.hashes
+        (9586, 7)
+        >>> BloomFilter.for_capacity(1000, 0.01, max_bytes=256).bits
+        2048
+        """
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+        capacity = max(1, capacity)
+        bits = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        if max_bytes is not None:
+            bits = min(bits, max(8, max_bytes * 8))
+        bits = min(bits, MAX_BITS)
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        return cls(bits, hashes)
+
+    def _positions(self, digest: bytes):
+        h1 = int.from_bytes(digest[:4], 'big')
+        h2 = int.from_bytes(digest[4:8], 'big') | 1
+        bits = self.bits
+        return ((h1 + i * h2) % bits for i in range(self.hashes))
+
+    def add(self, digest: bytes):
+        data = self.data
+        for position in self._positions(digest):
+            data[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, digest: bytes) -> bool:
+        data = self.data
+        for position in self._positions(digest):
+            if not data[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data)
+
+    def expected_false_positive_rate(self) -> float:
+        """False-positive rate for the keys added so far."""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+    def to_bytes(self) -> bytes:
+        return HEADER.pack(self.bits, self.hashes, self.count) + bytes(self.data)
+
+    @classmethod
+    def from_buffer(cls, buffer) -> 'BloomFilter':
+        """
+        Filter over a to_bytes() buffer (not copied, e.g. a memoryview of an mmap).
+
+        >>> bloom = BloomFilter.for_capacity(100)
+        >>> bloom.add(bytes(range(8)))
+        >>> loaded = BloomFilter.from_buffer(bloom.to_bytes())
+        >>> bytes(range(8)) in loaded, bytes(8) in loaded, loaded.count
+        (True, False, 1)
+        """
+        bits, hashes, count = HEADER.unpack_from(buffer, 0)
+        return cls(bits, hashes, data=memoryview(buffer)[HEADER.size:HEADER.size + (bits + 7) // 8], count=count)
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'bloom_keys': self.count,
+            'bloom_bytes': self.nbytes,
+            'bloom_hashes': self.hashes,
+            'bloom_expected_fpr': round(self.expected_false_positive_rate(), 6)
+        }
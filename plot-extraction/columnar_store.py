@@ -0,0 +1,626 @@
+"""
+Columnar Design Element Store
+=============================
+
+Binary, dictionary-encoded columnar copy of DESIGNELEMENTS.csv that is read
+through mmap instead of being parsed:
+1. ID / PARENT_ID: 16-byte UUIDs (empty PARENT_ID = 16 zero bytes)
+2. PROJECT_ID / TYPE: dictionary codes (uint16 / uint8)
+3. NAME: offset-indexed UTF-8 string heap
+4. by_parent: row permutation sorted by PARENT_ID (children lookups by
+   binary search)
+
+Values that are not canonical lowercase UUIDs, rows that do not have
+exactly the header's columns and line endings are kept verbatim in the
+metadata, so export → import reproduces the CSV byte for byte (for files
+written with minimal quoting, as csv.writer does). Sections can be
+zlib-compressed (smaller file, but they are then decompressed on load
+instead of mapped).
+
+File layout (little-endian):
+    header:    magic "DECOL\\0\\0\\1", version u32, section count u32, row count u64
+    directory: per section name[8], codec u8, pad[7], offset u64, stored u64, raw u64
+    sections:  8-byte aligned
+
+Usage:
+    python columnar_store.py export --csv data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv --output data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.decol
+    python columnar_store.py import --store data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.decol --output restored.csv
+    python columnar_store.py info --store data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.decol
+
+Date: October 18, 2026
+"""
+
+import argparse
+import csv
+import json
+import mmap
+import struct
+import sys
+import time
+import uuid
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+COLUMNAR_SUFFIX = ".decol"
+
+MAGIC = b"DECOL\0\0\1"
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sIIQ')
+DIRECTORY_ENTRY = struct.Struct('<8sB7xQQQ')
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+
+COLUMNS = ['ID', 'PROJECT_ID', 'NAME', 'TYPE', 'PARENT_ID']
+ID_COLUMN, PARENT_COLUMN = 0, 4
+
+DECODE_CHUNK_ROWS = 8192
+EMPTY_UUID = bytes(16)
+
+# (ID, PROJECT_ID, NAME, TYPE, PARENT_ID)
+ElementRow = Tuple[str, str, str, str, str]
+
+
+class ColumnarFormatError(Exception):
+    """Raised when a file is not a readable columnar store."""
+    pass
+
+
+def uuid_to_bytes(value: str) -> Optional[bytes]:
+    """
+    Encode a canonical (lowercase, hyphenated) UUID as 16 bytes.
+
+    Returns:
+        16 bytes, or None if the value would not round-trip exactly
+
+    Examples:
+        >>> uuid_to_bytes('b9af7998-a59e-4881-a1e6-ce0084ecd3bc').hex()
+        'b9af7998a59e4881a1e6ce0084ecd3bc'
+        >>> uuid_to_bytes('B9AF7998-A59E-4881-A1E6-CE0084ECD3BC') is None
+        True
+        >>> uuid_to_bytes('') is None
+        True
+    """
+    if len(value) != 36:
+        return None
+    try:
+        raw = uuid.UUID(value).bytes
+    except ValueError:
+        return None
+    return raw if bytes_to_uuid(raw) == value else None
+
+
+def bytes_to_uuid(raw: bytes) -> str:
+    """Format 16 bytes as a lowercase hyphenated UUID."""
+    h = raw.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+class _LineTap:
+    """Line iterator for csv.reader that remembers the last line ending."""
+
+    def __init__(self, f):
+        self.f = f
+        self.terminator = ''
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = next(self.f)
+        self.terminator = '\r\n' if line.endswith('\r\n') else ('\n' if line.endswith('\n') else '')
+        return line
+
+
+class _ColumnBuilder:
+    """Column buffers filled row by row during export."""
+
+    def __init__(self):
+        self.ids = bytearray()
+        self.parents = bytearray()
+        self.project_codes = array('H')
+        self.type_codes = array('B')
+        self.name_offsets = array('I', [0])
+        self.names = bytearray()
+        self.projects: Dict[str, int] = {}
+        self.types: Dict[str, int] = {}
+        self.exceptions: Dict[str, str] = {}
+        self.extra_rows: List[Tuple[int, List[str]]] = []
+        self.terminators: List[Tuple[int, str]] = []     # (position, line end) where it changes
+        self.position = 0
+
+    def add(self, fields: List[str], terminator: str):
+        """Add one CSV row (rows with another column count are kept verbatim)."""
+        position = self.position
+        self.position += 1
+        if not self.terminators or self.terminators[-1][1] != terminator:
+            self.terminators.append((position, terminator))
+        if len(fields) != len(COLUMNS):
+            self.extra_rows.append((position, fields))
+            return
+
+        row = len(self.project_codes)
+        element_id, project_id, name, element_type, parent_id = fields
+
+        encoded = uuid_to_bytes(element_id)
+        if encoded is None:
+            self.exceptions[f"{row},{ID_COLUMN}"] = element_id
+            encoded = EMPTY_UUID
+        self.ids += encoded
+
+        encoded = EMPTY_UUID if parent_id == '' else uuid_to_bytes(parent_id)
+        if encoded is None or (encoded == EMPTY_UUID and parent_id != ''):
+            self.exceptions[f"{row},{PARENT_COLUMN}"] = parent_id
+            encoded = EMPTY_UUID
+        self.parents += encoded
+
+        self.project_codes.append(self.projects.setdefault(project_id, len(self.projects)))
+        self.type_codes.append(self.types.setdefault(element_type, len(self.types)))
+        self.names += name.encode('utf-8')
+        self.name_offsets.append(len(self.names))
+
+
+def export_columnar(csv_path: Path, store_path: Path, compress: bool = False) -> Dict[str, int]:
+    """
+    Write a DESIGNELEMENTS CSV as a columnar store (temp file + rename).
+
+    Args:
+        csv_path: DESIGNELEMENTS.csv
+        store_path: Output .decol file
+        compress: zlib-compress the sections
+
+    Returns:
+        Dictionary with 'rows', 'extra_rows', 'exceptions', 'bytes'
+    """
+    builder = _ColumnBuilder()
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        tap = _LineTap(f)
+        reader = csv.reader(tap)
+        columns = next(reader, [])
+        if [c.strip().upper() for c in columns] != COLUMNS:
+            raise ColumnarFormatError(f"Unexpected header in {csv_path.name}: {columns}")
+        header_terminator = tap.terminator
+        for fields in reader:
+            builder.add(fields, tap.terminator)
+
+    rows = len(builder.project_codes)
+    parents = builder.parents
+    by_parent = array('I', sorted(range(rows), key=lambda i: (parents[i * 16:(i + 1) * 16], i)))
+
+    meta = {
+        'columns': columns,
+        'header_terminator': header_terminator,
+        'terminators': builder.terminators,
+        'byteorder': sys.byteorder,
+        'projects': list(builder.projects),
+        'types': list(builder.types),
+        'exceptions': builder.exceptions,
+        'extra_rows': builder.extra_rows,
+        'source': str(csv_path)
+    }
+    sections = [
+        (b'meta', json.dumps(meta).encode('utf-8')),
+        (b'ids', bytes(builder.ids)),
+        (b'parents', bytes(parents)),
+        (b'project', builder.project_codes.tobytes()),
+        (b'type', builder.type_codes.tobytes()),
+        (b'name_off', builder.name_offsets.tobytes()),
+        (b'names', bytes(builder.names)),
+        (b'bparent', by_parent.tobytes())
+    ]
+
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = store_path.with_suffix(store_path.suffix + '.tmp')
+    offset = HEADER.size + DIRECTORY_ENTRY.size * len(sections)
+    directory = []
+    payloads = []
+    for name, data in sections:
+        offset += -offset % 8
+        stored = zlib.compress(data, 6) if compress else data
+        directory.append(DIRECTORY_ENTRY.pack(name, CODEC_ZLIB if compress else CODEC_RAW, offset, len(stored), len(data)))
+        payloads.append((offset, stored))
+        offset += len(stored)
+
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(sections), rows))
+        for entry in directory:
+            f.write(entry)
+        for section_offset, stored in payloads:
+            f.write(b'\0' * (section_offset - f.tell()))
+            f.write(stored)
+        size = f.tell()
+    temp_path.replace(store_path)
+
+    return {'rows': rows, 'extra_rows': len(builder.extra_rows), 'exceptions': len(builder.exceptions), 'bytes': size}
+
+
+class ColumnarStore:
+    """Read-only view of a .decol file (sections mapped, not parsed)."""
+
+    def __init__(self, store_path: Path):
+        self.store_path = Path(store_path)
+        self._file = open(self.store_path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ColumnarFormatError(f"{self.store_path.name} is empty")
+        self._views: List[memoryview] = []
+
+        magic, version, section_count, self.rows = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.close()
+            raise ColumnarFormatError(f"{self.store_path.name} is not a version {FORMAT_VERSION} columnar store")
+
+        self.sections: Dict[str, Tuple[int, int, int, int]] = {}
+        for i in range(section_count):
+            name, codec, offset, stored, raw = DIRECTORY_ENTRY.unpack_from(self._mmap, HEADER.size + i * DIRECTORY_ENTRY.size)
+            self.sections[name.rstrip(b'\0').decode('ascii')] = (codec, offset, stored, raw)
+
+        self.meta = json.loads(bytes(self._section('meta')))
+        self.columns: List[str] = self.meta['columns']
+        self.projects: List[str] = self.meta['projects']
+        self.types: List[str] = self.meta['types']
+        self.exceptions: Dict[str, str] = self.meta['exceptions']
+        self.exception_rows = sorted({int(key.split(',')[0]) for key in self.exceptions})
+        self.extra_rows: List[Tuple[int, List[str]]] = [tuple(r) for r in self.meta['extra_rows']]
+
+        self.ids = self._section('ids')
+        self.parents = self._section('parents')
+        self.names = self._section('names')
+        self.project_codes = self._typed_section('project', 'H')
+        self.type_codes = self._typed_section('type', 'B')
+        self.name_offsets = self._typed_section('name_off', 'I')
+        self.by_parent = self._typed_section('bparent', 'I')
+
+    def _section(self, name: str):
+        codec, offset, stored, raw = self.sections[name]
+        if codec == CODEC_ZLIB:
+            return memoryview(zlib.decompress(self._mmap[offset:offset + stored]))
+        view = memoryview(self._mmap)[offset:offset + stored]
+        self._views.append(view)
+        return view
+
+    def _typed_section(self, name: str, typecode: str):
+        view = self._section(name)
+        if self.meta['byteorder'] != sys.byteorder and typecode != 'B':
+            values = array(typecode, bytes(view))
+            values.byteswap()
+            return values
+        typed = view.cast(typecode)
+        self._views.append(typed)
+        return typed
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def id_at(self, row: int) -> str:
+        exception = self.exceptions.get(f"{row},{ID_COLUMN}")
+        return exception if exception is not None else bytes_to_uuid(bytes(self.ids[row * 16:(row + 1) * 16]))
+
+    def parent_at(self, row: int) -> str:
+        exception = self.exceptions.get(f"{row},{PARENT_COLUMN}")
+        if exception is not None:
+            return exception
+        raw = bytes(self.parents[row * 16:(row + 1) * 16])
+        return '' if raw == EMPTY_UUID else bytes_to_uuid(raw)
+
+    def name_at(self, row: int) -> str:
+        return bytes(self.names[self.name_offsets[row]:self.name_offsets[row + 1]]).decode('utf-8')
+
+    def row(self, row: int) -> ElementRow:
+        return (
+            self.id_at(row),
+            self.projects[self.project_codes[row]],
+            self.name_at(row),
+            self.types[self.type_codes[row]],
+            self.parent_at(row)
+        )
+
+    def _decode_ids(self, column, start: int, stop: int, repeated: bool = False) -> List[str]:
+        """
+        UUID strings for rows [start, stop) of a 16-byte column, one hex() call per chunk.
+
+        With repeated=True each distinct value is formatted once (PARENT_ID
+        repeats for every row of a block).
+        """
+        return self._format_ids(column[start * 16:stop * 16].hex(), repeated)
+
+    @staticmethod
+    def _format_ids(text: str, repeated: bool = False) -> List[str]:
+        """UUID strings for the hex text of consecutive 16-byte values."""
+        if not repeated:
+            return [
+                f"{text[i:i + 8]}-{text[i + 8:i + 12]}-{text[i + 12:i + 16]}-{text[i + 16:i + 20]}-{text[i + 20:i + 32]}"
+                for i in range(0, len(text), 32)
+            ]
+        formatted = {'0' * 32: ''}
+        ids = []
+        for i in range(0, len(text), 32):
+            key = text[i:i + 32]
+            value = formatted.get(key)
+            if value is None:
+                value = formatted[key] = f"{key[:8]}-{key[8:12]}-{key[12:16]}-{key[16:20]}-{key[20:]}"
+            ids.append(value)
+        return ids
+
+    def _decode_chunk(self, start: int, stop: int) -> List[ElementRow]:
+        ids = self._decode_ids(self.ids, start, stop)
+        parents = self._decode_ids(self.parents, start, stop, repeated=True)
+        offsets = self.name_offsets
+        base = offsets[start]
+        heap = bytes(self.names[base:offsets[stop]])
+        projects, types = self.projects, self.types
+        project_codes, type_codes = self.project_codes, self.type_codes
+
+        bounds = [o - base for o in offsets[start:stop + 1]]
+        names = [heap[a:b].decode('utf-8') for a, b in zip(bounds, bounds[1:])]
+        rows = list(zip(
+            ids,
+            map(projects.__getitem__, project_codes[start:stop]),
+            names,
+            map(types.__getitem__, type_codes[start:stop]),
+            parents
+        ))
+        for row in self.exception_rows:
+            if start <= row < stop:
+                rows[row - start] = self.row(row)
+        return rows
+
+    def _decode_selected(self, start: int, keep: List[int]) -> List[ElementRow]:
+        """Rows start + i for i in keep (ascending), leaving the rows between them undecoded."""
+        rows = [start + i for i in keep]
+        ids = self._format_ids(b''.join([self.ids[r * 16:(r + 1) * 16] for r in rows]).hex())
+        parents = self._format_ids(b''.join([self.parents[r * 16:(r + 1) * 16] for r in rows]).hex(), repeated=True)
+        offsets, heap = self.name_offsets, self.names
+        projects, types = self.projects, self.types
+        project_codes, type_codes = self.project_codes, self.type_codes
+
+        selected = [
+            (ids[n], projects[project_codes[r]], str(heap[offsets[r]:offsets[r + 1]], 'utf-8'), types[type_codes[r]], parents[n])
+            for n, r in enumerate(rows)
+        ]
+        if self.exception_rows:
+            exceptions = set(self.exception_rows)
+            for n, r in enumerate(rows):
+                if r in exceptions:
+                    selected[n] = self.row(r)
+        return selected
+
+    def iter_rows(
+        self,
+        project_ids: Optional[Iterable[str]] = None,
+        element_types: Optional[Iterable[str]] = None,
+        chunk_rows: int = DECODE_CHUNK_ROWS
+    ) -> Iterator[ElementRow]:
+        """
+        Rows with the header's columns, in file order.
+
+        Rows are decoded a chunk at a time (one hex() and one heap copy per
+        chunk) rather than field by field; with filters, chunks where few
+        rows pass decode only those rows.
+
+        Args:
+            project_ids: Optional PROJECT_IDs to keep (case-insensitive);
+                other rows are skipped by their project code, undecoded
+            element_types: Optional TYPEs to keep (case-insensitive);
+                other rows are skipped by their type code, undecoded
+            chunk_rows: Rows decoded per chunk
+        """
+        project_codes = self._wanted_codes(self.projects, project_ids, str.lower)
+        type_codes = self._wanted_codes(self.types, element_types, str.upper)
+        if project_codes is None and type_codes is None:
+            for start in range(0, self.rows, chunk_rows):
+                yield from self._decode_chunk(start, min(start + chunk_rows, self.rows))
+            return
+        for start in range(0, self.rows, chunk_rows):
+            stop = min(start + chunk_rows, self.rows)
+            keep = range(stop - start)
+            if project_codes is not None:
+                column = self.project_codes[start:stop]
+                keep = [i for i in keep if column[i] in project_codes]
+            if type_codes is not None:
+                column = self.type_codes[start:stop]
+                keep = [i for i in keep if column[i] in type_codes]
+            if len(keep) == stop - start:
+                yield from self._decode_chunk(start, stop)
+            elif len(keep) * 2 > stop - start:
+                # Decoding the whole chunk is cheaper per row
+                chunk = self._decode_chunk(start, stop)
+                yield from (chunk[i] for i in keep)
+            elif keep:
+                yield from self._decode_selected(start, keep)
+
+    @staticmethod
+    def _wanted_codes(values: List[str], wanted: Optional[Iterable[str]], fold) -> Optional[Set[int]]:
+        """Dictionary codes of the wanted values (None = keep every row)."""
+        if wanted is None:
+            return None
+        wanted = {fold(w) for w in wanted}
+        codes = {code for code, value in enumerate(values) if fold(value.strip()) in wanted}
+        return None if len(codes) == len(values) else codes
+
+    def iter_all_rows(self) -> Iterator[List[str]]:
+        """Every row in original order, including rows with other column counts."""
+        rows = self.iter_rows()
+        position = 0
+        for extra_position, fields in self.extra_rows:
+            for _ in range(extra_position - position):
+                yield list(next(rows))
+            yield list(fields)
+            position = extra_position + 1
+        for row in rows:
+            yield list(row)
+
+    def children(self, parent_id: str) -> List[int]:
+        """Rows whose PARENT_ID is parent_id (canonical UUIDs), via by_parent."""
+        key = uuid_to_bytes(parent_id.lower())
+        if key is None:
+            return []
+        parents, order = self.parents, self.by_parent
+
+        def parent_key(i: int) -> bytes:
+            row = order[i]
+            return bytes(parents[row * 16:(row + 1) * 16])
+
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if parent_key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        rows = []
+        while lo < len(order) and parent_key(lo) == key:
+            if f"{order[lo]},{PARENT_COLUMN}" not in self.exceptions:
+                rows.append(order[lo])
+            lo += 1
+        return rows
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'ColumnarStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def import_columnar(store_path: Path, csv_path: Path) -> int:
+    """
+    Write a columnar store back to CSV (same header, line endings, rows).
+
+    Args:
+        store_path: .decol file
+        csv_path: Output CSV
+
+    Returns:
+        Number of rows written
+    """
+    with ColumnarStore(store_path) as store:
+        temp_path = csv_path.with_suffix(csv_path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+            writers = {}
+
+            def writer_for(terminator: str):
+                if terminator not in writers:
+                    writers[terminator] = csv.writer(f, lineterminator=terminator)
+                return writers[terminator]
+
+            writer_for(store.meta['header_terminator']).writerow(store.columns)
+            changes = iter(store.meta['terminators'])
+            next_change = next(changes, None)
+            writer = None
+            rows = 0
+            for position, fields in enumerate(store.iter_all_rows()):
+                if next_change is not None and next_change[0] == position:
+                    writer = writer_for(next_change[1])
+                    next_change = next(changes, None)
+                writer.writerow(fields)
+                rows += 1
+    temp_path.replace(csv_path)
+    return rows
+
+
+def print_info(store_path: Path, csv_path: Optional[Path] = None):
+    """Print section sizes and, with a CSV, compare load times."""
+    print("="*80)
+    print("COLUMNAR STORE")
+    print("="*80)
+
+    started = time.perf_counter()
+    with ColumnarStore(store_path) as store:
+        opened = time.perf_counter() - started
+        print(f"\n📄 {store_path.name}: {len(store):,} rows, {len(store.projects)} projects, {len(store.types)} types")
+        print(f"   Opened in {opened * 1000:.1f} ms")
+        for name, (codec, offset, stored, raw) in store.sections.items():
+            codec_name = 'zlib' if codec == CODEC_ZLIB else 'raw'
+            print(f"   {name:<9} {stored:>12,} bytes ({codec_name}, {raw:,} raw)")
+        if store.exceptions or store.extra_rows:
+            print(f"   ⚠️  {len(store.exceptions)} verbatim values, {len(store.extra_rows)} rows with other column counts")
+
+        started = time.perf_counter()
+        type_counts: Dict[str, int] = {}
+        for code in store.type_codes:
+            type_counts[store.types[code]] = type_counts.get(store.types[code], 0) + 1
+        print(f"\n🔍 Type counts from codes in {(time.perf_counter() - started) * 1000:.1f} ms: {type_counts}")
+
+        started = time.perf_counter()
+        decoded = sum(1 for _ in store.iter_rows())
+        print(f"   Decoded {decoded:,} rows in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    if csv_path:
+        started = time.perf_counter()
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            parsed = sum(1 for _ in csv.DictReader(f))
+        print(f"   CSV: parsed {parsed:,} rows in {(time.perf_counter() - started) * 1000:.1f} ms "
+              f"({csv_path.stat().st_size:,} bytes vs {store_path.stat().st_size:,})")
+
+
+def main():
+    """Main entry point."""
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+    default_csv = base_path / "data" / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
+    default_store = default_csv.with_suffix(COLUMNAR_SUFFIX)
+
+    parser = argparse.ArgumentParser(description="Columnar export/import of DESIGNELEMENTS.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="CSV → columnar store.")
+    export_parser.add_argument("--csv", default=None)
+    export_parser.add_argument("--output", default=None)
+    export_parser.add_argument("--compress", action="store_true", help="zlib-compress sections (not mmap-able).")
+    export_parser.add_argument("--verify", action="store_true", help="Re-import and compare with the CSV bytes.")
+
+    import_parser = subparsers.add_parser("import", help="Columnar store → CSV.")
+    import_parser.add_argument("--store", default=None)
+    import_parser.add_argument("--output", required=True)
+
+    info_parser = subparsers.add_parser("info", help="Show sections and load times.")
+    info_parser.add_argument("--store", default=None)
+    info_parser.add_argument("--csv", default=None, help="CSV to compare parse time with.")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        csv_path = Path(args.csv) if args.csv else default_csv
+        store_path = Path(args.output) if args.output else csv_path.with_suffix(COLUMNAR_SUFFIX)
+        started = time.perf_counter()
+        stats = export_columnar(csv_path, store_path, compress=args.compress)
+        print(f"✅ {stats['rows']:,} rows → {store_path} ({stats['bytes']:,} bytes, "
+              f"{csv_path.stat().st_size:,} as CSV) in {time.perf_counter() - started:.2f} s")
+        if stats['exceptions'] or stats['extra_rows']:
+            print(f"   ⚠️  {stats['exceptions']} verbatim values, {stats['extra_rows']} rows with other column counts")
+        if args.verify:
+            restored = store_path.with_suffix('.verify.csv')
+            import_columnar(store_path, restored)
+            identical = restored.read_bytes() == csv_path.read_bytes()
+            restored.unlink()
+            print(f"{'✅' if identical else '❌'} Round trip {'is byte-identical' if identical else 'differs from the CSV'}")
+            if not identical:
+                sys.exit(1)
+    elif args.command == "import":
+        store_path = Path(args.store) if args.store else default_store
+        rows = import_columnar(store_path, Path(args.output))
+        print(f"✅ {rows:,} rows → {args.output}")
+    else:
+        print_info(Path(args.store) if args.store else default_store, Path(args.csv) if args.csv else None)
+
+
+if __name__ == "__main__":
+    main()
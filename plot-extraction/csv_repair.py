@@ -0,0 +1,452 @@
+"""
+DESIGNELEMENTS Repair Engine
+============================
+
+Streams DESIGNELEMENTS.csv once and writes a repaired copy:
+1. Stray whitespace around fields is stripped, and a missing trailing
+   newline is added
+2. Glued rows (a row appended to a file without a trailing newline, so the
+   PARENT_ID of one row and the ID of the next share a field) are split
+3. Rows with a wrong field count that cannot be split are moved to a
+   rejects file (LINE + the columns, timestamped like the backup); a PLOT
+   row missing only its empty PARENT_ID is padded
+4. Exact duplicate rows are dropped; rows reusing an ID with different
+   content are moved to the rejects file
+5. Parents referenced by children but absent from the file are restored
+   from reference CSVs (backups, new_design_elements.csv) or, for PLOTs,
+   inferred from PLOTS-PROJECTS; anything else is logged as unresolved
+
+The repaired file replaces the original through a temp file and an atomic
+rename, after a backup copy. Every repair is logged as JSON Lines. Memory is
+constant apart from the ID set (one 64-bit row digest per ID).
+
+Usage:
+    python csv_repair.py --csv data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv --reference output/new_design_elements.csv
+    python csv_repair.py --check   # report only, change nothing
+
+Date: October 18, 2026
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lookup_builder import load_plots_projects_mapping
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+COLUMNS = ['ID', 'PROJECT_ID', 'NAME', 'TYPE', 'PARENT_ID']
+
+_UUID = r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+_UUID_FULL = re.compile(rf'^{_UUID}$')
+_UUID_AT_END = re.compile(rf'({_UUID})$')
+
+# Logged problems that do not change the file
+REPORT_ONLY = {'unresolved_parent'}
+
+# Type a missing parent must have, by the type of its children
+PARENT_TYPE_OF = {'BLOCK': 'PLOT', 'TABLE': 'BLOCK', 'INVERTER': 'BLOCK'}
+
+
+@dataclass
+class RepairResult:
+    """Outcome of a repair run."""
+    csv_path: str
+    rows_in: int = 0
+    rows_out: int = 0
+    repairs: Counter = field(default_factory=Counter)
+    rejected: int = 0
+    unresolved: List[str] = field(default_factory=list)
+    changed: bool = False
+    backup_path: Optional[str] = None
+    rejects_path: Optional[str] = None
+    log_path: Optional[str] = None
+
+
+def split_glued_row(fields: List[str]) -> Optional[List[List[str]]]:
+    """
+    Split k rows glued into one (4k+1 fields) back into k rows.
+
+    Each glue field holds the PARENT_ID of one row (a UUID, or empty for a
+    PLOT) immediately followed by the ID (a UUID) of the next.
+
+    Args:
+        fields: Raw fields of an over-long row
+
+    Returns:
+        List of 5-field rows, or None if the row is not a recognizable glue
+
+    Examples:
+        >>> a = 'fab4ced3-a186-4270-baf6-55dc60cc85d5'
+        >>> b = '0b6a1f2e-0000-4000-8000-000000000001'
+        >>> split_glued_row([b, 'p', 'BL01', 'BLOCK', a + b, 'p', 'R1-S1', 'TABLE', b])[1][0] == b
+        True
+        >>> split_glued_row(['x', 'p', 'A-16a', 'PLOT', b, 'p', 'BL01', 'BLOCK', a])[0][4]
+        ''
+        >>> split_glued_row(['x', 'y', 'z', 'w', 'v', 'u']) is None
+        True
+    """
+    width = len(COLUMNS)
+    if len(fields) <= width or (len(fields) - 1) % (width - 1) != 0:
+        return None
+
+    count = (len(fields) - 1) // (width - 1)
+    rows = []
+    current = fields[:width - 1]
+    for j in range(1, count):
+        glue = fields[j * (width - 1)].strip()
+        match = _UUID_AT_END.search(glue)
+        if not match:
+            return None
+        parent_id = glue[:match.start()]
+        if parent_id and not _UUID_FULL.match(parent_id):
+            return None
+        rows.append(current + [parent_id])
+        current = [match.group(1)] + fields[j * (width - 1) + 1:(j + 1) * (width - 1)]
+    rows.append(current + [fields[-1]])
+    return rows
+
+
+def _row_digest(fields: List[str]) -> int:
+    digest = hashlib.blake2b('\0'.join(fields).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class _RepairLog:
+    """Collects repair counts and writes each repair as a JSON line."""
+
+    def __init__(self, log_path: Optional[Path], result: RepairResult):
+        self.result = result
+        self._file = open(log_path, 'w', encoding='utf-8') if log_path else None
+
+    def add(self, kind: str, line: Optional[int], detail: str, element_id: str = ''):
+        self.result.repairs[kind] += 1
+        if self._file:
+            self._file.write(json.dumps({'kind': kind, 'line': line, 'id': element_id, 'detail': detail}) + '\n')
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+def _find_in_references(reference_csvs: Iterable[Path], wanted: Dict[str, str]) -> Dict[str, List[str]]:
+    """Stream reference CSVs for rows with the wanted IDs and types."""
+    found: Dict[str, List[str]] = {}
+    for reference in reference_csvs:
+        if not Path(reference).exists():
+            continue
+        with open(reference, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = [h.strip().upper() for h in next(reader, [])]
+            if not all(c in header for c in COLUMNS):
+                continue
+            positions = [header.index(c) for c in COLUMNS]
+            for raw in reader:
+                if len(raw) != len(header):
+                    continue
+                fields = [raw[p].strip() for p in positions]
+                element_id = fields[0].lower()
+                if element_id in wanted and element_id not in found and fields[3].upper() == wanted[element_id]:
+                    found[element_id] = fields
+    return found
+
+
+def repair_design_elements(
+    csv_path: Path,
+    plot_names: Optional[Dict[str, str]] = None,
+    reference_csvs: Iterable[Path] = (),
+    backup_dir: Optional[Path] = None,
+    log_path: Optional[Path] = None,
+    dry_run: bool = False
+) -> RepairResult:
+    """
+    Repair DESIGNELEMENTS.csv in one streaming pass.
+
+    Args:
+        csv_path: Path to CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv
+        plot_names: {PROJECT_ID (lower): PLOT_NAME} for inferring missing PLOTs
+        reference_csvs: CSVs to restore missing parent rows from
+        backup_dir: Folder for the backup copy (default: next to csv_path)
+        log_path: JSON Lines repair log (default: none)
+        dry_run: Only report; leave the file untouched
+
+    Returns:
+        RepairResult
+    """
+    csv_path = Path(csv_path)
+    plot_names = plot_names or {}
+    result = RepairResult(csv_path=str(csv_path), log_path=str(log_path) if log_path else None)
+    log = _RepairLog(log_path, result)
+
+    temp_path = csv_path.with_name(csv_path.name + '.repair.tmp')
+    rejects_temp_path = csv_path.with_name(csv_path.name + '.rejects.tmp')
+
+    seen: Dict[str, int] = {}                               # ID (lower) → row digest
+    plots_by_project: Dict[str, str] = {}                   # PROJECT_ID (lower) → PLOT ID
+    referenced: Dict[str, Tuple[Counter, Counter]] = {}     # parent ID → (child types, projects)
+    rejects_file = None
+    rejects_writer = None
+
+    def reject(line: int, fields: List[str]):
+        nonlocal rejects_file, rejects_writer
+        if rejects_file is None:
+            rejects_file = open(rejects_temp_path, 'w', encoding='utf-8', newline='')
+            rejects_writer = csv.writer(rejects_file, lineterminator='\n')
+            rejects_writer.writerow(['LINE'] + COLUMNS)
+        rejects_writer.writerow([line] + fields)
+        result.rejected += 1
+
+    try:
+        with open(csv_path, 'r', encoding='utf-8', newline='') as src, \
+             open(temp_path, 'w', encoding='utf-8', newline='') as dst:
+            reader = csv.reader(src)
+            writer = csv.writer(dst, lineterminator='\n')
+
+            raw_header = next(reader, [])
+            header = [h.strip().upper() for h in raw_header]
+            if header != COLUMNS:
+                raise ValueError(f"Unexpected header in {csv_path.name}: {raw_header} (expected {COLUMNS})")
+            if raw_header != COLUMNS:
+                log.add('whitespace', 1, "Header cleaned")
+            writer.writerow(COLUMNS)
+
+            for raw in reader:
+                line = reader.line_num
+                if not raw or not any(v.strip() for v in raw):
+                    log.add('blank_line', line, "Blank line dropped")
+                    continue
+                result.rows_in += 1
+
+                if len(raw) == len(COLUMNS):
+                    candidates = [raw]
+                elif len(raw) == len(COLUMNS) - 1 and raw[3].strip().upper() == 'PLOT':
+                    candidates = [raw + ['']]
+                    log.add('padded_row', line, "PLOT row without PARENT_ID field padded", raw[0].strip())
+                else:
+                    candidates = split_glued_row(raw)
+                    if candidates is None:
+                        log.add('rejected_row', line, f"{len(raw)} fields (expected {len(COLUMNS)})", raw[0].strip())
+                        reject(line, raw)
+                        continue
+                    log.add('glued_row', line, f"Split into {len(candidates)} rows", candidates[-1][0].strip())
+
+                for candidate in candidates:
+                    fields = [v.strip() for v in candidate]
+                    if fields != candidate:
+                        log.add('whitespace', line, "Stray whitespace stripped", fields[0])
+
+                    element_id = fields[0].lower()
+                    digest = _row_digest(fields)
+                    if element_id in seen:
+                        if seen[element_id] == digest:
+                            log.add('duplicate_row', line, "Exact duplicate dropped", fields[0])
+                        else:
+                            log.add('duplicate_id', line, "ID reused with different content; row rejected", fields[0])
+                            reject(line, fields)
+                        continue
+                    seen[element_id] = digest
+
+                    project_id = fields[1].lower()
+                    element_type = fields[3].upper()
+                    parent_id = fields[4].lower()
+                    if element_type == 'PLOT':
+                        plots_by_project.setdefault(project_id, element_id)
+                    if parent_id and parent_id not in seen and element_type in PARENT_TYPE_OF:
+                        types, projects = referenced.setdefault(parent_id, (Counter(), Counter()))
+                        types[element_type] += 1
+                        projects[fields[1]] += 1
+
+                    writer.writerow(fields)
+                    result.rows_out += 1
+
+            # The cause of glued rows: the next append would glue again
+            if csv_path.stat().st_size > 0:
+                with open(csv_path, 'rb') as tail:
+                    tail.seek(-1, os.SEEK_END)
+                    if tail.read(1) != b'\n':
+                        log.add('missing_newline', None, "Trailing newline added")
+
+            # Parents that never showed up, resolved parent-first
+            missing = {pid: refs for pid, refs in referenced.items() if pid not in seen}
+            for restored in _resolve_missing_parents(missing, seen, plots_by_project, plot_names, reference_csvs, log, result):
+                writer.writerow(restored)
+                result.rows_out += 1
+
+        if rejects_file is not None:
+            rejects_file.close()
+            rejects_file = None
+        result.changed = any(kind not in REPORT_ONLY for kind in result.repairs)
+
+        if dry_run or not result.changed:
+            temp_path.unlink()
+            return result
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if result.rejected:
+            rejects_path = csv_path.with_name(f"{csv_path.stem}_rejects_{timestamp}.csv")
+            os.replace(rejects_temp_path, rejects_path)
+            result.rejects_path = str(rejects_path)
+
+        backup_dir = Path(backup_dir) if backup_dir else csv_path.parent
+        backup_dir.mkdir(parents=True, exist_ok=True)
+        backup_path = backup_dir / f"{csv_path.stem}_before_repair_{timestamp}.csv"
+        shutil.copy2(csv_path, backup_path)
+        result.backup_path = str(backup_path)
+
+        os.replace(temp_path, csv_path)
+        return result
+    finally:
+        log.close()
+        if rejects_file is not None:
+            rejects_file.close()
+        for path in (temp_path, rejects_temp_path):
+            if path.exists():
+                path.unlink()
+
+
+def _resolve_missing_parents(
+    missing: Dict[str, Tuple[Counter, Counter]],
+    seen: Dict[str, int],
+    plots_by_project: Dict[str, str],
+    plot_names: Dict[str, str],
+    reference_csvs: Iterable[Path],
+    log: _RepairLog,
+    result: RepairResult
+) -> List[List[str]]:
+    """Build rows for missing parents (PLOTs before BLOCKs)."""
+    restored: List[List[str]] = []
+
+    while missing:
+        wanted: Dict[str, str] = {}
+        for parent_id, (types, projects) in missing.items():
+            parent_types = {PARENT_TYPE_OF[t] for t in types}
+            if len(parent_types) != 1 or len(projects) != 1:
+                result.unresolved.append(f"{parent_id}: children disagree on parent type/project ({dict(types)}, {dict(projects)})")
+                log.add('unresolved_parent', None, "Children disagree on parent type or project", parent_id)
+                continue
+            wanted[parent_id] = parent_types.pop()
+
+        found = _find_in_references(reference_csvs, wanted)
+        next_missing: Dict[str, Tuple[Counter, Counter]] = {}
+
+        for parent_id, parent_type in wanted.items():
+            types, projects = missing[parent_id]
+            project_id = next(iter(projects))
+
+            if parent_id in found:
+                row = found[parent_id]
+                log.add('restored_parent', None, f"{parent_type} {row[2]} restored from reference ({sum(types.values())} children)", row[0])
+            elif parent_type == 'PLOT' and project_id.lower() in plot_names and project_id.lower() not in plots_by_project:
+                row = [parent_id, project_id, plot_names[project_id.lower()], 'PLOT', '']
+                log.add('inferred_parent', None, f"PLOT {row[2]} inferred from PLOTS-PROJECTS ({sum(types.values())} children)", parent_id)
+            else:
+                reason = "project already has a PLOT" if parent_type == 'PLOT' and project_id.lower() in plots_by_project else "no reference row"
+                result.unresolved.append(f"{parent_id}: missing {parent_type} of {sum(types.values())} child(ren) in project {project_id} ({reason})")
+                log.add('unresolved_parent', None, f"Missing {parent_type}: {reason}", parent_id)
+                continue
+
+            seen[parent_id] = _row_digest(row)
+            if row[3].upper() == 'PLOT':
+                plots_by_project.setdefault(row[1].lower(), parent_id)
+            grandparent = row[4].lower()
+            if grandparent and grandparent not in seen and row[3].upper() in PARENT_TYPE_OF:
+                g_types, g_projects = next_missing.setdefault(grandparent, (Counter(), Counter()))
+                g_types[row[3].upper()] += 1
+                g_projects[row[1]] += 1
+            restored.append(row)
+
+        # A grandparent may have been resolved later in the same round
+        missing = {pid: refs for pid, refs in next_missing.items() if pid not in seen}
+
+    # Parents first: PLOT, then BLOCK
+    restored.sort(key=lambda r: 0 if r[3].upper() == 'PLOT' else 1)
+    return restored
+
+
+def print_result(result: RepairResult):
+    """Print a repair summary."""
+    print("="*80)
+    print("DESIGNELEMENTS REPAIR")
+    print("="*80)
+    print(f"\n📄 {result.csv_path}")
+    print(f"   Rows read:    {result.rows_in:,}")
+    print(f"   Rows written: {result.rows_out:,}")
+
+    if not result.repairs:
+        print(f"\n✅ Nothing to repair")
+        return
+
+    print(f"\n🔧 Repairs:")
+    for kind, count in sorted(result.repairs.items()):
+        print(f"   {kind:<18} {count:,}")
+    if result.rejects_path:
+        print(f"\n⚠️  {result.rejected} row(s) moved to: {result.rejects_path}")
+    elif result.rejected:
+        print(f"\n⚠️  {result.rejected} row(s) to move to a rejects file")
+    for unresolved in result.unresolved:
+        print(f"   ❌ Unresolved: {unresolved}")
+    if result.backup_path:
+        print(f"\n💾 Backup created: {result.backup_path}")
+    if result.log_path:
+        print(f"📝 Repair log: {result.log_path}")
+
+
+def main():
+    """Main entry point."""
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+
+    parser = argparse.ArgumentParser(description="Repair DESIGNELEMENTS.csv in one streaming pass.")
+    parser.add_argument("--csv", default=None, help="DESIGNELEMENTS.csv to repair (default: data folder).")
+    parser.add_argument("--plots-projects", default=None, help="PLOTS-PROJECTS.csv for inferring missing PLOT rows.")
+    parser.add_argument("--reference", action="append", default=[], help="CSV to restore missing parent rows from (repeatable).")
+    parser.add_argument("--backup-dir", default=None, help="Folder for the backup copy (default: next to the CSV).")
+    parser.add_argument("--log", default=None, help="Repair log, JSON Lines (default: output/csv_repair_log.jsonl).")
+    parser.add_argument("--check", action="store_true", help="Report what would be repaired; change nothing.")
+    args = parser.parse_args()
+
+    data_path = base_path / "data"
+    csv_path = Path(args.csv) if args.csv else data_path / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
+    plots_projects_csv = Path(args.plots_projects) if args.plots_projects else data_path / "CCTECH.DRS.ENTITIES-PLOTS-PROJECTS.csv"
+    log_path = Path(args.log) if args.log else base_path / "output" / "csv_repair_log.jsonl"
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+
+    plot_names = {}
+    if plots_projects_csv.exists():
+        plot_names = {
+            project_id.lower(): plot_name
+            for project_id, plot_name in load_plots_projects_mapping(str(plots_projects_csv)).values()
+        }
+
+    result = repair_design_elements(
+        csv_path,
+        plot_names=plot_names,
+        reference_csvs=[Path(r) for r in args.reference],
+        backup_dir=Path(args.backup_dir) if args.backup_dir else None,
+        log_path=log_path,
+        dry_run=args.check
+    )
+    print_result(result)
+    if args.check and result.changed:
+        print(f"\n(--check: no changes written)")
+
+    sys.exit(1 if result.unresolved else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Drawing Data Archives
+=====================
+
+Reads drawing_data straight from a zip archive (e.g. "A16b - 200 MW.zip"
+as sent by a site team), without unpacking it first:
+1. DrawingArchive stands in for the drawing_data/ folder: plot folders are
+   the folders that directly contain files in the archive, at any depth
+   ("drawing_data/A16a - 50 MW/x.xlsx" and "A16a - 50 MW/x.xlsx" both give
+   "A16a - 50 MW"); files at the archive root belong to a plot folder named
+   after the zip itself. Archives where two folders would share a plot
+   folder name, or a file appears twice, are refused (ArchiveLayoutError)
+   rather than merged
+2. ArchivePath provides the parts of Path that extraction, selection and
+   planning use (name, parent, is_dir, iterdir, glob, stat), so folder and
+   block names come from the archive paths as usual
+3. Workbooks are read from the archive into memory and handed to the sheet
+   reader as an in-memory zip (see workbook_prefetch.py); an .xlsx needs
+   random access to its own central directory, so each one is read whole
+
+Manifest keys ("<plot folder>/<filename>") match those of the unpacked
+folders; sizes and times recorded are those of the archive members.
+
+Date: October 18, 2026
+"""
+
+import fnmatch
+import io
+import os
+import stat
+import time
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterator, Optional, Union
+
+from workbook_prefetch import InflatedWorkbook, inflate_workbook, inflate_workbook_data
+
+
+# Folders written by macOS Finder next to the real files
+_IGNORED_PREFIXES = ('__MACOSX/',)
+
+# Collisions listed in an ArchiveLayoutError message
+_MAX_COLLISIONS_SHOWN = 5
+
+
+class ArchiveLayoutError(ValueError):
+    """The archive's folders cannot be mapped to plot folders unambiguously."""
+
+
+def _zip_mtime(info: zipfile.ZipInfo) -> float:
+    return time.mktime(info.date_time + (0, 0, -1))
+
+
+@dataclass(frozen=True, order=True)
+class ArchivePath:
+    """Plot folder (filename empty) or workbook inside a DrawingArchive."""
+    folder: str
+    filename: str = ''
+    archive: Optional['DrawingArchive'] = field(default=None, compare=False, repr=False)
+
+    @property
+    def name(self) -> str:
+        return self.filename or self.folder
+
+    @property
+    def parent(self) -> Union['ArchivePath', 'DrawingArchive']:
+        return ArchivePath(self.folder, archive=self.archive) if self.filename else self.archive
+
+    def is_dir(self) -> bool:
+        return not self.filename
+
+    def iterdir(self) -> Iterator['ArchivePath']:
+        if not self.is_dir():
+            return
+        for filename in self.archive.folders.get(self.folder, {}):
+            yield ArchivePath(self.folder, filename, self.archive)
+
+    def glob(self, pattern: str) -> Iterator['ArchivePath']:
+        """Files of this folder matching pattern (like Path.glob, one level)."""
+        return (path for path in self.iterdir() if fnmatch.fnmatch(path.filename, pattern))
+
+    def _info(self) -> zipfile.ZipInfo:
+        return self.archive.folders[self.folder][self.filename]
+
+    def stat(self) -> os.stat_result:
+        """Size and modification time of the archive member."""
+        if self.is_dir():
+            return os.stat_result((stat.S_IFDIR | 0o555, 0, 0, 0, 0, 0, 0, 0, 0, 0))
+        info = self._info()
+        mtime = _zip_mtime(info)
+        return os.stat_result((stat.S_IFREG | 0o444, 0, 0, 1, 0, 0, info.file_size, mtime, mtime, mtime))
+
+    def open(self) -> io.BytesIO:
+        """The member's bytes as an in-memory file."""
+        return io.BytesIO(self.archive.read(self))
+
+    def __str__(self) -> str:
+        return f"{self.archive.path}/{self.archive.member_name(self)}"
+
+
+class DrawingArchive:
+    """A zip archive used in place of the drawing_data/ folder."""
+
+    def __init__(self, zip_path: Path):
+        self.path = Path(zip_path)
+        self.zf = zipfile.ZipFile(self.path)
+        # plot folder name → filename → member
+        self.folders: Dict[str, Dict[str, zipfile.ZipInfo]] = {}
+        directories: Dict[str, str] = {}
+        collisions = []
+        for info in self.zf.infolist():
+            member = info.filename.replace('\\', '/')
+            if info.is_dir() or member.startswith(_IGNORED_PREFIXES):
+                continue
+            parts = PurePosixPath(member).parts
+            folder = parts[-2] if len(parts) > 1 else self.path.stem
+            directory = '/'.join(parts[:-1]) or '(archive root)'
+            seen_directory = directories.setdefault(folder, directory)
+            files = self.folders.setdefault(folder, {})
+            if seen_directory != directory:
+                collisions.append(f"plot folder '{folder}' is both '{seen_directory}' and '{directory}'")
+            elif parts[-1] in files:
+                collisions.append(f"'{member}' appears more than once")
+            else:
+                files[parts[-1]] = info
+
+        if collisions:
+            self.zf.close()
+            shown = "; ".join(collisions[:_MAX_COLLISIONS_SHOWN])
+            more = f" (and {len(collisions) - _MAX_COLLISIONS_SHOWN} more)" if len(collisions) > _MAX_COLLISIONS_SHOWN else ""
+            raise ArchiveLayoutError(f"Ambiguous drawing data archive {self.path.name}: {shown}{more}")
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def is_dir(self) -> bool:
+        return True
+
+    def iterdir(self) -> Iterator[ArchivePath]:
+        """Plot folders in the archive."""
+        for folder in self.folders:
+            yield ArchivePath(folder, archive=self)
+
+    def member_name(self, excel_path: ArchivePath) -> str:
+        return excel_path._info().filename
+
+    def read(self, excel_path: ArchivePath) -> bytes:
+        """Decompressed bytes of a workbook (safe to call from several threads)."""
+        return self.zf.read(excel_path._info())
+
+    def inflate(self, excel_path: ArchivePath) -> InflatedWorkbook:
+        """Read a workbook from the archive and inflate it for the sheet reader."""
+        started = time.perf_counter()
+        info = excel_path._info()
+        return inflate_workbook_data(excel_path, self.zf.read(info), info.file_size, _zip_mtime(info), started)
+
+    def get_stats(self) -> Dict[str, int]:
+        workbooks = [
+            info for files in self.folders.values()
+            for filename, info in files.items() if filename.lower().endswith('.xlsx')
+        ]
+        return {
+            'plot_folders': len(self.folders),
+            'workbooks': len(workbooks),
+            'compressed_bytes': sum(info.compress_size for info in workbooks),
+            'workbook_bytes': sum(info.file_size for info in workbooks)
+        }
+
+    def close(self):
+        self.zf.close()
+
+    def __enter__(self) -> 'DrawingArchive':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def is_drawing_archive(drawing_data_path: Path) -> bool:
+    """True if drawing_data_path is a zip file rather than a folder."""
+    return Path(drawing_data_path).is_file() and zipfile.is_zipfile(drawing_data_path)
+
+
+def check_drawing_data(drawing_data_path: Path):
+    """
+    Check that drawing_data can be opened, before any output is written.
+
+    Raises:
+        ArchiveLayoutError: A zip file whose folders or files collide
+    """
+    if is_drawing_archive(drawing_data_path):
+        DrawingArchive(drawing_data_path).close()
+
+
+@contextmanager
+def open_drawing_data(drawing_data_path: Path) -> Iterator[Union[Path, DrawingArchive]]:
+    """
+    Open drawing_data for extraction.
+
+    Yields:
+        drawing_data_path itself for a folder, or a DrawingArchive for a zip file
+
+    Raises:
+        ArchiveLayoutError: A zip file whose folders or files collide
+    """
+    if is_drawing_archive(drawing_data_path):
+        with DrawingArchive(drawing_data_path) as archive:
+            yield archive
+    else:
+        yield Path(drawing_data_path)
+
+
+def load_workbook(excel_path: Union[Path, ArchivePath]) -> InflatedWorkbook:
+    """Read and inflate a workbook file or archive member."""
+    if isinstance(excel_path, ArchivePath):
+        return excel_path.archive.inflate(excel_path)
+    return inflate_workbook(excel_path)
+
+
+def workbook_file(excel_path: Union[Path, ArchivePath]) -> Union[Path, io.BytesIO]:
+    """Something zipfile.ZipFile can open for a workbook file or archive member."""
+    return excel_path.open() if isinstance(excel_path, ArchivePath) else excel_path
@@ -0,0 +1,429 @@
+"""
+External Sort-Merge Deduplication
+=================================
+
+Out-of-core extraction mode for phases whose TABLE/INVERTER keys do not fit
+in memory next to the existing DESIGNELEMENTS keys:
+1. Workbooks are walked as usual; PLOTs and BLOCKs are resolved in memory
+   (only the existing PLOT/BLOCK rows are loaded), while TABLE/INVERTER
+   candidates go to an ordered spool file and their keys to sorted run
+   files whenever the memory budget is reached
+2. The TABLE/INVERTER keys of DESIGNELEMENTS.csv are sorted the same way
+3. One merge pass over both sorted streams decides every candidate: skipped
+   if the key exists, skipped if an earlier candidate had the key, else new.
+   At most MERGE_FAN_IN runs are open per stream; more runs are first merged
+   into intermediate runs, so small budgets do not run out of file handles
+4. The spool is replayed in order and the new elements are written, so the
+   output matches the in-memory path (apart from the random IDs)
+
+Usage:
+    python extract_design_elements.py --external-dedup --memory-budget-mb 64
+
+Date: October 18, 2026
+"""
+
+import csv
+import heapq
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from extract_design_elements import (
+    DesignElementExtractor,
+    DEFAULT_MAX_BLANK_ROWS,
+    NewDesignElement
+)
+from extraction_manifest import ExtractionManifest
+from lookup_builder import LookupDictionaries
+from row_cache import RowCache
+from transform_logic import ExtractionFilter
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+DEFAULT_MEMORY_BUDGET_MB = 256
+# Rough in-memory cost of one buffered key tuple beyond its characters
+ROW_OVERHEAD_BYTES = 250
+# Element types deduplicated externally (PLOTs and BLOCKs stay in memory)
+EXTERNAL_TYPES = ("TABLE", "INVERTER")
+SEQ_DIGITS = 12
+# Runs merged at once (open files per sorted stream)
+MERGE_FAN_IN = 64
+
+
+class ExternalSorter:
+    """
+    Sorts string tuples with a bounded buffer, spilling sorted runs to disk.
+
+    >>> with tempfile.TemporaryDirectory() as work_dir:
+    ...     sorter = ExternalSorter(Path(work_dir), 'keys', budget_bytes=1, unique=True)
+    ...     for key in [('b',), ('a',), ('b',), ('c',)]:
+    ...         sorter.add(key)
+    ...     keys = list(sorter.merged())
+    ...     keys, sorter.runs
+    ([('a',), ('b',), ('c',)], 4)
+    >>> with tempfile.TemporaryDirectory() as work_dir:
+    ...     sorter = ExternalSorter(Path(work_dir), 'keys', budget_bytes=1, fan_in=2)
+    ...     for n in [5, 3, 9, 1, 7, 3]:
+    ...         sorter.add((str(n),))
+    ...     keys = [k for k, in sorter.merged()]
+    ...     keys, sorter.runs, sorter.merge_passes, os.listdir(work_dir)
+    (['1', '3', '3', '5', '7', '9'], 6, 2, [])
+    """
+
+    def __init__(self, work_dir: Path, name: str, budget_bytes: int, unique: bool = False,
+                 fan_in: int = MERGE_FAN_IN):
+        self.work_dir = work_dir
+        self.name = name
+        self.budget_bytes = budget_bytes
+        self.unique = unique
+        self.fan_in = max(2, fan_in)
+        self.merge_passes = 0
+        self.buffer: List[Tuple[str, ...]] = []
+        self.buffered_bytes = 0
+        self.run_paths: List[Path] = []
+        self.spilled_runs = 0
+        self.rows = 0
+
+    @property
+    def runs(self) -> int:
+        """Sorted runs spilled from the buffer (intermediate merge runs not counted)."""
+        return self.spilled_runs
+
+    def add(self, row: Tuple[str, ...]):
+        self.buffer.append(row)
+        self.buffered_bytes += sum(len(field) for field in row) + ROW_OVERHEAD_BYTES
+        self.rows += 1
+        if self.buffered_bytes >= self.budget_bytes:
+            self._spill()
+
+    def _spill(self):
+        self.buffer.sort()
+        path = self.work_dir / f"{self.name}-{self.spilled_runs:05d}.csv"
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerows(self._dedup(self.buffer) if self.unique else self.buffer)
+        self.run_paths.append(path)
+        self.spilled_runs += 1
+        self.buffer = []
+        self.buffered_bytes = 0
+
+    def _merge_runs(self, paths: List[Path]) -> Iterator[Tuple[str, ...]]:
+        rows = heapq.merge(*(self._read_run(path) for path in paths))
+        return self._dedup(rows) if self.unique else rows
+
+    def _reduce_runs(self):
+        """Merge groups of fan_in runs into intermediate runs until fan_in or fewer remain."""
+        while len(self.run_paths) > self.fan_in:
+            self.merge_passes += 1
+            merged_paths = []
+            for i in range(0, len(self.run_paths), self.fan_in):
+                group = self.run_paths[i:i + self.fan_in]
+                if len(group) == 1:
+                    merged_paths.append(group[0])
+                    continue
+                path = self.work_dir / f"{self.name}-p{self.merge_passes}-{len(merged_paths):05d}.csv"
+                with open(path, 'w', encoding='utf-8', newline='') as f:
+                    csv.writer(f).writerows(self._merge_runs(group))
+                for run_path in group:
+                    os.remove(run_path)
+                merged_paths.append(path)
+            self.run_paths = merged_paths
+
+    @staticmethod
+    def _dedup(rows: Iterable[Tuple[str, ...]]) -> Iterator[Tuple[str, ...]]:
+        previous = None
+        for row in rows:
+            if row != previous:
+                yield row
+                previous = row
+
+    @staticmethod
+    def _read_run(path: Path) -> Iterator[Tuple[str, ...]]:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.reader(f):
+                yield tuple(row)
+
+    def merged(self) -> Iterator[Tuple[str, ...]]:
+        """All rows in sorted order (consumes the sorter)."""
+        if not self.run_paths:
+            self.buffer.sort()
+            rows = iter(self.buffer)
+        else:
+            if self.buffer:
+                self._spill()
+            self._reduce_runs()
+            rows = heapq.merge(*(self._read_run(path) for path in self.run_paths))
+        yield from (self._dedup(rows) if self.unique else rows)
+        self.buffer = []
+        for path in self.run_paths:
+            os.remove(path)
+        self.run_paths = []
+
+
+def candidate_key(project_id: str, name: str, element_type: str) -> Tuple[str, str, str]:
+    """Key as element_exists() and session_elements build it."""
+    return (project_id.lower(), name.upper(), element_type.upper())
+
+
+def existing_key(row: dict) -> Tuple[str, str, str]:
+    """Key as LookupDictionaries.existing_elements stores a DESIGNELEMENTS row."""
+    return (row['PROJECT_ID'].strip().lower(), row['NAME'].strip().upper(), row['TYPE'].strip().upper())
+
+
+class ExternalDedupExtractor(DesignElementExtractor):
+    """
+    DesignElementExtractor whose TABLE/INVERTER deduplication runs out of core.
+
+    The lookups only need PLOT and BLOCK design elements; TABLE/INVERTER
+    candidates are decided by finish().
+    """
+
+    def __init__(
+        self,
+        lookups: LookupDictionaries,
+        work_dir: Path,
+        memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+        **kwargs
+    ):
+        super().__init__(lookups, **kwargs)
+        self.work_dir = Path(work_dir)
+        self.budget_bytes = max(1, int(memory_budget_mb * 1024 * 1024))
+        # Half the budget buffers candidate keys now, half existing keys in finish()
+        self.candidates = ExternalSorter(self.work_dir, 'candidates', self.budget_bytes // 2)
+        self.existing_runs = 0
+        self.existing_sorter: Optional[ExternalSorter] = None
+        self.candidate_count = 0
+        self._spool_path = self.work_dir / 'spool.csv'
+        self._spool_file = open(self._spool_path, 'w', encoding='utf-8', newline='')
+        self._spool = csv.writer(self._spool_file)
+
+    def _create_element(
+        self,
+        project_id: str,
+        name: str,
+        element_type: str,
+        parent_id: str = ""
+    ) -> Optional[NewDesignElement]:
+        """Create a PLOT/BLOCK in memory as usual and spool it in order."""
+        created_before = len(self.new_elements)
+        element = super()._create_element(project_id, name, element_type, parent_id)
+        if len(self.new_elements) > created_before:
+            self._spool.writerow(('E', element.id, element.project_id, element.name, element.type, element.parent_id))
+        return element
+
+    def _create_table_or_inverter(
+        self,
+        project_id: str,
+        name: str,
+        element_type: str,
+        block_element_id: str
+    ) -> bool:
+        """
+        Spool a TABLE or INVERTER candidate; finish() decides whether it is new.
+
+        Returns:
+            True (the decision is made later)
+        """
+        if element_type == "TABLE":
+            self.stats.tables_extracted += 1
+        else:
+            self.stats.inverters_extracted += 1
+
+        seq = self.candidate_count
+        self.candidate_count += 1
+        self._spool.writerow(('C', seq, project_id, name, element_type, block_element_id))
+        if not self.allow_name_duplicates:
+            self.candidates.add(candidate_key(project_id, name, element_type) + (f"{seq:0{SEQ_DIGITS}d}",))
+        return True
+
+    def _existing_keys(self, design_elements_csv: Path) -> Iterator[Tuple[str, str, str]]:
+        """Sorted, distinct TABLE/INVERTER keys of DESIGNELEMENTS.csv."""
+        sorter = ExternalSorter(self.work_dir, 'existing', self.budget_bytes // 2, unique=True)
+        with open(design_elements_csv, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if (row['TYPE'] or '').strip().upper() in EXTERNAL_TYPES:
+                    sorter.add(existing_key(row))
+        self.existing_sorter = sorter
+        self.existing_runs = sorter.runs
+        return sorter.merged()
+
+    def _decide(self, design_elements_csv: Path) -> bytearray:
+        """
+        Merge sorted candidates against sorted existing keys.
+
+        Returns:
+            Bitmap with a set bit for every candidate that is a new element
+        """
+        new_bits = bytearray((self.candidate_count + 7) // 8)
+        if self.allow_name_duplicates:
+            for seq in range(self.candidate_count):
+                new_bits[seq >> 3] |= 1 << (seq & 7)
+            return new_bits
+
+        existing = self._existing_keys(design_elements_csv)
+        current = next(existing, None)
+        previous_key = None
+        for project_key, name_key, type_key, seq in self.candidates.merged():
+            key = (project_key, name_key, type_key)
+            while current is not None and current < key:
+                current = next(existing, None)
+            if key == previous_key or key == current:
+                if type_key == "TABLE":
+                    self.stats.tables_skipped += 1
+                else:
+                    self.stats.inverters_skipped += 1
+            else:
+                seq = int(seq)
+                new_bits[seq >> 3] |= 1 << (seq & 7)
+            previous_key = key
+        return new_bits
+
+    def close(self):
+        """Close the spool file (finish() does this itself)."""
+        if not self._spool_file.closed:
+            self._spool_file.close()
+
+    def finish(self, design_elements_csv: Path, output_file: Path) -> int:
+        """
+        Decide all spooled candidates and write the new elements in order.
+
+        The CSV is written next to the spool and moved to output_file only
+        if there is at least one new element (as run_extraction() leaves
+        output_file alone when there is nothing to save).
+
+        Args:
+            design_elements_csv: DESIGNELEMENTS.csv to deduplicate against
+            output_file: CSV path for new elements
+
+        Returns:
+            Number of new elements written (PLOTs and BLOCKs included; the
+            TABLE/INVERTER counts are in stats)
+        """
+        self.close()
+        new_bits = self._decide(design_elements_csv)
+
+        temp_output = self.work_dir / 'new_elements.csv'
+        written = 0
+        with open(self._spool_path, 'r', encoding='utf-8', newline='') as spool, \
+                open(temp_output, 'w', newline='', encoding='utf-8') as out:
+            writer = csv.DictWriter(out, fieldnames=['ID', 'PROJECT_ID', 'NAME', 'TYPE', 'PARENT_ID'])
+            writer.writeheader()
+            for kind, *fields in csv.reader(spool):
+                if kind == 'E':
+                    element = NewDesignElement(*fields)
+                else:
+                    seq = int(fields[0])
+                    if not new_bits[seq >> 3] & (1 << (seq & 7)):
+                        continue
+                    element = NewDesignElement(str(uuid.uuid4()), *fields[1:])
+                    if element.type == "TABLE":
+                        self.stats.tables_created += 1
+                    else:
+                        self.stats.inverters_created += 1
+                writer.writerow(element.to_dict())
+                written += 1
+
+        if written:
+            output_file.parent.mkdir(exist_ok=True)
+            shutil.move(str(temp_output), str(output_file))
+        return written
+
+
+def run_external_extraction(
+    lookups: LookupDictionaries,
+    drawing_data_path: Path,
+    output_file: Path,
+    design_elements_csv: Path,
+    memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+    spill_dir: Optional[Path] = None,
+    allow_name_duplicates: bool = False,
+    row_cache: Optional[RowCache] = None,
+    manifest: Optional[ExtractionManifest] = None,
+    selection: Optional[ExtractionFilter] = None,
+    existing_csv_bytes: int = 0,
+    lookup_seconds: float = 0.0,
+    max_blank_rows: int = DEFAULT_MAX_BLANK_ROWS,
+    prefetch_workers: int = 0
+) -> Tuple[ExternalDedupExtractor, bool]:
+    """
+    Run an extraction with out-of-core TABLE/INVERTER deduplication.
+
+    Same arguments as run_extraction(), plus:
+        design_elements_csv: DESIGNELEMENTS.csv to deduplicate against
+        memory_budget_mb: Memory for buffered keys before they spill to disk
+        spill_dir: Folder for run files (default: a temporary folder next to output_file)
+
+    Returns:
+        (extractor, success)
+    """
+    if allow_name_duplicates:
+        print("🔁 Duplicate TABLE/INVERTER names will be allowed (no deduplication).\n")
+    print(f"💽 External dedup: {memory_budget_mb:g} MB key buffer, runs spill to disk\n")
+
+    output_file.parent.mkdir(exist_ok=True)
+    if spill_dir is not None:
+        Path(spill_dir).mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="dedup-", dir=spill_dir or output_file.parent) as work_dir:
+        extractor = ExternalDedupExtractor(
+            lookups,
+            Path(work_dir),
+            memory_budget_mb=memory_budget_mb,
+            allow_name_duplicates=allow_name_duplicates,
+            row_cache=row_cache,
+            manifest=manifest,
+            selection=selection,
+            max_blank_rows=max_blank_rows,
+            prefetch_workers=prefetch_workers
+        )
+
+        try:
+            if manifest is not None:
+                manifest.start_run(existing_csv_bytes=existing_csv_bytes, lookup_seconds=lookup_seconds)
+            success = extractor.extract_all(drawing_data_path)
+            if manifest is not None:
+                manifest.finish_run()
+                manifest.save()
+            if row_cache is not None:
+                row_cache.save()
+
+            started = time.perf_counter()
+            written = extractor.finish(design_elements_csv, output_file)
+            merge_seconds = time.perf_counter() - started
+        finally:
+            extractor.close()
+
+    extractor.print_summary()
+
+    print(f"\n💽 External dedup:")
+    print(f"   Candidates:    {extractor.candidate_count:,} ({extractor.candidates.runs} sorted run(s), "
+          f"{extractor.candidates.merge_passes} intermediate merge pass(es))")
+    print(f"   Existing keys: {extractor.existing_runs} sorted run(s), "
+          f"{extractor.existing_sorter.merge_passes if extractor.existing_sorter else 0} intermediate merge pass(es)")
+    print(f"   Merge + write: {merge_seconds:.2f} s")
+
+    if written:
+        tables_inverters = extractor.stats.tables_created + extractor.stats.inverters_created
+        print(f"\n💾 Saved {written} new elements ({tables_inverters} TABLE/INVERTER, "
+              f"{written - tables_inverters} PLOT/BLOCK) to: {output_file}")
+    else:
+        print("\n⚠️  No new elements to save (all elements already exist)")
+
+    print("\n" + "="*80)
+    if success and not extractor.stats.errors:
+        print("✅ EXTRACTION COMPLETED SUCCESSFULLY!")
+    elif success and extractor.stats.errors:
+        print("⚠️  EXTRACTION COMPLETED WITH WARNINGS")
+    else:
+        print("❌ EXTRACTION COMPLETED WITH ERRORS")
+    print("="*80)
+
+    return extractor, success
@@ -6,14 +6,24 @@ This script extracts design elements from Excel files in drawing_data/ folders
 and creates a hierarchical structure:
     PLOT (from folder) → BLOCK (from filename) → TABLE/INVERTER (from Excel rows)
 
+Other tools can use iter_design_elements() to get the new elements lazily,
+one record at a time, without any printing.
+
 Date: November 14, 2025
 """
 
+import contextlib
 import csv
+import io
+import json
+import stat
+import sys
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Generator, Iterator, Optional, Tuple, Set, TextIO
+from dataclasses import dataclass, asdict
 import openpyxl
 import argparse
 
@@ -29,9 +39,23 @@ from transform_logic import (
     filename_to_block_name,
     filename_to_plot_name,
     extract_table_and_inverter,
-    validate_plot_consistency
+    validate_plot_consistency,
+    ExtractionFilter,
+    TransformationError
 )
-from lookup_builder import build_lookup_dictionaries, LookupDictionaries
+from lookup_builder import build_lookup_dictionaries, load_plots_projects_mapping, LookupDictionaries
+from row_cache import RowCache, WorkbookRows, fingerprint_workbook, DEFAULT_MAX_BLANK_ROWS
+from extraction_manifest import ExtractionManifest, FileRecord, workbook_key, sheet_xml_size
+from extraction_plan import plan_extraction, print_plan
+from workbook_prefetch import InflatedWorkbook, inflate_workbook, prefetch_workbooks, PREFETCH_DEPTH_PER_WORKER
+from drawing_archive import ArchivePath, ArchiveLayoutError, check_drawing_data, load_workbook, open_drawing_data
+
+
+# Column order of new-element CSV output
+CSV_FIELDNAMES = ['ID', 'PROJECT_ID', 'NAME', 'TYPE', 'PARENT_ID']
+
+# Formats for new-element output (--format)
+OUTPUT_FORMATS = ('csv', 'jsonl')
 
 
 @dataclass
@@ -54,6 +78,14 @@ class NewDesignElement:
         }
 
 
+@dataclass
+class ElementRecord:
+    """A new design element and where it was found (see iter_design_elements)."""
+    element: NewDesignElement
+    source_file: Path               # workbook (a Path, or an ArchivePath in a zip)
+    row: Optional[int] = None       # sheet row of a TABLE/INVERTER; None for PLOT/BLOCK
+
+
 @dataclass
 class ExtractionStats:
     """Statistics for the extraction process."""
@@ -69,6 +101,11 @@ class ExtractionStats:
     blocks_skipped: int = 0
     tables_skipped: int = 0
     inverters_skipped: int = 0
+    workbooks_parsed: int = 0
+    workbooks_reused: int = 0
+    workbooks_padded: int = 0           # dimension declares rows beyond the data
+    workbooks_understated: int = 0      # data runs past the declared dimension
+    padded_rows_skipped: int = 0
     errors: List[str] = None
     
     def __post_init__(self):
@@ -88,23 +125,129 @@ class ExtractionStats:
         return self.plots_skipped + self.blocks_skipped + self.tables_skipped + self.inverters_skipped
 
 
+def parse_workbook_rows(excel_path, max_blank_rows: int = DEFAULT_MAX_BLANK_ROWS) -> WorkbookRows:
+    """
+    Parse cleaned TABLE/INVERTER names from a workbook with openpyxl.
+    
+    The sheet's dimension tag is recorded but not trusted: CAD exports often
+    declare far more rows than they contain (openpyxl pads up to it with
+    empty rows) or fewer (rows beyond it would be dropped). Reading stops at
+    the end of the sheet data or after max_blank_rows consecutive empty rows.
+    
+    Args:
+        excel_path: Path to Excel file (or a file object over its bytes)
+        max_blank_rows: Empty-row run that ends the sheet (0 = read to the end)
+        
+    Returns:
+        WorkbookRows (rows up to the last data row are counted; rows without
+        a table or inverter are counted, not kept)
+    """
+    wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    ws = wb.active
+    
+    workbook_rows = WorkbookRows(rows_read=0, declared_rows=ws.max_row)
+    ws.reset_dimensions()
+    
+    # Process rows (skip header row 1); only columns A (table) and B (inverter)
+    blank_streak = 0
+    for row_idx, row in enumerate(ws.iter_rows(min_row=2, max_col=2, values_only=True), start=2):
+        # Extract table and inverter names
+        table_name, inverter_name = extract_table_and_inverter(row)
+        if table_name or inverter_name:
+            workbook_rows.rows.append((row_idx, table_name, inverter_name))
+            workbook_rows.last_row = row_idx
+            blank_streak = 0
+        elif all(value is None or not str(value).strip() for value in row):
+            blank_streak += 1
+            if max_blank_rows and blank_streak >= max_blank_rows:
+                break
+        else:
+            workbook_rows.last_row = row_idx
+            blank_streak = 0
+    
+    workbook_rows.rows_read = workbook_rows.last_row - 1
+    wb.close()
+    return workbook_rows
+
+
+def _run_to_end(records: Generator[ElementRecord, None, bool]) -> bool:
+    """Exhaust an iter_* generator of DesignElementExtractor and return its result."""
+    while True:
+        try:
+            next(records)
+        except StopIteration as stop:
+            return stop.value
+
+
 class DesignElementExtractor:
     """Extracts design elements from Excel files.
 
     If allow_name_duplicates is True, TABLE and INVERTER elements are always
     created even if a prior element with same (PROJECT_ID, NAME, TYPE) exists
     either in the existing CSV or this extraction session.
+
+    If a row_cache is given, workbooks whose sheet content matches one parsed
+    earlier (in this run or a previous one) reuse its cleaned rows.
+
+    If a manifest is given, every processed workbook is recorded in it
+    (sizes, rows, elements, time) for planning and reconciliation.
+
+    If a selection is given, only the plot folders and workbooks it matches
+    are processed; the others are never opened.
+
+    Sheets are read until their last data row; max_blank_rows consecutive
+    empty rows end a sheet early (0 reads to the end).
+
+    If prefetch_workers is above 0, that many threads read and decompress the
+    next workbooks of a plot folder into memory while the current one is
+    parsed (see workbook_prefetch.py).
+
+    If a sink is given (an ElementStreamWriter), every new element is written
+    to it as soon as it is created, and the sink is flushed after each workbook.
+
+    The iter_* methods yield an ElementRecord for every new element as soon as
+    it is created (and return the usual success flag); the process_* methods
+    and extract_all run them to the end. With verbose=False nothing is printed
+    while processing; errors are still collected in stats.errors.
     """
     
-    def __init__(self, lookups: LookupDictionaries, allow_name_duplicates: bool = False):
+    def __init__(
+        self,
+        lookups: LookupDictionaries,
+        allow_name_duplicates: bool = False,
+        row_cache: Optional[RowCache] = None,
+        manifest: Optional[ExtractionManifest] = None,
+        selection: Optional[ExtractionFilter] = None,
+        max_blank_rows: int = DEFAULT_MAX_BLANK_ROWS,
+        prefetch_workers: int = 0,
+        sink: Optional['ElementStreamWriter'] = None,
+        verbose: bool = True
+    ):
         self.lookups = lookups
         self.allow_name_duplicates = allow_name_duplicates
+        self.row_cache = row_cache
+        self.manifest = manifest
+        self.selection = selection or ExtractionFilter()
+        self.max_blank_rows = max_blank_rows
+        self.prefetch_workers = prefetch_workers
+        self.sink = sink
+        self.verbose = verbose
         self.stats = ExtractionStats()
         self.new_elements: List[NewDesignElement] = []
         
         # Track created elements in this session (still used for PLOT/BLOCK reuse)
         self.session_elements: Dict[Tuple[str, str, str], NewDesignElement] = {}
     
+    def _log(self, message: str = ""):
+        """Print progress (unless verbose is off)."""
+        if self.verbose:
+            print(message)
+    
+    def _records_since(self, created: int, excel_path: Path, row: Optional[int] = None) -> Iterator[ElementRecord]:
+        """ElementRecords for the elements created after new_elements[:created]."""
+        for element in self.new_elements[created:]:
+            yield ElementRecord(element, excel_path, row)
+    
     def _create_element(
         self,
         project_id: str,
@@ -147,6 +290,8 @@ class DesignElementExtractor:
         key = (project_id.lower(), name.upper(), element_type.upper())
         self.session_elements[key] = element
         self.new_elements.append(element)
+        if self.sink is not None:
+            self.sink.write(element)
         
         return element
     
@@ -282,7 +427,8 @@ class DesignElementExtractor:
         self,
         excel_path: Path,
         plot_name: str,
-        project_id: str
+        project_id: str,
+        inflated: Optional[InflatedWorkbook] = None
     ) -> bool:
         """
         Process a single Excel file and extract design elements.
@@ -291,7 +437,23 @@ class DesignElementExtractor:
             excel_path: Path to Excel file
             plot_name: Plot name (e.g., "A-16a")
             project_id: PROJECT_ID
+            inflated: The workbook already read into memory (see workbook_prefetch.py)
             
+        Returns:
+            True if successful, False if errors occurred
+        """
+        return _run_to_end(self.iter_excel_file(excel_path, plot_name, project_id, inflated))
+    
+    def iter_excel_file(
+        self,
+        excel_path: Path,
+        plot_name: str,
+        project_id: str,
+        inflated: Optional[InflatedWorkbook] = None
+    ) -> Generator[ElementRecord, None, bool]:
+        """
+        Like process_excel_file(), yielding each new element as it is created.
+        
         Returns:
             True if successful, False if errors occurred
         """
@@ -301,7 +463,7 @@ class DesignElementExtractor:
             if not block_name:
                 error_msg = f"❌ Failed to extract block name from: {excel_path.name}"
                 self.stats.errors.append(error_msg)
-                print(f"   {error_msg}")
+                self._log(f"   {error_msg}")
                 return False
             
             # Validate plot consistency
@@ -309,35 +471,40 @@ class DesignElementExtractor:
             if not validate_plot_consistency(plot_name, filename_plot):
                 error_msg = f"⚠️  Plot name mismatch: folder={plot_name}, file={filename_plot} (from {excel_path.name})"
                 self.stats.errors.append(error_msg)
-                print(f"   {error_msg}")
+                self._log(f"   {error_msg}")
             
             # Get or create PLOT element
+            created = len(self.new_elements)
             plot_element_id, plot_created = self._get_or_create_plot(project_id, plot_name)
+            yield from self._records_since(created, excel_path)
             if not plot_element_id:
                 error_msg = f"❌ Failed to get/create PLOT for: {plot_name}"
                 self.stats.errors.append(error_msg)
-                print(f"   {error_msg}")
+                self._log(f"   {error_msg}")
                 return False
             
             # Get or create BLOCK element
+            created = len(self.new_elements)
             block_element_id, block_created = self._get_or_create_block(
                 project_id, block_name, plot_element_id
             )
+            yield from self._records_since(created, excel_path)
             if not block_element_id:
                 error_msg = f"❌ Failed to get/create BLOCK for: {block_name}"
                 self.stats.errors.append(error_msg)
-                print(f"   {error_msg}")
+                self._log(f"   {error_msg}")
                 return False
             
-            # Read Excel file
-            wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
-            ws = wb.active
+            # Read cleaned rows (from cache when the sheet content was seen before)
+            started = time.perf_counter()
+            extracted_before = self.stats.total_extracted()
+            if inflated is None and isinstance(excel_path, ArchivePath):
+                # Archive members can only be read through their archive
+                inflated = load_workbook(excel_path)
+            workbook_rows, fingerprint, reused = self._read_workbook_rows(excel_path, inflated)
             
-            # Process rows (skip header row 1)
-            rows_processed = 0
-            for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=2):
-                # Extract table and inverter names
-                table_name, inverter_name = extract_table_and_inverter(row)
+            for row_idx, table_name, inverter_name in workbook_rows.rows:
+                created = len(self.new_elements)
                 
                 # Create TABLE element if present
                 if table_name:
@@ -351,21 +518,90 @@ class DesignElementExtractor:
                         project_id, inverter_name, "INVERTER", block_element_id
                     )
                 
-                rows_processed += 1
+                if len(self.new_elements) > created:
+                    yield from self._records_since(created, excel_path, row_idx)
+            
+            rows_processed = workbook_rows.rows_read
+            declared_rows = workbook_rows.declared_rows
+            if declared_rows is not None and declared_rows > workbook_rows.last_row:
+                self.stats.workbooks_padded += 1
+                self.stats.padded_rows_skipped += declared_rows - workbook_rows.last_row
+            elif declared_rows is not None and declared_rows < workbook_rows.last_row:
+                self.stats.workbooks_understated += 1
             
-            wb.close()
+            if self.manifest is not None:
+                if inflated is not None:
+                    size, mtime, sheet_xml_bytes = inflated.size, inflated.mtime, inflated.sheet_xml_bytes
+                else:
+                    file_stat = excel_path.stat()
+                    size, mtime, sheet_xml_bytes = file_stat.st_size, file_stat.st_mtime, sheet_xml_size(excel_path)
+                self.manifest.record_file(FileRecord(
+                    key=workbook_key(excel_path),
+                    plot_name=plot_name,
+                    block_name=block_name,
+                    size=size,
+                    mtime=mtime,
+                    sheet_xml_bytes=sheet_xml_bytes,
+                    fingerprint=fingerprint,
+                    rows_read=rows_processed,
+                    elements_extracted=self.stats.total_extracted() - extracted_before,
+                    seconds=time.perf_counter() - started,
+                    parsed=not reused,
+                    declared_rows=declared_rows,
+                    last_row=workbook_rows.last_row
+                ))
             
             status = "✅" if rows_processed > 0 else "⚠️"
-            print(f"   {status} {excel_path.name}: {rows_processed} rows processed")
+            source = " (reused cached rows)" if reused else ""
+            dimension = ""
+            if declared_rows is not None and declared_rows != workbook_rows.last_row:
+                dimension = f" (declared {declared_rows} rows, data ends at row {workbook_rows.last_row})"
+            self._log(f"   {status} {excel_path.name}: {rows_processed} rows processed{source}{dimension}")
             
             return True
             
         except Exception as e:
             error_msg = f"❌ Error processing {excel_path.name}: {str(e)}"
             self.stats.errors.append(error_msg)
-            print(f"   {error_msg}")
+            self._log(f"   {error_msg}")
             return False
     
+    def _read_workbook_rows(
+        self,
+        excel_path: Path,
+        inflated: Optional[InflatedWorkbook] = None
+    ) -> Tuple[WorkbookRows, Optional[str], bool]:
+        """
+        Read cleaned TABLE/INVERTER names from a workbook.
+        
+        Args:
+            excel_path: Path to Excel file
+            inflated: The workbook already read into memory (the file is not opened)
+            
+        Returns:
+            (workbook_rows, fingerprint or None without a row cache, was_reused_from_cache)
+        """
+        fingerprint = None
+        if self.row_cache is not None:
+            if inflated is None:
+                # Inflate once: on a miss the parser reads the same stored zip
+                inflated = inflate_workbook(excel_path)
+            fingerprint = fingerprint_workbook(inflated.open())
+            cached = self.row_cache.get(fingerprint, self.max_blank_rows)
+            if cached is not None:
+                self.stats.workbooks_reused += 1
+                return cached, fingerprint, True
+        
+        workbook_rows = parse_workbook_rows(
+            inflated.open() if inflated else excel_path, max_blank_rows=self.max_blank_rows
+        )
+        self.stats.workbooks_parsed += 1
+        
+        if self.row_cache is not None:
+            self.row_cache.put(fingerprint, workbook_rows, self.max_blank_rows)
+        
+        return workbook_rows, fingerprint, False
+    
     def process_plot_folder(self, plot_folder: Path) -> bool:
         """
         Process all Excel files in a plot folder.
@@ -376,12 +612,29 @@ class DesignElementExtractor:
         Returns:
             True if successful, False if errors occurred
         """
+        return _run_to_end(self.iter_plot_folder(plot_folder))
+    
+    def iter_plot_folder(self, plot_folder: Path) -> Generator[ElementRecord, None, bool]:
+        """
+        Like process_plot_folder(), yielding each new element as it is created.
+        
+        Returns:
+            True if successful, False if errors occurred
+        """
+        # Find selected Excel files (by filename only, nothing is opened yet)
+        excel_files = [
+            excel_file for excel_file in plot_folder.glob("*.xlsx")
+            if self.selection.matches_file(plot_folder.name, excel_file.name)
+        ]
+        if not excel_files and self.selection.is_active():
+            return True
+        
         # Extract plot name from folder
         plot_name = folder_to_plot_name(plot_folder.name)
         if not plot_name:
             error_msg = f"❌ Failed to extract plot name from folder: {plot_folder.name}"
             self.stats.errors.append(error_msg)
-            print(f"   {error_msg}")
+            self._log(f"   {error_msg}")
             return False
         
         # Get PROJECT_ID
@@ -389,54 +642,84 @@ class DesignElementExtractor:
         if not project_id:
             error_msg = f"❌ No PROJECT_ID found for plot: {plot_name}"
             self.stats.errors.append(error_msg)
-            print(f"   {error_msg}")
+            self._log(f"   {error_msg}")
             return False
         
-        print(f"\n📁 Processing: {plot_folder.name} → {plot_name}")
-        print(f"   PROJECT_ID: {project_id}")
+        self._log(f"\n📁 Processing: {plot_folder.name} → {plot_name}")
+        self._log(f"   PROJECT_ID: {project_id}")
         
-        # Find all Excel files
-        excel_files = list(plot_folder.glob("*.xlsx"))
         if not excel_files:
-            print(f"   ⚠️  No Excel files found")
+            self._log(f"   ⚠️  No Excel files found")
             return True
         
-        print(f"   📊 Found {len(excel_files)} Excel file(s)")
+        self._log(f"   📊 Found {len(excel_files)} Excel file(s)")
         
         # Process each Excel file
         success = True
-        for excel_file in sorted(excel_files):
-            if not self.process_excel_file(excel_file, plot_name, project_id):
+        for excel_file, inflated in self._iter_workbooks(sorted(excel_files)):
+            if not (yield from self.iter_excel_file(excel_file, plot_name, project_id, inflated=inflated)):
                 success = False
+            if self.sink is not None:
+                self.sink.flush()
         
         return success
     
+    def _iter_workbooks(self, excel_files: List[Path]) -> Iterator[Tuple[Path, Optional[InflatedWorkbook]]]:
+        """
+        Pair workbooks with their prefetched contents (None without prefetching).
+        
+        Args:
+            excel_files: Workbooks in processing order
+        """
+        if self.prefetch_workers <= 0:
+            for excel_file in excel_files:
+                yield excel_file, None
+            return
+        with ThreadPoolExecutor(max_workers=self.prefetch_workers, thread_name_prefix="inflate") as executor:
+            yield from prefetch_workbooks(
+                excel_files, executor, depth=self.prefetch_workers * PREFETCH_DEPTH_PER_WORKER, loader=load_workbook
+            )
+    
     def extract_all(self, drawing_data_path: Path) -> bool:
         """
         Extract design elements from all plot folders.
         
         Args:
-            drawing_data_path: Path to drawing_data/ folder
+            drawing_data_path: Path to drawing_data/ folder (or a DrawingArchive
+                opened with drawing_archive.open_drawing_data)
             
         Returns:
             True if successful, False if errors occurred
         """
-        print("="*80)
-        print("DESIGN ELEMENTS EXTRACTION")
-        print("="*80)
+        return _run_to_end(self.iter_all(drawing_data_path))
+    
+    def iter_all(self, drawing_data_path: Path) -> Generator[ElementRecord, None, bool]:
+        """
+        Like extract_all(), yielding each new element as it is created.
+        
+        Returns:
+            True if successful, False if errors occurred
+        """
+        self._log("="*80)
+        self._log("DESIGN ELEMENTS EXTRACTION")
+        self._log("="*80)
         
         # Find all plot folders
         plot_folders = [f for f in drawing_data_path.iterdir() if f.is_dir()]
         if not plot_folders:
-            print("❌ No plot folders found in drawing_data/")
+            self._log("❌ No plot folders found in drawing_data/")
             return False
         
-        print(f"\n🔍 Found {len(plot_folders)} plot folder(s)")
+        self._log(f"\n🔍 Found {len(plot_folders)} plot folder(s)")
+        
+        if self.selection.is_active():
+            plot_folders = [f for f in plot_folders if self.selection.matches_folder(f.name)]
+            self._log(f"   🎯 {len(plot_folders)} plot folder(s) match the selection")
         
         # Process each plot folder
         success = True
         for plot_folder in sorted(plot_folders):
-            if not self.process_plot_folder(plot_folder):
+            if not (yield from self.iter_plot_folder(plot_folder)):
                 success = False
         
         return success
@@ -469,6 +752,12 @@ class DesignElementExtractor:
         print(f"\n📈 Processing Stats:")
         print(f"   Plots processed:  {self.stats.plots_processed}")
         print(f"   Blocks processed: {self.stats.blocks_processed}")
+        print(f"   Workbooks parsed: {self.stats.workbooks_parsed}")
+        print(f"   Workbooks reused: {self.stats.workbooks_reused} (identical sheet content)")
+        if self.stats.workbooks_padded:
+            print(f"   Padded sheets:    {self.stats.workbooks_padded} ({self.stats.padded_rows_skipped:,} declared empty rows not read)")
+        if self.stats.workbooks_understated:
+            print(f"   Understated dimension: {self.stats.workbooks_understated} (data read past the declared rows)")
         
         if self.stats.errors:
             print(f"\n❌ Errors: {len(self.stats.errors)}")
@@ -480,53 +769,214 @@ class DesignElementExtractor:
             print(f"\n✅ No errors encountered")
 
 
-def main():
-    """Main extraction function."""
-    parser = argparse.ArgumentParser(description="Extract design elements from drawing_data Excel files.")
-    parser.add_argument("--allow-name-duplicates", action="store_true", help="Allow duplicate TABLE/INVERTER names (always create new).")
-    parser.add_argument("--drawing-data-path", default=None, help="Override path to drawing_data folder.")
-    parser.add_argument("--output", default=None, help="Override output CSV path for new elements.")
-    args = parser.parse_args()
+def write_new_elements_csv(new_elements: List[NewDesignElement], output_file: Path):
+    """
+    Write new design elements to a CSV file.
+    
+    Args:
+        new_elements: Elements to write
+        output_file: Target CSV path (parent folder is created if needed)
+    """
+    output_file.parent.mkdir(exist_ok=True)
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDNAMES)
+        writer.writeheader()
+        for element in new_elements:
+            writer.writerow(element.to_dict())
 
-    # Define paths
-    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
-    data_path = base_path / "data"
-    drawing_data_path = Path(args.drawing_data_path) if args.drawing_data_path else (base_path / "drawing_data")
 
-    # Build lookup dictionaries
-    print("🔄 Loading lookup dictionaries...")
-    lookups = build_lookup_dictionaries(
-        str(data_path / "CCTECH.DRS.ENTITIES-PLOTS-PROJECTS.csv"),
-        str(data_path / "CCTECH.DRS.ENTITIES-PLOTS.csv"),
-        str(data_path / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv")
-    )
-    print("   ✅ Lookups loaded!\n")
-    if args.allow_name_duplicates:
+class ElementStreamWriter:
+    """
+    Writes new design elements to a stream while they are created.
+    
+    CSV output has the same columns as write_new_elements_csv(). JSON Lines
+    output has one object per element with the same keys, and ends with a
+    {"summary": {...}} record holding the ExtractionStats.
+    """
+    
+    def __init__(self, stream: TextIO, output_format: str = 'csv'):
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        self.stream = stream
+        self.output_format = output_format
+        self.written = 0
+        self._csv = None
+        if output_format == 'csv':
+            self._csv = csv.DictWriter(stream, fieldnames=CSV_FIELDNAMES)
+            self._csv.writeheader()
+    
+    def write(self, element: NewDesignElement):
+        if self._csv is not None:
+            self._csv.writerow(element.to_dict())
+        else:
+            self.stream.write(json.dumps(element.to_dict(), ensure_ascii=False) + '\n')
+        self.written += 1
+    
+    def flush(self):
+        self.stream.flush()
+    
+    def write_summary(self, stats: ExtractionStats, success: bool):
+        """End the stream (JSON Lines: with the summary record)."""
+        if self.output_format == 'jsonl':
+            summary = asdict(stats)
+            summary.update(
+                total_extracted=stats.total_extracted(),
+                total_created=stats.total_created(),
+                total_skipped=stats.total_skipped(),
+                success=success
+            )
+            self.stream.write(json.dumps({'summary': summary}, ensure_ascii=False) + '\n')
+        self.flush()
+
+
+@contextlib.contextmanager
+def stdout_output(enabled: bool) -> Iterator[Optional[TextIO]]:
+    """
+    Stream for new elements on stdout, with all progress output sent to stderr.
+    
+    Args:
+        enabled: False yields None and changes nothing
+        
+    Yields:
+        UTF-8 text stream over stdout (no newline translation, like the CSV file)
+    """
+    if not enabled:
+        yield None
+        return
+    output_stream = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', newline='')
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            yield output_stream
+    finally:
+        output_stream.flush()
+        # Leave sys.stdout open when the wrapper goes away
+        output_stream.detach()
+
+
+def is_fifo(path: Path) -> bool:
+    """True if path is an existing named pipe."""
+    try:
+        return stat.S_ISFIFO(path.stat().st_mode)
+    except OSError:
+        return False
+
+
+def selected_project_ids(
+    drawing_data_path: Path,
+    selection: ExtractionFilter,
+    plots_projects_csv: Path
+) -> Optional[Set[str]]:
+    """
+    Get the PROJECT_IDs affected by a selection.
+    
+    Args:
+        drawing_data_path: Path to drawing_data/ folder
+        selection: ExtractionFilter
+        plots_projects_csv: Path to PLOTS-PROJECTS.csv
+        
+    Returns:
+        Set of PROJECT_IDs, or None if the selection is not active (all projects)
+    """
+    if not selection.is_active():
+        return None
+    
+    selected_plots = {
+        folder_to_plot_name(plot_folder.name)
+        for plot_folder in selection.select_files(drawing_data_path)
+    }
+    print(f"🎯 Selection matches plot(s): {', '.join(sorted(p for p in selected_plots if p)) or 'none'}")
+    return {
+        project_id
+        for project_id, plot_name in load_plots_projects_mapping(str(plots_projects_csv)).values()
+        if plot_name in selected_plots
+    }
+
+
+def run_extraction(
+    lookups: LookupDictionaries,
+    drawing_data_path: Path,
+    output_file: Path,
+    allow_name_duplicates: bool = False,
+    row_cache: Optional[RowCache] = None,
+    manifest: Optional[ExtractionManifest] = None,
+    selection: Optional[ExtractionFilter] = None,
+    existing_csv_bytes: int = 0,
+    lookup_seconds: float = 0.0,
+    max_blank_rows: int = DEFAULT_MAX_BLANK_ROWS,
+    prefetch_workers: int = 0,
+    output_format: str = 'csv',
+    output_stream: Optional[TextIO] = None
+) -> Tuple[DesignElementExtractor, bool]:
+    """
+    Run an extraction with already-loaded lookups and save the new elements.
+    
+    Args:
+        lookups: Loaded LookupDictionaries (only read, never modified)
+        drawing_data_path: Path to drawing_data/ folder
+        output_file: CSV path for new elements
+        allow_name_duplicates: Always create TABLE/INVERTER elements
+        row_cache: Optional RowCache (saved after the run)
+        manifest: Optional ExtractionManifest (run recorded and saved)
+        selection: Optional ExtractionFilter for a partial extraction
+        existing_csv_bytes: Size of the loaded DESIGNELEMENTS.csv (for the manifest)
+        lookup_seconds: Time spent loading lookups (for the manifest)
+        max_blank_rows: Empty-row run that ends a sheet (0 = read to the end)
+        prefetch_workers: Threads decompressing upcoming workbooks (0 = none)
+        output_format: 'csv' or 'jsonl'
+        output_stream: Stream new elements here as they are created (e.g.
+            stdout) instead of writing output_file at the end. JSON Lines
+            output and a FIFO output_file are always streamed.
+        
+    Returns:
+        (extractor, success)
+    """
+    if allow_name_duplicates:
         print("🔁 Duplicate TABLE/INVERTER names will be allowed (no deduplication).\n")
 
-    # Create extractor
-    extractor = DesignElementExtractor(lookups, allow_name_duplicates=args.allow_name_duplicates)
+    stream_file = None
+    if output_stream is None and (output_format == 'jsonl' or is_fifo(output_file)):
+        output_file.parent.mkdir(exist_ok=True)
+        stream_file = output_stream = open(output_file, 'w', newline='', encoding='utf-8')
+    sink = ElementStreamWriter(output_stream, output_format) if output_stream is not None else None
+
+    try:
+        # Create extractor
+        extractor = DesignElementExtractor(
+            lookups,
+            allow_name_duplicates=allow_name_duplicates,
+            row_cache=row_cache,
+            manifest=manifest,
+            selection=selection,
+            max_blank_rows=max_blank_rows,
+            prefetch_workers=prefetch_workers,
+            sink=sink
+        )
 
-    # Extract all elements
-    success = extractor.extract_all(drawing_data_path)
+        # Extract all elements
+        if manifest is not None:
+            manifest.start_run(existing_csv_bytes=existing_csv_bytes, lookup_seconds=lookup_seconds)
+        success = extractor.extract_all(drawing_data_path)
+        if manifest is not None:
+            manifest.finish_run()
+            manifest.save()
+        if row_cache is not None:
+            row_cache.save()
+        if sink is not None:
+            sink.write_summary(extractor.stats, success)
+    finally:
+        if stream_file is not None:
+            stream_file.close()
 
     # Print summary
     extractor.print_summary()
 
     # Save results
-    if extractor.new_elements:
-        output_file = Path(args.output) if args.output else (base_path / "output" / "new_design_elements.csv")
-        output_file.parent.mkdir(exist_ok=True)
-
+    if sink is not None:
+        target = output_file if stream_file is not None else "output stream"
+        print(f"\n💾 Streamed {sink.written} new elements ({output_format}) to: {target}")
+    elif extractor.new_elements:
         print(f"\n💾 Saving {len(extractor.new_elements)} new elements to: {output_file.name}")
-
-        with open(output_file, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = ['ID', 'PROJECT_ID', 'NAME', 'TYPE', 'PARENT_ID']
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for element in extractor.new_elements:
-                writer.writerow(element.to_dict())
-
+        write_new_elements_csv(extractor.new_elements, output_file)
         print(f"   ✅ Saved to: {output_file}")
     else:
         print("\n⚠️  No new elements to save (all elements already exist)")
@@ -540,6 +990,183 @@ def main():
         print("❌ EXTRACTION COMPLETED WITH ERRORS")
     print("="*80)
 
+    return extractor, success
+
+
+def iter_design_elements(
+    drawing_data_path: Path,
+    lookups: LookupDictionaries,
+    allow_name_duplicates: bool = False,
+    row_cache: Optional[RowCache] = None,
+    selection: Optional[ExtractionFilter] = None,
+    max_blank_rows: int = DEFAULT_MAX_BLANK_ROWS,
+    prefetch_workers: int = 0,
+    stats: Optional[ExtractionStats] = None
+) -> Iterator[ElementRecord]:
+    """
+    Yield new design elements one by one, as the consumer asks for them.
+    
+    Library counterpart of run_extraction(): nothing is printed and nothing
+    is written. Workbooks are only opened as far as the consumer iterates,
+    so taking a few elements or stopping early (break, or close() on the
+    generator) skips the rest of the extraction. Deduplication still keeps
+    the keys of the elements created so far in memory.
+    
+    Args:
+        drawing_data_path: Path to drawing_data/ folder or a zip archive of it
+        lookups: Loaded LookupDictionaries (only read, never modified)
+        allow_name_duplicates: Always create TABLE/INVERTER elements
+        row_cache: Optional RowCache (not saved; call save() when done)
+        selection: Optional ExtractionFilter for a partial extraction
+        max_blank_rows: Empty-row run that ends a sheet (0 = read to the end)
+        prefetch_workers: Threads decompressing upcoming workbooks (0 = none)
+        stats: Optional ExtractionStats, updated as the iteration goes
+            (problems are collected in stats.errors instead of raised)
+        
+    Yields:
+        ElementRecord (element, source workbook, sheet row) per new element,
+        parents (PLOT, BLOCK) before their children
+    """
+    with open_drawing_data(drawing_data_path) as drawing_data:
+        extractor = DesignElementExtractor(
+            lookups,
+            allow_name_duplicates=allow_name_duplicates,
+            row_cache=row_cache,
+            selection=selection,
+            max_blank_rows=max_blank_rows,
+            prefetch_workers=prefetch_workers,
+            verbose=False
+        )
+        if stats is not None:
+            extractor.stats = stats
+        yield from extractor.iter_all(drawing_data)
+
+
+def main():
+    """Main extraction function."""
+    parser = argparse.ArgumentParser(description="Extract design elements from drawing_data Excel files.")
+    parser.add_argument("--allow-name-duplicates", action="store_true", help="Allow duplicate TABLE/INVERTER names (always create new).")
+    parser.add_argument("--drawing-data-path", default=None, help="Override path to drawing_data folder (or a zip archive of the drawing sets).")
+    parser.add_argument("--output", default=None, help="Override output path for new elements ('-' streams them to stdout, progress goes to stderr).")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default='csv', help="Output format for new elements; jsonl is written as elements are created and ends with a summary record (default csv).")
+    parser.add_argument("--row-cache", default=None, help="Override path to the workbook row cache (JSON).")
+    parser.add_argument("--no-row-cache", action="store_true", help="Parse every workbook, ignoring the row cache.")
+    parser.add_argument("--data-path", default=None, help="Override path to data folder (lookup CSVs).")
+    parser.add_argument("--manifest", default=None, help="Override path to the extraction manifest (JSON).")
+    parser.add_argument("--plan", action="store_true", help="Estimate rows, elements, runtime and memory without parsing any workbook.")
+    parser.add_argument("--plot", default=None, help="Only extract these plots, e.g. A-16b or A-16b,A-16c.")
+    parser.add_argument("--block", default=None, help="Only extract these blocks, e.g. BL10,BL11.")
+    parser.add_argument("--files", default=None, help="Only extract workbooks whose filename (or folder/filename) matches this glob.")
+    parser.add_argument("--load-workers", type=int, default=None, help="Processes for parsing DESIGNELEMENTS.csv (default: one per CPU for large files, 1 = serial).")
+    parser.add_argument("--external-dedup", action="store_true", help="Deduplicate TABLE/INVERTER elements with an external sort-merge (bounded memory).")
+    parser.add_argument("--memory-budget-mb", type=float, default=None, help="Key buffer for --external-dedup before runs spill to disk (default 256).")
+    parser.add_argument("--spill-dir", default=None, help="Folder for --external-dedup run files (default: next to the output CSV).")
+    parser.add_argument("--prefetch-workers", type=int, default=0, help="Threads that read and decompress upcoming workbooks into memory (default 0 = off).")
+    parser.add_argument("--max-blank-rows", type=int, default=DEFAULT_MAX_BLANK_ROWS, help=f"Stop reading a sheet after this many consecutive empty rows (0 = read to the end, default {DEFAULT_MAX_BLANK_ROWS}).")
+    args = parser.parse_args()
+    if args.max_blank_rows < 0:
+        parser.error("--max-blank-rows must be 0 (read to the end) or more")
+    if args.external_dedup and (args.output == '-' or args.format != 'csv'):
+        parser.error("--external-dedup decides new elements only at the end and writes CSV; it cannot stream (--output - / --format jsonl)")
+    try:
+        selection = ExtractionFilter.from_args(args.plot, args.block, args.files)
+    except TransformationError as e:
+        parser.error(str(e))
+
+    # Define paths
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+    data_path = Path(args.data_path) if args.data_path else (base_path / "data")
+    drawing_data_path = Path(args.drawing_data_path) if args.drawing_data_path else (base_path / "drawing_data")
+    manifest_path = Path(args.manifest) if args.manifest else (base_path / "output" / "extraction_manifest.json")
+    manifest = ExtractionManifest(manifest_path)
+
+    plots_projects_csv = data_path / "CCTECH.DRS.ENTITIES-PLOTS-PROJECTS.csv"
+
+    try:
+        check_drawing_data(drawing_data_path)
+    except ArchiveLayoutError as e:
+        parser.error(str(e))
+
+    # A zip archive of the drawing sets is read in place, without unpacking
+    with open_drawing_data(drawing_data_path) as drawing_data, stdout_output(args.output == '-') as output_stream:
+        if args.plan:
+            plot_projects = None
+            if plots_projects_csv.exists():
+                plot_projects = {
+                    plot_name.upper(): project_id
+                    for project_id, plot_name in load_plots_projects_mapping(str(plots_projects_csv)).values()
+                }
+            plan = plan_extraction(
+                drawing_data,
+                manifest,
+                design_elements_csv=data_path / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv",
+                plot_projects=plot_projects,
+                selection=selection
+            )
+            print_plan(plan)
+            return
+
+        # For a partial extraction only the selected plots' projects are loaded
+        project_ids = selected_project_ids(drawing_data, selection, plots_projects_csv)
+
+        # Build lookup dictionaries
+        print("🔄 Loading lookup dictionaries...")
+        design_elements_csv = data_path / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
+        lookup_started = time.perf_counter()
+        lookups = build_lookup_dictionaries(
+            str(plots_projects_csv),
+            str(data_path / "CCTECH.DRS.ENTITIES-PLOTS.csv"),
+            str(design_elements_csv),
+            project_ids=project_ids,
+            workers=args.load_workers,
+            # Out of core, TABLE/INVERTER rows are streamed from the CSV instead
+            element_types=("PLOT", "BLOCK") if args.external_dedup else None
+        )
+        lookup_seconds = time.perf_counter() - lookup_started
+        print("   ✅ Lookups loaded!\n")
+
+        # Workbooks with identical sheet content (apart from block prefixes) are parsed once
+        row_cache = None
+        if not args.no_row_cache:
+            row_cache_path = Path(args.row_cache) if args.row_cache else (base_path / "output" / "row_cache.json")
+            row_cache = RowCache(row_cache_path)
+
+        output_file = Path(args.output) if args.output else (base_path / "output" / f"new_design_elements.{args.format}")
+        if args.external_dedup:
+            from external_dedup import run_external_extraction, DEFAULT_MEMORY_BUDGET_MB
+            run_external_extraction(
+                lookups,
+                drawing_data,
+                output_file,
+                design_elements_csv,
+                memory_budget_mb=args.memory_budget_mb or DEFAULT_MEMORY_BUDGET_MB,
+                spill_dir=Path(args.spill_dir) if args.spill_dir else None,
+                allow_name_duplicates=args.allow_name_duplicates,
+                row_cache=row_cache,
+                manifest=manifest,
+                selection=selection,
+                existing_csv_bytes=design_elements_csv.stat().st_size,
+                lookup_seconds=lookup_seconds,
+                max_blank_rows=args.max_blank_rows,
+                prefetch_workers=args.prefetch_workers
+            )
+            return
+        run_extraction(
+            lookups,
+            drawing_data,
+            output_file,
+            allow_name_duplicates=args.allow_name_duplicates,
+            row_cache=row_cache,
+            manifest=manifest,
+            selection=selection,
+            existing_csv_bytes=design_elements_csv.stat().st_size,
+            lookup_seconds=lookup_seconds,
+            max_blank_rows=args.max_blank_rows,
+            prefetch_workers=args.prefetch_workers,
+            output_format=args.format,
+            output_stream=output_stream
+        )
+
 
 if __name__ == "__main__":
     main()
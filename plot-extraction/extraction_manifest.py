@@ -0,0 +1,254 @@
+"""
+Extraction Manifest Module
+==========================
+
+Records what each extraction run did, so later runs and tools can reason about
+the corpus without re-opening workbooks:
+1. Per-file records: size/mtime, sheet XML size, fingerprint, rows, elements, time
+2. Run history: totals, wall time and peak memory of past runs
+
+Stored as one JSON file (output/extraction_manifest.json by default).
+
+Date: October 18, 2026
+"""
+
+import json
+import os
+import sys
+import time
+import zipfile
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Bump when recorded values change meaning so old records are ignored
+# (v2: rows_read stops at the last data row instead of the declared sheet size)
+MANIFEST_VERSION = 2
+
+# Keep the history bounded; only recent runs matter for estimates
+MAX_RUN_HISTORY = 50
+
+
+@dataclass
+class FileRecord:
+    """What the last run saw and produced for one workbook."""
+    key: str
+    plot_name: Optional[str]
+    block_name: Optional[str]
+    size: int
+    mtime: float
+    sheet_xml_bytes: int
+    fingerprint: Optional[str] = None
+    rows_read: int = 0
+    elements_extracted: int = 0
+    seconds: float = 0.0
+    parsed: bool = True
+    declared_rows: Optional[int] = None
+    last_row: Optional[int] = None
+
+
+@dataclass
+class RunRecord:
+    """Totals for one extraction run."""
+    started_at: str
+    files: int = 0
+    files_parsed: int = 0
+    sheet_xml_bytes: int = 0
+    parsed_sheet_xml_bytes: int = 0
+    rows_read: int = 0
+    elements_extracted: int = 0
+    existing_csv_bytes: int = 0
+    lookup_seconds: float = 0.0
+    seconds: float = 0.0
+    parse_seconds: float = 0.0
+    peak_memory_bytes: Optional[int] = None
+
+
+def workbook_key(excel_path: Path) -> str:
+    """
+    Build the manifest key for a workbook: "<plot folder>/<filename>".
+
+    Args:
+        excel_path: Path to Excel file
+
+    Returns:
+        Key like "A16a - 50 MW/603C-LT Cable Routing-A16a-BL01-R0-30032025_DWGData.xlsx"
+    """
+    return f"{excel_path.parent.name}/{excel_path.name}"
+
+
+def sheet_xml_size(excel_path: Path) -> int:
+    """
+    Get the uncompressed size of the sheet XML and shared strings of a workbook.
+
+    Only the zip central directory is read; nothing is decompressed.
+
+    Args:
+        excel_path: Path to .xlsx file (or a file object over its bytes)
+
+    Returns:
+        Uncompressed bytes of xl/worksheets/*.xml plus xl/sharedStrings.xml
+    """
+    with zipfile.ZipFile(excel_path) as zf:
+        return sum(
+            info.file_size for info in zf.infolist()
+            if (info.filename.startswith('xl/worksheets/') and info.filename.endswith('.xml'))
+            or info.filename == 'xl/sharedStrings.xml'
+        )
+
+
+def peak_memory_bytes() -> Optional[int]:
+    """
+    Get the peak resident memory of this process so far.
+
+    Returns:
+        Peak RSS in bytes, or None if the platform does not report it
+    """
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class _ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ('cb', wintypes.DWORD),
+                ('PageFaultCount', wintypes.DWORD),
+                ('PeakWorkingSetSize', ctypes.c_size_t),
+                ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t),
+                ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        counters = _ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    except (AttributeError, OSError):
+        pass
+
+    return None
+
+
+class ExtractionManifest:
+    """Per-file records and run history, persisted as JSON."""
+
+    def __init__(self, manifest_path: Optional[Path] = None):
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        self.files: Dict[str, FileRecord] = {}
+        self.runs: List[RunRecord] = []
+        self._current_run: Optional[RunRecord] = None
+        self._run_started: float = 0.0
+
+        if self.manifest_path and self.manifest_path.exists():
+            self._load()
+
+    def _load(self):
+        """Load records from disk, ignoring files from another manifest version."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if payload.get('version') != MANIFEST_VERSION:
+            return
+
+        for key, record in payload.get('files', {}).items():
+            self.files[key] = FileRecord(**record)
+        self.runs = [RunRecord(**run) for run in payload.get('runs', [])]
+
+    def get_file(self, excel_path: Path) -> Optional[FileRecord]:
+        """
+        Get the record for a workbook if it is unchanged since it was recorded.
+
+        Args:
+            excel_path: Path to Excel file
+
+        Returns:
+            FileRecord, or None if unknown or the file's size/mtime changed
+        """
+        record = self.files.get(workbook_key(excel_path))
+        if record is None:
+            return None
+        stat = excel_path.stat()
+        if record.size != stat.st_size or record.mtime != stat.st_mtime:
+            return None
+        return record
+
+    def start_run(self, existing_csv_bytes: int = 0, lookup_seconds: float = 0.0):
+        """
+        Begin recording a run.
+
+        Args:
+            existing_csv_bytes: Size of the DESIGNELEMENTS.csv loaded for this run
+            lookup_seconds: Time spent building the lookup dictionaries
+        """
+        self._run_started = time.perf_counter()
+        self._current_run = RunRecord(
+            started_at=time.strftime('%Y-%m-%dT%H:%M:%S'),
+            existing_csv_bytes=existing_csv_bytes,
+            lookup_seconds=lookup_seconds
+        )
+
+    def record_file(self, record: FileRecord):
+        """
+        Store the record for a processed workbook and add it to the run totals.
+
+        Args:
+            record: FileRecord for the workbook
+        """
+        self.files[record.key] = record
+
+        run = self._current_run
+        if run is None:
+            return
+        run.files += 1
+        run.sheet_xml_bytes += record.sheet_xml_bytes
+        run.rows_read += record.rows_read
+        run.elements_extracted += record.elements_extracted
+        if record.parsed:
+            run.files_parsed += 1
+            run.parsed_sheet_xml_bytes += record.sheet_xml_bytes
+            run.parse_seconds += record.seconds
+
+    def finish_run(self):
+        """Close the current run and append it to the history."""
+        run = self._current_run
+        if run is None:
+            return
+        run.seconds = time.perf_counter() - self._run_started
+        run.peak_memory_bytes = peak_memory_bytes()
+        self.runs.append(run)
+        self.runs = self.runs[-MAX_RUN_HISTORY:]
+        self._current_run = None
+
+    def save(self):
+        """Write the manifest to disk (temp file + rename)."""
+        if not self.manifest_path:
+            return
+
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'version': MANIFEST_VERSION,
+            'files': {key: asdict(record) for key, record in sorted(self.files.items())},
+            'runs': [asdict(run) for run in self.runs]
+        }
+        temp_path = self.manifest_path.with_suffix(self.manifest_path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=1)
+        os.replace(temp_path, self.manifest_path)
@@ -0,0 +1,305 @@
+"""
+Extraction Plan Module
+======================
+
+Preflight estimate of an extraction run without opening a single worksheet:
+1. Walks drawing_data/ and reads each workbook's zip central directory only
+2. Uses the extraction manifest (past runs) to calibrate rows/elements/time/memory
+3. Flags folder/filename naming issues the extractor would report
+
+Date: October 18, 2026
+"""
+
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from transform_logic import (
+    folder_to_plot_name,
+    filename_to_block_name,
+    filename_to_plot_name,
+    validate_plot_consistency,
+    ExtractionFilter
+)
+from extraction_manifest import ExtractionManifest, sheet_xml_size
+from drawing_archive import workbook_file
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+# Defaults measured on the Khavda Phase-3 corpus, used until a run is recorded
+DEFAULT_SHEET_BYTES_PER_ROW = 120.0
+DEFAULT_ELEMENTS_PER_ROW = 1.1
+DEFAULT_SECONDS_PER_SHEET_BYTE = 5e-7
+DEFAULT_LOOKUP_SECONDS_PER_CSV_BYTE = 5e-8
+DEFAULT_BASE_MEMORY_BYTES = 25 * 1024 * 1024
+DEFAULT_MEMORY_BYTES_PER_ELEMENT = 450.0
+
+# DESIGNELEMENTS rows are three UUIDs plus a short name and type
+CSV_BYTES_PER_ROW = 125.0
+
+
+@dataclass
+class PlanModel:
+    """Cost ratios used to turn sheet XML sizes into estimates."""
+    sheet_bytes_per_row: float = DEFAULT_SHEET_BYTES_PER_ROW
+    elements_per_row: float = DEFAULT_ELEMENTS_PER_ROW
+    seconds_per_sheet_byte: float = DEFAULT_SECONDS_PER_SHEET_BYTE
+    lookup_seconds_per_csv_byte: float = DEFAULT_LOOKUP_SECONDS_PER_CSV_BYTE
+    base_memory_bytes: float = DEFAULT_BASE_MEMORY_BYTES
+    memory_bytes_per_element: float = DEFAULT_MEMORY_BYTES_PER_ELEMENT
+    calibrated_runs: int = 0
+
+    @classmethod
+    def from_manifest(cls, manifest: ExtractionManifest) -> 'PlanModel':
+        """
+        Calibrate the model from the run history of a manifest.
+
+        Args:
+            manifest: ExtractionManifest with past runs
+
+        Returns:
+            PlanModel (defaults for anything the history cannot tell)
+        """
+        model = cls()
+        runs = manifest.runs
+        if not runs:
+            return model
+
+        sheet_bytes = sum(r.sheet_xml_bytes for r in runs)
+        rows = sum(r.rows_read for r in runs)
+        elements = sum(r.elements_extracted for r in runs)
+        parsed_bytes = sum(r.parsed_sheet_xml_bytes for r in runs)
+        parse_seconds = sum(r.parse_seconds for r in runs)
+        csv_bytes = sum(r.existing_csv_bytes for r in runs if r.lookup_seconds)
+        lookup_seconds = sum(r.lookup_seconds for r in runs if r.lookup_seconds)
+
+        if rows:
+            model.sheet_bytes_per_row = sheet_bytes / rows
+            model.elements_per_row = elements / rows
+        if parsed_bytes:
+            model.seconds_per_sheet_byte = parse_seconds / parsed_bytes
+        if csv_bytes:
+            model.lookup_seconds_per_csv_byte = lookup_seconds / csv_bytes
+
+        # Memory per element from the most recent run that reported a peak
+        for run in reversed(runs):
+            loaded = int(run.existing_csv_bytes / CSV_BYTES_PER_ROW) + run.elements_extracted
+            if run.peak_memory_bytes and loaded and run.peak_memory_bytes > model.base_memory_bytes:
+                model.memory_bytes_per_element = (run.peak_memory_bytes - model.base_memory_bytes) / loaded
+                break
+
+        model.calibrated_runs = len(runs)
+        return model
+
+    def peak_memory(self, loaded_elements: int) -> int:
+        """Estimate peak memory for a run holding this many elements."""
+        return int(self.base_memory_bytes + self.memory_bytes_per_element * loaded_elements)
+
+
+@dataclass
+class FolderPlan:
+    """Estimate for one plot folder."""
+    folder_name: str
+    plot_name: Optional[str]
+    project_id: Optional[str] = None
+    files: int = 0
+    known_files: int = 0
+    sheet_xml_bytes: int = 0
+    est_rows: int = 0
+    est_elements: int = 0
+    est_seconds: float = 0.0
+    est_peak_memory_bytes: int = 0
+    issues: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ExtractionPlan:
+    """Estimate for a whole run."""
+    folders: List[FolderPlan]
+    model: PlanModel
+    existing_elements: int = 0
+    lookup_seconds: float = 0.0
+
+    def total_rows(self) -> int:
+        return sum(f.est_rows for f in self.folders)
+
+    def total_elements(self) -> int:
+        return sum(f.est_elements for f in self.folders)
+
+    def total_seconds(self) -> float:
+        return self.lookup_seconds + sum(f.est_seconds for f in self.folders)
+
+    def peak_memory_bytes(self) -> int:
+        return self.model.peak_memory(self.existing_elements + self.total_elements())
+
+    def issues(self) -> List[str]:
+        return [issue for f in self.folders for issue in f.issues]
+
+
+def plan_folder(
+    plot_folder: Path,
+    model: PlanModel,
+    manifest: ExtractionManifest,
+    plot_projects: Optional[Dict[str, str]] = None,
+    selection: Optional[ExtractionFilter] = None
+) -> FolderPlan:
+    """
+    Estimate the work for one plot folder from zip directories and the manifest.
+
+    Args:
+        plot_folder: Path to plot folder (e.g., "A16a - 50 MW")
+        model: Calibrated PlanModel
+        manifest: ExtractionManifest with records of unchanged files
+        plot_projects: Optional {PLOT_NAME (upper): PROJECT_ID} for project checks
+        selection: Optional ExtractionFilter limiting the workbooks considered
+
+    Returns:
+        FolderPlan
+    """
+    selection = selection or ExtractionFilter()
+    plot_name = folder_to_plot_name(plot_folder.name)
+    plan = FolderPlan(folder_name=plot_folder.name, plot_name=plot_name)
+
+    if not plot_name:
+        plan.issues.append(f"Failed to extract plot name from folder: {plot_folder.name}")
+    elif plot_projects is not None:
+        plan.project_id = plot_projects.get(plot_name.upper())
+        if not plan.project_id:
+            plan.issues.append(f"No PROJECT_ID found for plot: {plot_name}")
+
+    seen_blocks: Dict[str, str] = {}
+    for excel_path in sorted(plot_folder.glob("*.xlsx")):
+        if not selection.matches_file(plot_folder.name, excel_path.name):
+            continue
+        plan.files += 1
+
+        block_name = filename_to_block_name(excel_path.name)
+        if not block_name:
+            plan.issues.append(f"Failed to extract block name from: {excel_path.name}")
+        elif block_name in seen_blocks:
+            plan.issues.append(f"Block {block_name} appears twice: {seen_blocks[block_name]}, {excel_path.name}")
+        else:
+            seen_blocks[block_name] = excel_path.name
+
+        filename_plot = filename_to_plot_name(excel_path.name)
+        if plot_name and not validate_plot_consistency(plot_name, filename_plot):
+            plan.issues.append(f"Plot name mismatch: folder={plot_name}, file={filename_plot} (from {excel_path.name})")
+
+        try:
+            xml_bytes = sheet_xml_size(workbook_file(excel_path))
+        except zipfile.BadZipFile:
+            plan.issues.append(f"Not a valid xlsx (zip) file: {excel_path.name}")
+            continue
+        plan.sheet_xml_bytes += xml_bytes
+
+        record = manifest.get_file(excel_path)
+        if record is not None:
+            # Unchanged since the last run: counts are exact
+            plan.known_files += 1
+            plan.est_rows += record.rows_read
+            plan.est_elements += record.elements_extracted
+        else:
+            rows = int(xml_bytes / model.sheet_bytes_per_row)
+            plan.est_rows += rows
+            plan.est_elements += int(rows * model.elements_per_row)
+        plan.est_seconds += xml_bytes * model.seconds_per_sheet_byte
+
+    return plan
+
+
+def plan_extraction(
+    drawing_data_path: Path,
+    manifest: ExtractionManifest,
+    design_elements_csv: Optional[Path] = None,
+    plot_projects: Optional[Dict[str, str]] = None,
+    selection: Optional[ExtractionFilter] = None
+) -> ExtractionPlan:
+    """
+    Estimate an extraction run without opening any worksheet.
+
+    Args:
+        drawing_data_path: Path to drawing_data/ folder
+        manifest: ExtractionManifest (history of past runs)
+        design_elements_csv: Optional DESIGNELEMENTS.csv, sized to estimate lookup cost
+        plot_projects: Optional {PLOT_NAME (upper): PROJECT_ID}
+        selection: Optional ExtractionFilter (defaults to every folder and workbook)
+
+    Returns:
+        ExtractionPlan
+    """
+    model = PlanModel.from_manifest(manifest)
+
+    csv_bytes = 0
+    if design_elements_csv is not None and Path(design_elements_csv).exists():
+        csv_bytes = Path(design_elements_csv).stat().st_size
+    existing_elements = int(csv_bytes / CSV_BYTES_PER_ROW)
+
+    selection = selection or ExtractionFilter()
+    if selection.is_active():
+        plot_folders = list(selection.select_files(drawing_data_path))
+    else:
+        plot_folders = [f for f in drawing_data_path.iterdir() if f.is_dir()]
+
+    folders = []
+    for plot_folder in sorted(plot_folders):
+        folder_plan = plan_folder(plot_folder, model, manifest, plot_projects, selection)
+        folder_plan.est_peak_memory_bytes = model.peak_memory(existing_elements + folder_plan.est_elements)
+        folders.append(folder_plan)
+
+    return ExtractionPlan(
+        folders=folders,
+        model=model,
+        existing_elements=existing_elements,
+        lookup_seconds=csv_bytes * model.lookup_seconds_per_csv_byte
+    )
+
+
+def _mb(num_bytes: float) -> str:
+    return f"{num_bytes / (1024 * 1024):,.1f} MB"
+
+
+def print_plan(plan: ExtractionPlan):
+    """Print an extraction plan."""
+    print("="*80)
+    print("EXTRACTION PLAN (no worksheets opened)")
+    print("="*80)
+
+    if plan.model.calibrated_runs:
+        print(f"\n📈 Calibrated from {plan.model.calibrated_runs} recorded run(s)")
+    else:
+        print(f"\n📈 No recorded runs yet - using default cost model")
+
+    for folder in plan.folders:
+        print(f"\n📁 {folder.folder_name} → {folder.plot_name or '?'}")
+        print(f"   Files:            {folder.files} ({folder.known_files} unchanged since last run)")
+        print(f"   Sheet XML:        {_mb(folder.sheet_xml_bytes)}")
+        print(f"   Est. rows:        {folder.est_rows:,}")
+        print(f"   Est. elements:    {folder.est_elements:,}")
+        print(f"   Est. runtime:     {folder.est_seconds:,.1f} s")
+        print(f"   Est. peak memory: {_mb(folder.est_peak_memory_bytes)} (this folder alone)")
+        for issue in folder.issues:
+            print(f"   ⚠️  {issue}")
+
+    print(f"\n{'='*80}")
+    print("TOTAL")
+    print("="*80)
+    print(f"   Plot folders:      {len(plan.folders)}")
+    print(f"   Files:             {sum(f.files for f in plan.folders)}")
+    print(f"   Existing elements: ~{plan.existing_elements:,} (lookup load ~{plan.lookup_seconds:,.1f} s)")
+    print(f"   Est. rows:         {plan.total_rows():,}")
+    print(f"   Est. elements:     {plan.total_elements():,}")
+    print(f"   Est. runtime:      {plan.total_seconds():,.1f} s")
+    print(f"   Est. peak memory:  {_mb(plan.peak_memory_bytes())}")
+
+    issues = plan.issues()
+    if issues:
+        print(f"\n⚠️  {len(issues)} naming/consistency issue(s) would be reported")
+    else:
+        print(f"\n✅ No naming/consistency issues found")
@@ -0,0 +1,448 @@
+"""
+Extraction Service
+==================
+
+Long-lived local service that keeps the lookup dictionaries, the workbook row
+cache and the extraction manifest in memory, so small incremental jobs do not
+pay interpreter startup, the openpyxl import and a full lookup build each time.
+
+Server:
+    python extraction_service.py serve --data-path data --drawing-data-path drawing_data
+
+Client (stdlib only, nothing heavy is imported):
+    python extraction_service.py extract --plot A-16b --block BL10,BL11
+    python extraction_service.py append
+    python extraction_service.py verify
+    python extraction_service.py status
+    python extraction_service.py stop
+
+Jobs are JSON POSTs to http://127.0.0.1:8765/jobs/<name> and run one at a
+time. Before each job the lookups are refreshed from DESIGNELEMENTS.csv, so
+rows appended by other processes cost only their own bytes to pick up.
+
+Jobs write files chosen by the caller, so every request must carry the token
+the service writes to output/extraction_service.token at startup (readable by
+the starting user only). Requests from web pages are refused: they cannot
+read the token, and requests with an Origin header or a POST body that is
+not application/json are rejected before the token is checked.
+
+Date: October 18, 2026
+"""
+
+import argparse
+import contextlib
+import hmac
+import io
+import json
+import os
+import secrets
+import sys
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Written to the output folder at startup; clients send it in TOKEN_HEADER
+TOKEN_FILENAME = "extraction_service.token"
+TOKEN_HEADER = "X-Service-Token"
+
+BASE_PATH = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+
+
+class ServiceState:
+    """Everything the service keeps warm between jobs."""
+
+    def __init__(self, data_path: Path, drawing_data_path: Path, output_path: Path):
+        # Heavy imports happen here, once per service lifetime
+        from lookup_builder import build_lookup_dictionaries
+        from row_cache import RowCache
+        from extraction_manifest import ExtractionManifest
+
+        self._build_lookup_dictionaries = build_lookup_dictionaries
+
+        self.data_path = data_path
+        self.drawing_data_path = drawing_data_path
+        self.output_path = output_path
+        self.plots_projects_csv = data_path / "CCTECH.DRS.ENTITIES-PLOTS-PROJECTS.csv"
+        self.plots_csv = data_path / "CCTECH.DRS.ENTITIES-PLOTS.csv"
+        self.design_elements_csv = data_path / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
+
+        self.row_cache = RowCache(output_path / "row_cache.json")
+        self.manifest = ExtractionManifest(output_path / "extraction_manifest.json")
+        self.lookups = None
+        self.lookup_seconds = 0.0
+        self.reloads = 0
+        self.refreshed_rows = 0
+        self.jobs_run = 0
+
+        self.reload_lookups()
+
+    def reload_lookups(self):
+        """Build the lookup dictionaries from scratch."""
+        started = time.perf_counter()
+        self.lookups = self._build_lookup_dictionaries(
+            str(self.plots_projects_csv),
+            str(self.plots_csv),
+            str(self.design_elements_csv)
+        )
+        self.lookup_seconds = time.perf_counter() - started
+        self.reloads += 1
+
+    def ensure_fresh(self):
+        """Pick up rows appended to DESIGNELEMENTS.csv since the last job."""
+        result = self.lookups.refresh()
+        if result['full_reload']:
+            print("🔄 DESIGNELEMENTS.csv was rewritten - reloaded design elements")
+            self.reloads += 1
+        elif result['rows']:
+            print(f"🔄 Picked up {result['rows']:,} appended DESIGNELEMENTS row(s)")
+            self.refreshed_rows += result['rows']
+
+    def status(self) -> Dict:
+        """Service status for the status endpoint."""
+        return {
+            'pid': os.getpid(),
+            'lookups': self.lookups.get_stats(),
+            'lookup_seconds': round(self.lookup_seconds, 3),
+            'lookup_reloads': self.reloads,
+            'refreshed_rows': self.refreshed_rows,
+            'row_cache': self.row_cache.get_stats(),
+            'manifest_files': len(self.manifest.files),
+            'jobs_run': self.jobs_run
+        }
+
+
+def job_extract(state: ServiceState, params: Dict) -> Dict:
+    """Run an extraction with the warm lookups."""
+    from extract_design_elements import run_extraction, DEFAULT_MAX_BLANK_ROWS
+    from transform_logic import ExtractionFilter
+    from drawing_archive import open_drawing_data
+
+    selection = ExtractionFilter.from_args(params.get('plot'), params.get('block'), params.get('files'))
+    drawing_data_path = Path(params.get('drawing_data_path') or state.drawing_data_path)
+    output_file = Path(params.get('output') or (state.output_path / f"new_design_elements.{params.get('format', 'csv')}"))
+    row_cache = None if params.get('no_row_cache') else state.row_cache
+
+    with open_drawing_data(drawing_data_path) as drawing_data:
+        extractor, success = run_extraction(
+            state.lookups,
+            drawing_data,
+            output_file,
+            allow_name_duplicates=bool(params.get('allow_name_duplicates')),
+            row_cache=row_cache,
+            manifest=state.manifest,
+            selection=selection,
+            existing_csv_bytes=state.design_elements_csv.stat().st_size,
+            max_blank_rows=int(params.get('max_blank_rows', DEFAULT_MAX_BLANK_ROWS)),
+            prefetch_workers=int(params.get('prefetch_workers', 0)),
+            output_format=params.get('format', 'csv')
+        )
+    return {
+        'success': success,
+        'new_elements': len(extractor.new_elements),
+        'errors': len(extractor.stats.errors),
+        'output': str(output_file)
+    }
+
+
+def job_append(state: ServiceState, params: Dict) -> Dict:
+    """Append new elements to DESIGNELEMENTS.csv and refresh the warm lookups."""
+    from append_to_csv import run_append
+
+    new_elements_csv = Path(params.get('new_elements_csv') or (state.output_path / "new_design_elements.csv"))
+    report_path = Path(params.get('report') or (state.output_path / "append_summary_report.txt"))
+
+    result = run_append(state.design_elements_csv, new_elements_csv, report_path)
+    if result is None:
+        return {'success': False}
+
+    state.ensure_fresh()
+
+    return {
+        'success': True,
+        'rows_appended': result['rows_appended'],
+        'backup_path': str(result['backup_path']),
+        'hierarchy_issues': result['stats']['orphans']
+    }
+
+
+def job_verify(state: ServiceState, params: Dict) -> Dict:
+    """Count DESIGNELEMENTS rows per project, type and block in one streaming pass."""
+    from dataclasses import asdict
+    from verification import verify_design_elements, load_project_names, print_verification, write_summary
+
+    result = verify_design_elements(state.design_elements_csv, load_project_names(state.plots_projects_csv))
+    print_verification(result)
+    if params.get('write_summary'):
+        write_summary(result, state.output_path)
+
+    payload = asdict(result)
+    payload['success'] = True
+    return payload
+
+
+JOBS = {
+    'extract': job_extract,
+    'append': job_append,
+    'verify': job_verify,
+}
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    """HTTP front end; one request (job) at a time."""
+
+    state: ServiceState = None
+    token: str = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _authorized(self) -> bool:
+        """Refuse browser (cross-origin) requests and requests without the service token."""
+        if self.headers.get('Origin') is not None:
+            self._send_json({'ok': False, 'error': 'Requests from web pages are not accepted'}, 403)
+            return False
+        if not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ''), self.token):
+            self._send_json({'ok': False, 'error': f"Missing or wrong {TOKEN_HEADER}"}, 403)
+            return False
+        return True
+
+    def _send_json(self, payload: Dict, status: int = 200):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path == '/status':
+            self._send_json({'ok': True, 'result': self.state.status()})
+        else:
+            self._send_json({'ok': False, 'error': f"Unknown path: {self.path}"}, 404)
+
+    def do_POST(self):
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            self._send_json({'ok': False, 'error': 'Content-Type must be application/json'}, 415)
+            return
+        if not self._authorized():
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            params = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json({'ok': False, 'error': 'Request body is not JSON'}, 400)
+            return
+
+        if self.path == '/shutdown':
+            self._send_json({'ok': True, 'result': 'stopping'})
+            self.server.stop_requested = True
+            return
+
+        name = self.path[len('/jobs/'):] if self.path.startswith('/jobs/') else None
+        job = JOBS.get(name)
+        if job is None:
+            self._send_json({'ok': False, 'error': f"Unknown job: {self.path}"}, 404)
+            return
+
+        started = time.perf_counter()
+        log = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(log):
+                self.state.ensure_fresh()
+                result = job(self.state, params)
+            ok = True
+            error = None
+        except Exception as e:
+            result = None
+            ok = False
+            error = f"{type(e).__name__}: {e}"
+        self.state.jobs_run += 1
+
+        self._send_json({
+            'ok': ok,
+            'error': error,
+            'result': result,
+            'log': log.getvalue(),
+            'seconds': round(time.perf_counter() - started, 3)
+        })
+
+
+def write_token(token_path: Path) -> str:
+    """
+    Write a new service token, readable by the current user only.
+
+    Args:
+        token_path: Token file (replaced if it exists)
+
+    Returns:
+        The token
+    """
+    token = secrets.token_urlsafe(32)
+    token_path.parent.mkdir(parents=True, exist_ok=True)
+    with contextlib.suppress(FileNotFoundError):
+        token_path.unlink()
+    fd = os.open(token_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w', encoding='ascii') as f:
+        f.write(token)
+    return token
+
+
+def serve(data_path: Path, drawing_data_path: Path, output_path: Path,
+          host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+    """
+    Run the service until a /shutdown request arrives.
+
+    Args:
+        data_path: Folder with the lookup CSVs
+        drawing_data_path: Default drawing_data/ folder for extract jobs
+        output_path: Folder for outputs, row cache and manifest
+        host: Interface to bind (localhost only by default)
+        port: TCP port
+    """
+    print(f"🔄 Starting extraction service on http://{host}:{port}")
+    state = ServiceState(data_path, drawing_data_path, output_path)
+    print(f"   ✅ Lookups warm ({state.lookup_seconds:.2f} s) - waiting for jobs")
+
+    _ServiceHandler.state = state
+    server = HTTPServer((host, port), _ServiceHandler)
+    token_path = output_path / TOKEN_FILENAME
+    _ServiceHandler.token = write_token(token_path)
+    print(f"   🔑 Clients authenticate with the token in {token_path}")
+    server.stop_requested = False
+    try:
+        while not server.stop_requested:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            token_path.unlink()
+        state.row_cache.save()
+        state.manifest.save()
+    print("👋 Extraction service stopped")
+
+
+def call_service(url: str, path: str, token: str, params: Optional[Dict] = None, timeout: float = 3600) -> Dict:
+    """
+    Send a request to a running service.
+
+    Args:
+        url: Service base URL, e.g. http://127.0.0.1:8765
+        path: "/status", "/shutdown" or "/jobs/<name>"
+        token: Contents of the service's token file
+        params: JSON parameters (POST); None for GET
+        timeout: Seconds to wait for the job to finish
+
+    Returns:
+        Decoded JSON response (also for refused requests)
+    """
+    data = None if params is None else json.dumps(params).encode('utf-8')
+    request = urllib.request.Request(
+        url.rstrip('/') + path,
+        data=data,
+        headers={'Content-Type': 'application/json', TOKEN_HEADER: token}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        try:
+            return json.loads(e.read())
+        except ValueError:
+            return {'ok': False, 'error': f"HTTP {e.code}: {e.reason}"}
+
+
+def main():
+    """Service entry point: serve, or act as a thin client."""
+    parser = argparse.ArgumentParser(description="Warm extraction service and its thin client.")
+    parser.add_argument("--url", default=f"http://{DEFAULT_HOST}:{DEFAULT_PORT}", help="Service URL (client commands).")
+    parser.add_argument("--token-file", default=None, help=f"Service token (client commands; default: output/{TOKEN_FILENAME}).")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = sub.add_parser("serve", help="Start the service.")
+    serve_parser.add_argument("--data-path", default=None, help="Override path to data folder (lookup CSVs).")
+    serve_parser.add_argument("--drawing-data-path", default=None, help="Override path to drawing_data folder.")
+    serve_parser.add_argument("--output-path", default=None, help="Override path to output folder.")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    extract_parser = sub.add_parser("extract", help="Run an extraction job.")
+    extract_parser.add_argument("--allow-name-duplicates", action="store_true")
+    extract_parser.add_argument("--drawing-data-path", default=None)
+    extract_parser.add_argument("--output", default=None)
+    extract_parser.add_argument("--no-row-cache", action="store_true")
+    extract_parser.add_argument("--plot", default=None)
+    extract_parser.add_argument("--block", default=None)
+    extract_parser.add_argument("--files", default=None)
+    extract_parser.add_argument("--max-blank-rows", type=int, default=None)
+
+    append_parser = sub.add_parser("append", help="Append new elements to DESIGNELEMENTS.csv.")
+    append_parser.add_argument("--new-elements-csv", default=None)
+    append_parser.add_argument("--report", default=None)
+
+    verify_parser = sub.add_parser("verify", help="Count DESIGNELEMENTS rows per project, type and block.")
+    verify_parser.add_argument("--write-summary", action="store_true", help="Also write verification_summary.txt/.json.")
+    sub.add_parser("status", help="Show service status.")
+    sub.add_parser("stop", help="Stop the service.")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(
+            Path(args.data_path) if args.data_path else BASE_PATH / "data",
+            Path(args.drawing_data_path) if args.drawing_data_path else BASE_PATH / "drawing_data",
+            Path(args.output_path) if args.output_path else BASE_PATH / "output",
+            port=args.port
+        )
+        return
+
+    token_path = Path(args.token_file) if args.token_file else BASE_PATH / "output" / TOKEN_FILENAME
+    try:
+        token = token_path.read_text(encoding='ascii').strip()
+    except OSError:
+        print(f"❌ No service token at {token_path} - is the service running (or pass --token-file)?")
+        sys.exit(2)
+
+    try:
+        if args.command == "status":
+            response = call_service(args.url, "/status", token)
+        elif args.command == "stop":
+            response = call_service(args.url, "/shutdown", token, {})
+        else:
+            params = {k: v for k, v in vars(args).items() if k not in ('url', 'token_file', 'command') and v is not None and v is not False}
+            response = call_service(args.url, f"/jobs/{args.command}", token, params)
+    except (urllib.error.URLError, ConnectionError) as e:
+        print(f"❌ Extraction service not reachable at {args.url}: {e}")
+        sys.exit(2)
+
+    if response.get('log'):
+        sys.stdout.write(response['log'])
+    if response.get('ok'):
+        print(json.dumps(response.get('result'), indent=2))
+        if 'seconds' in response:
+            print(f"⏱️  Job took {response['seconds']:.3f} s in the service")
+    else:
+        print(f"❌ {response.get('error')}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
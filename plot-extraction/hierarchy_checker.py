@@ -0,0 +1,462 @@
+"""
+Hierarchy Integrity Checker
+===========================
+
+Checks the whole DESIGNELEMENTS.csv (not just newly appended rows) for
+hierarchy problems while streaming it once:
+1. Malformed rows (wrong field count, e.g. two rows glued together)
+2. Duplicate IDs and duplicate keys (same NAME/TYPE under the same parent)
+3. Orphans (PARENT_ID not in the file) and missing PARENT_IDs
+4. Cross-project parent links
+5. Illegal type edges (allowed: PLOT → BLOCK → TABLE/INVERTER)
+6. Parent cycles
+
+Findings are written as JSON Lines, one object per finding. The default mode
+keeps an in-memory index (O(n)); --compact keeps only 64-bit digests in
+arrays (roughly 50 bytes per row) and re-reads the file to describe findings.
+
+Usage:
+    python hierarchy_checker.py --csv data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv --output output/hierarchy_findings.jsonl
+
+Date: October 18, 2026
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import sys
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, asdict, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+COLUMNS = ('ID', 'PROJECT_ID', 'NAME', 'TYPE', 'PARENT_ID')
+
+# Element type → type its parent must have (None: no parent allowed)
+ALLOWED_PARENT_TYPE = {
+    'PLOT': None,
+    'BLOCK': 'PLOT',
+    'TABLE': 'BLOCK',
+    'INVERTER': 'BLOCK',
+}
+
+# Compact type codes (0 = unknown type)
+_TYPE_CODES = {name: code for code, name in enumerate(ALLOWED_PARENT_TYPE, start=1)}
+_TYPE_NAMES = {code: name for name, code in _TYPE_CODES.items()}
+
+# Finding kinds, in report order
+FINDING_KINDS = (
+    'malformed_row',
+    'unknown_type',
+    'duplicate_id',
+    'duplicate_key',
+    'missing_parent',
+    'orphan',
+    'cross_project',
+    'illegal_edge',
+    'cycle',
+)
+
+
+@dataclass
+class Finding:
+    """One hierarchy problem, tied to a CSV line."""
+    kind: str
+    row: int
+    detail: str
+    id: Optional[str] = None
+    project_id: Optional[str] = None
+    name: Optional[str] = None
+    type: Optional[str] = None
+    parent_id: Optional[str] = None
+
+
+@dataclass
+class HierarchyReport:
+    """Result of a hierarchy check."""
+    csv_path: str
+    rows: int = 0
+    compact: bool = False
+    findings: List[Finding] = field(default_factory=list)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of findings per kind."""
+        return dict(Counter(f.kind for f in self.findings))
+
+
+def digest64(value: str) -> int:
+    """
+    64-bit digest of a case-insensitive value, used by the compact mode.
+
+    Args:
+        value: ID, PROJECT_ID or key string
+
+    Returns:
+        Unsigned 64-bit integer (0 is reserved for empty values)
+
+    Examples:
+        >>> digest64('') == 0
+        True
+        >>> digest64('ABC') == digest64('abc')
+        True
+    """
+    if not value:
+        return 0
+    digest = hashlib.blake2b(value.lower().encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+def edge_problem(child_type: str, parent_type: Optional[str]) -> Optional[str]:
+    """
+    Check a child → parent type edge against the allowed hierarchy.
+
+    Args:
+        child_type: TYPE of the element (upper case)
+        parent_type: TYPE of its parent, or None if it has no PARENT_ID
+
+    Returns:
+        Description of the problem, or None if the edge is allowed
+
+    Examples:
+        >>> edge_problem('TABLE', 'BLOCK') is None
+        True
+        >>> edge_problem('TABLE', 'PLOT')
+        'TABLE under PLOT (expected BLOCK)'
+        >>> edge_problem('PLOT', 'BLOCK')
+        'PLOT must not have a parent (has BLOCK)'
+    """
+    expected = ALLOWED_PARENT_TYPE.get(child_type)
+    if child_type not in ALLOWED_PARENT_TYPE or parent_type == expected:
+        return None
+    if expected is None:
+        return f"PLOT must not have a parent (has {parent_type})"
+    return f"{child_type} under {parent_type} (expected {expected})"
+
+
+def iter_csv_rows(csv_path: Path) -> Iterator[Tuple[int, Optional[List[str]], List[str]]]:
+    """
+    Stream DESIGNELEMENTS rows with their line numbers.
+
+    Yields:
+        (line number, [ID, PROJECT_ID, NAME, TYPE, PARENT_ID] stripped or None
+        if the field count does not match the header, raw fields)
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = [h.strip().upper() for h in next(reader, [])]
+        missing = [c for c in COLUMNS if c not in header]
+        if missing:
+            raise ValueError(f"{csv_path} is missing column(s): {', '.join(missing)}")
+        positions = [header.index(c) for c in COLUMNS]
+
+        for raw in reader:
+            if not raw:
+                continue
+            if len(raw) != len(header):
+                yield reader.line_num, None, raw
+            else:
+                yield reader.line_num, [raw[p].strip() for p in positions], raw
+
+
+def find_cycles(parent_of: Sequence[int]) -> List[List[int]]:
+    """
+    Find cycles in a parent-pointer forest in O(n).
+
+    Args:
+        parent_of: parent_of[i] is the index of i's parent, or -1
+
+    Returns:
+        List of cycles, each a list of indices
+
+    Examples:
+        >>> find_cycles([-1, 0, 3, 2, 4])
+        [[2, 3], [4]]
+    """
+    state = bytearray(len(parent_of))  # 0 unseen, 1 on current path, 2 done
+    cycles = []
+    for start in range(len(parent_of)):
+        if state[start]:
+            continue
+        path = []
+        node = start
+        while node != -1 and state[node] == 0:
+            state[node] = 1
+            path.append(node)
+            node = parent_of[node]
+        if node != -1 and state[node] == 1:
+            cycles.append(path[path.index(node):])
+        for visited in path:
+            state[visited] = 2
+    return cycles
+
+
+class _Index:
+    """Per-row hierarchy data, as strings (full mode) or digests (compact mode)."""
+
+    def __init__(self, compact: bool):
+        self.compact = compact
+        self.rows = array('Q')
+        self.types = bytearray()
+        if compact:
+            self.ids = array('Q')
+            self.projects = array('Q')
+            self.parents = array('Q')
+            self.keys = array('Q')
+        else:
+            self.ids: List[str] = []
+            self.projects: List[str] = []
+            self.parents: List[str] = []
+            self.records: List[List[str]] = []
+            self._position: Dict[str, int] = {}
+            self._key_rows: Dict[Tuple[str, str, str, str], int] = {}
+        self._sorted_ids = None
+        self._sorted_positions = None
+
+    def add(self, row: int, fields: List[str]) -> List[Finding]:
+        """Add a well-formed row; return duplicate_id/duplicate_key findings in full mode."""
+        element_id, project_id, name, element_type, parent_id = fields
+        position = len(self.rows)
+        self.rows.append(row)
+        self.types.append(_TYPE_CODES.get(element_type.upper(), 0))
+
+        if self.compact:
+            self.ids.append(digest64(element_id))
+            self.projects.append(digest64(project_id))
+            self.parents.append(digest64(parent_id))
+            self.keys.append(digest64('\0'.join((project_id, parent_id, name, element_type))))
+            return []
+
+        self.ids.append(element_id.lower())
+        self.projects.append(project_id.lower())
+        self.parents.append(parent_id.lower())
+        self.records.append(fields)
+
+        findings = []
+        first = self._position.setdefault(element_id.lower(), position)
+        if first != position:
+            findings.append(Finding('duplicate_id', row, f"ID first seen on line {self.rows[first]}"))
+
+        key = (project_id.lower(), parent_id.lower(), name.upper(), element_type.upper())
+        first_row = self._key_rows.setdefault(key, row)
+        if first_row != row:
+            findings.append(Finding('duplicate_key', row, f"Same NAME/TYPE under the same parent on line {first_row}"))
+        return findings
+
+    def compact_duplicates(self) -> List[Finding]:
+        """Find duplicate IDs and keys by sorting digests (compact mode)."""
+        findings = []
+        for values, kind, detail in (
+            (self.ids, 'duplicate_id', "ID first seen on line {}"),
+            (self.keys, 'duplicate_key', "Same NAME/TYPE under the same parent on line {}"),
+        ):
+            # Stable sort: within equal digests, the first occurrence comes first
+            order = sorted(range(len(values)), key=values.__getitem__)
+            first = None
+            for previous, current in zip(order, order[1:]):
+                if values[current] != values[previous]:
+                    first = None
+                    continue
+                if first is None:
+                    first = previous
+                findings.append(Finding(kind, self.rows[current], detail.format(self.rows[first])))
+            if kind == 'duplicate_id':
+                # Keep the permutation: it is the id → position lookup
+                self._sorted_positions = array('Q', order)
+                self._sorted_ids = array('Q', (values[i] for i in order))
+        return findings
+
+    def find(self, element_id) -> int:
+        """Position of the first row with this ID (-1 if absent)."""
+        if not self.compact:
+            return self._position.get(element_id, -1)
+        i = bisect_left(self._sorted_ids, element_id)
+        if i < len(self._sorted_ids) and self._sorted_ids[i] == element_id:
+            return self._sorted_positions[i]
+        return -1
+
+
+def check_hierarchy(csv_path: Path, compact: bool = False) -> HierarchyReport:
+    """
+    Check every DESIGNELEMENTS row for hierarchy problems.
+
+    Args:
+        csv_path: Path to CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv (or any file
+            with its columns)
+        compact: Keep only 64-bit digests in memory (O(n log n), two reads)
+
+    Returns:
+        HierarchyReport with findings sorted by line number
+    """
+    csv_path = Path(csv_path)
+    report = HierarchyReport(csv_path=str(csv_path), compact=compact)
+    index = _Index(compact)
+    findings: List[Finding] = []
+    positions: List[int] = []  # position in index for row-level findings
+
+    for row, fields, raw in iter_csv_rows(csv_path):
+        report.rows += 1
+        if fields is None:
+            findings.append(Finding('malformed_row', row, f"{len(raw)} fields (expected {len(COLUMNS)})"))
+            positions.append(-1)
+            continue
+        position = len(index.rows)
+        for duplicate in index.add(row, fields):
+            findings.append(duplicate)
+            positions.append(position)
+        if fields[3].upper() not in ALLOWED_PARENT_TYPE:
+            findings.append(Finding('unknown_type', row, f"Unknown TYPE '{fields[3]}'"))
+            positions.append(position)
+
+    if compact:
+        for duplicate in index.compact_duplicates():
+            findings.append(duplicate)
+            positions.append(-1)
+
+    # Parent checks need every ID, so they run over the index
+    parent_of = array('q', [-1]) * len(index.rows)
+    for position in range(len(index.rows)):
+        child_type = _TYPE_NAMES.get(index.types[position])
+        parent_id = index.parents[position]
+        row = index.rows[position]
+
+        if not parent_id:
+            if child_type is not None and ALLOWED_PARENT_TYPE[child_type] is not None:
+                findings.append(Finding('missing_parent', row, f"{child_type} has no PARENT_ID"))
+                positions.append(position)
+            continue
+
+        parent = index.find(parent_id)
+        if parent == -1:
+            findings.append(Finding('orphan', row, "PARENT_ID not found"))
+            positions.append(position)
+            continue
+        parent_of[position] = parent
+
+        if index.projects[parent] != index.projects[position]:
+            findings.append(Finding('cross_project', row, f"Parent on line {index.rows[parent]} belongs to another project"))
+            positions.append(position)
+
+        if child_type is not None:
+            problem = edge_problem(child_type, _TYPE_NAMES.get(index.types[parent], 'UNKNOWN'))
+            if problem:
+                findings.append(Finding('illegal_edge', row, f"{problem}; parent on line {index.rows[parent]}"))
+                positions.append(position)
+
+    for cycle in find_cycles(parent_of):
+        lines = [index.rows[p] for p in cycle]
+        findings.append(Finding('cycle', lines[0], f"Parent cycle through lines {', '.join(map(str, lines))}"))
+        positions.append(cycle[0])
+
+    _describe_findings(csv_path, index, findings, positions)
+    findings.sort(key=lambda f: (f.row, FINDING_KINDS.index(f.kind)))
+    report.findings = findings
+    return report
+
+
+def _describe_findings(csv_path: Path, index: _Index, findings: List[Finding], positions: List[int]):
+    """Fill in ID/PROJECT_ID/NAME/TYPE/PARENT_ID of each finding's row."""
+    def fill(finding: Finding, fields: List[str]):
+        finding.id, finding.project_id, finding.name, finding.type, finding.parent_id = fields
+
+    if not index.compact:
+        for finding, position in zip(findings, positions):
+            if position != -1:
+                fill(finding, index.records[position])
+        return
+
+    # Compact mode keeps no strings: read the flagged lines again
+    by_row: Dict[int, List[Finding]] = {}
+    for finding in findings:
+        if finding.kind != 'malformed_row':
+            by_row.setdefault(finding.row, []).append(finding)
+    if not by_row:
+        return
+    for row, fields, _ in iter_csv_rows(csv_path):
+        if fields is not None and row in by_row:
+            for finding in by_row[row]:
+                fill(finding, fields)
+
+
+def write_findings(report: HierarchyReport, output_path: Optional[Path] = None):
+    """
+    Write findings as JSON Lines.
+
+    Args:
+        report: HierarchyReport from check_hierarchy()
+        output_path: Output file, or None for stdout
+    """
+    out = open(output_path, 'w', encoding='utf-8') if output_path else sys.stdout
+    try:
+        for finding in report.findings:
+            out.write(json.dumps(asdict(finding)) + '\n')
+    finally:
+        if output_path:
+            out.close()
+
+
+def print_report(report: HierarchyReport, max_print: int = 10):
+    """Print a summary of a hierarchy check."""
+    print("="*80)
+    print("HIERARCHY INTEGRITY CHECK")
+    print("="*80)
+    print(f"\n📄 {report.csv_path}")
+    print(f"   Rows checked: {report.rows:,}{' (compact mode)' if report.compact else ''}")
+
+    counts = report.counts()
+    if not counts:
+        print(f"\n✅ No hierarchy problems found")
+        return
+
+    print(f"\n⚠️  {len(report.findings):,} finding(s):")
+    for kind in FINDING_KINDS:
+        if kind in counts:
+            print(f"   {kind:<15} {counts[kind]:,}")
+
+    for finding in report.findings[:max_print]:
+        print(f"   line {finding.row}: {finding.kind} - {finding.type or '?'} {finding.name or ''} - {finding.detail}")
+    if len(report.findings) > max_print:
+        print(f"   ... and {len(report.findings) - max_print:,} more")
+
+
+def main():
+    """Main entry point."""
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+
+    parser = argparse.ArgumentParser(description="Check the DESIGNELEMENTS hierarchy for integrity problems.")
+    parser.add_argument("--csv", default=None, help="DESIGNELEMENTS.csv to check (default: data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv).")
+    parser.add_argument("--output", default=None, help="Write findings as JSON Lines to this file ('-' for stdout).")
+    parser.add_argument("--compact", action="store_true", help="Keep only 64-bit digests in memory (for very large files).")
+    parser.add_argument("--max-print", type=int, default=10, help="Findings to show in the summary.")
+    args = parser.parse_args()
+
+    csv_path = Path(args.csv) if args.csv else base_path / "data" / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
+    if not csv_path.exists():
+        print(f"❌ File not found: {csv_path}")
+        sys.exit(2)
+
+    report = check_hierarchy(csv_path, compact=args.compact)
+
+    if args.output == '-':
+        write_findings(report)
+    else:
+        print_report(report, max_print=args.max_print)
+        if args.output:
+            write_findings(report, Path(args.output))
+            print(f"\n💾 Findings written to: {args.output}")
+
+    sys.exit(1 if report.findings else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -39,6 +39,15 @@ def inspect_excel_file(file_path):
         print(f"  Max Column: {ws.max_column}")
         print()
         
+        # Read the rows needed below in one pass (ws.cell re-parses the sheet
+        # in read-only mode, so per-cell access is quadratic)
+        rows = [list(r) for r in ws.iter_rows(min_row=1, max_row=30, max_col=30, values_only=True)]
+        
+        def cell_value(row_idx, col_idx):
+            if row_idx > len(rows) or col_idx > len(rows[row_idx - 1]):
+                return None
+            return rows[row_idx - 1][col_idx - 1]
+        
         # Read first 10 rows to identify headers and data structure
         print("First 10 Rows:")
         print("-" * 120)
@@ -46,8 +55,7 @@ def inspect_excel_file(file_path):
         for row_idx in range(1, min(11, ws.max_row + 1)):
             row_data = []
             for col_idx in range(1, min(ws.max_column + 1, 20)):  # Limit to first 20 columns
-                cell = ws.cell(row=row_idx, column=col_idx)
-                value = cell.value
+                value = cell_value(row_idx, col_idx)
                 if value is not None:
                     # Truncate long values
                     value_str = str(value)
@@ -64,8 +72,7 @@ def inspect_excel_file(file_path):
         print("Attempting to identify header structure:")
         potential_headers = []
         for row_idx in range(1, min(6, ws.max_row + 1)):
-            row_values = [ws.cell(row=row_idx, column=col_idx).value 
-                          for col_idx in range(1, ws.max_column + 1)]
+            row_values = rows[row_idx - 1] if row_idx <= len(rows) else []
             non_empty = [v for v in row_values if v is not None and str(v).strip()]
             if non_empty:
                 potential_headers.append((row_idx, row_values))
@@ -86,7 +93,7 @@ def inspect_excel_file(file_path):
             # Get header (assuming it's in one of the first rows)
             header_values = []
             for row_idx in range(1, min(4, ws.max_row + 1)):
-                val = ws.cell(row=row_idx, column=col_idx).value
+                val = cell_value(row_idx, col_idx)
                 if val:
                     header_values.append(str(val).strip())
             
@@ -95,7 +102,7 @@ def inspect_excel_file(file_path):
             # Get sample data
             data_samples = []
             for row_idx in range(start_row, min(start_row + 20, ws.max_row + 1)):
-                val = ws.cell(row=row_idx, column=col_idx).value
+                val = cell_value(row_idx, col_idx)
                 if val and str(val).strip():
                     data_samples.append(str(val).strip())
             
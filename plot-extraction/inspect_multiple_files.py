@@ -19,14 +19,14 @@ def inspect_file_quick(file_path):
             print(f"Sheet: {sheet_name}")
             print(f"  Dimensions: {ws.max_row} rows × {ws.max_column} columns")
             
-            # Check header
-            header_row = [ws.cell(row=1, column=col).value for col in range(1, ws.max_column + 1)]
-            print(f"  Headers: {header_row}")
+            # Header and first data rows in one pass (for the whole
+            # corpus use workbook_profiler.py)
+            rows = [list(r) for r in ws.iter_rows(min_row=1, max_row=5, values_only=True)]
+            print(f"  Headers: {rows[0] if rows else []}")
             
             # Sample first few data rows
             print(f"  Sample Data (rows 2-5):")
-            for row_idx in range(2, min(6, ws.max_row + 1)):
-                row_data = [ws.cell(row=row_idx, column=col).value for col in range(1, ws.max_column + 1)]
+            for row_idx, row_data in enumerate(rows[1:], start=2):
                 print(f"    Row {row_idx}: {row_data}")
         
         wb.close()
@@ -1,24 +1,26 @@
 """Check A-16a PLOT status."""
-import csv
+from verification import verify_design_elements, load_project_names
 
 target_csv = r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction\data\CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
 new_csv = r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction\output\new_design_elements.csv"
+plots_projects_csv = r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction\data\CCTECH.DRS.ENTITIES-PLOTS-PROJECTS.csv"
 
-# Load both CSVs
-with open(target_csv, 'r', encoding='utf-8') as f:
-    all_data = list(csv.DictReader(f))
+plot_name = 'A-16a'
 
-with open(new_csv, 'r', encoding='utf-8') as f:
-    new_data = list(csv.DictReader(f))
+# One pass over each CSV
+project_names = load_project_names(plots_projects_csv)
+final_result = verify_design_elements(target_csv, project_names)
+new_result = verify_design_elements(new_csv, project_names)
 
-a16a_project_id = 'e0c901b8-3037-4bc1-885e-654f92aa4d1d'
+a16a_project_id = next((pid for pid, name in project_names.items() if name.upper() == plot_name.upper()), None)
 
 print("="*80)
-print("A-16a PLOT Investigation")
+print(f"{plot_name} PLOT Investigation")
 print("="*80)
+print(f"\nPROJECT_ID: {a16a_project_id or 'not listed in PLOTS-PROJECTS'}")
 
 # Check new_design_elements.csv
-a16a_plot_new = [r for r in new_data if r['PROJECT_ID'] == a16a_project_id and r['TYPE'] == 'PLOT']
+a16a_plot_new = [r for r in new_result.plots if r['PROJECT_ID'].lower() == a16a_project_id]
 print(f"\nIn new_design_elements.csv:")
 if a16a_plot_new:
     for plot in a16a_plot_new:
@@ -27,7 +29,7 @@ else:
     print(f"   ❌ No PLOT found")
 
 # Check final DESIGNELEMENTS.csv
-a16a_plot_final = [r for r in all_data if r['PROJECT_ID'] == a16a_project_id and r['TYPE'] == 'PLOT']
+a16a_plot_final = [r for r in final_result.plots if r['PROJECT_ID'].lower() == a16a_project_id]
 print(f"\nIn final DESIGNELEMENTS.csv:")
 if a16a_plot_final:
     for plot in a16a_plot_final:
@@ -36,20 +38,19 @@ else:
     print(f"   ❌ No PLOT found")
 
 # Check all A-16a elements
-a16a_all = [r for r in all_data if r['PROJECT_ID'] == a16a_project_id]
-print(f"\nAll A-16a elements in final CSV: {len(a16a_all)}")
-from collections import Counter
-type_counts = Counter(r['TYPE'] for r in a16a_all)
-for t, c in type_counts.items():
-    print(f"   {t}: {c}")
+a16a_counts = final_result.projects.get(a16a_project_id)
+print(f"\nAll {plot_name} elements in final CSV: {a16a_counts.total if a16a_counts else 0}")
+if a16a_counts:
+    for t, c in a16a_counts.types.items():
+        print(f"   {t}: {c}")
 
 # Check if PLOT was skipped due to existing entry
 print(f"\n{'='*80}")
 print("Checking for duplicate PLOT detection:")
 print("="*80)
 
-# Search for any PLOT with name A-16a
-all_a16a_plots = [r for r in all_data if r['NAME'] == 'A-16a' and r['TYPE'] == 'PLOT']
-print(f"\nAll PLOTs named 'A-16a' in DESIGNELEMENTS.csv: {len(all_a16a_plots)}")
+# Search for any PLOT with this name
+all_a16a_plots = [r for r in final_result.plots if r['NAME'] == plot_name]
+print(f"\nAll PLOTs named '{plot_name}' in DESIGNELEMENTS.csv: {len(all_a16a_plots)}")
 for plot in all_a16a_plots:
     print(f"   Name: {plot['NAME']}, PROJECT_ID: {plot['PROJECT_ID']}, ID: {plot['ID']}")
@@ -0,0 +1,499 @@
+"""
+Design Element Key Index
+========================
+
+Sorted on-disk index of DESIGNELEMENTS.csv for existence checks without
+loading the whole file into a dictionary:
+1. compact writes a sidecar (<csv>.keyidx) of fixed-width records, each a
+   hash of the normalized (PROJECT_ID, NAME, TYPE) key and the byte offset
+   of its row, sorted by hash
+2. Lookups binary-search the records through mmap and read only the
+   candidate rows from the CSV (a cold check touches a few pages)
+3. When rows are appended, only the new bytes are parsed and their records
+   merged in; a rewritten file (same checks as LookupDictionaries.refresh)
+   is indexed again from scratch
+4. A Bloom filter over the key hashes is stored with the records, so most
+   checks for new elements end before the binary search
+
+Keys are normalized like LookupDictionaries.existing_elements
+(project lower, NAME upper, TYPE upper, all stripped) and the last row
+with a key wins, so answers match the in-memory lookups.
+
+File layout (little-endian):
+    header:  magic "DEKIDX\\0\\1", version u32, meta length u32, record count u64, records offset u64,
+             bloom offset u64 (0 = no filter)
+    meta:    JSON (source offset and digests, CSV header)
+    records: 8-byte big-endian key hash, u64 row offset (16 bytes each)
+    bloom:   BloomFilter.to_bytes()
+
+Usage:
+    python key_index.py compact --csv data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv --bloom-fpr 0.001
+    python key_index.py lookup --project <PROJECT_ID> --name B01-R01-S01 --type TABLE
+    python key_index.py info
+
+Date: October 18, 2026
+"""
+
+import argparse
+import csv
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from bloom_filter import BloomFilter, DEFAULT_FALSE_POSITIVE_RATE
+from lookup_builder import DesignElement, SourceState, element_key_hash, snapshot_source
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+KEY_INDEX_SUFFIX = ".keyidx"
+MAGIC = b"DEKIDX\0\1"
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<8sIIQQQ')
+RECORD = struct.Struct('<8sQ')
+HASH_BYTES = 8
+WRITE_CHUNK_RECORDS = 64 * 1024
+
+
+class KeyIndexError(Exception):
+    """Raised when a key index file cannot be read."""
+
+
+def index_path_for(csv_path: Path) -> Path:
+    """Sidecar index path for a DESIGNELEMENTS CSV."""
+    csv_path = Path(csv_path)
+    return csv_path.with_name(csv_path.name + KEY_INDEX_SUFFIX)
+
+
+class _OffsetTap:
+    """Line iterator for csv.reader over a binary file that tracks byte offsets."""
+
+    def __init__(self, f, offset: int):
+        self.f = f
+        self.offset = offset
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = self.f.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode('utf-8')
+
+
+def _column_positions(fieldnames: List[str]) -> Tuple[int, int, int, int, int]:
+    columns = [c.strip().upper() for c in fieldnames]
+    try:
+        return tuple(columns.index(c) for c in ('ID', 'PROJECT_ID', 'NAME', 'TYPE', 'PARENT_ID'))
+    except ValueError:
+        raise KeyIndexError(f"Unexpected DESIGNELEMENTS header: {fieldnames}")
+
+
+def _to_element(fields: List[str], positions: Tuple[int, ...]) -> Optional[DesignElement]:
+    """Element for a parsed row, or None if it lacks a key column (as DictReader would)."""
+    id_at, project_at, name_at, type_at, parent_at = positions
+    if len(fields) <= max(id_at, project_at, name_at, type_at):
+        return None
+    return DesignElement(
+        id=fields[id_at].strip(),
+        project_id=fields[project_at].strip(),
+        name=fields[name_at].strip(),
+        type=fields[type_at].strip(),
+        parent_id=fields[parent_at].strip() if parent_at < len(fields) else ''
+    )
+
+
+def _scan_records(csv_path: Path, start: int, positions: Tuple[int, ...]) -> Tuple[List[bytes], int]:
+    """
+    Index records for the rows from byte offset start to the end of the file.
+
+    Returns:
+        (records sorted by hash, rows parsed)
+    """
+    records = []
+    rows = 0
+    with open(csv_path, 'rb') as f:
+        f.seek(start)
+        tap = _OffsetTap(f, start)
+        if start == 0:
+            next(tap, None)
+        reader = csv.reader(tap)
+        while True:
+            row_offset = tap.offset
+            fields = next(reader, None)
+            if fields is None:
+                break
+            element = _to_element(fields, positions)
+            if element is None:
+                continue
+            rows += 1
+            records.append(RECORD.pack(element_key_hash(element.project_id, element.name, element.type), row_offset))
+    records.sort()
+    return records, rows
+
+
+def _source_meta(source: SourceState) -> Dict[str, object]:
+    """What an index records about the CSV state it was built from."""
+    return {
+        'offset': source.offset,
+        'prefix_digest': source.prefix_digest,
+        'tail_digest': source.tail_digest,
+        'pending_digest': hashlib.sha256(source.pending_tail).hexdigest(),
+        'fieldnames': source.fieldnames
+    }
+
+
+def _write_index(
+    temp_path: Path,
+    source: SourceState,
+    records: Iterator[bytes],
+    capacity: int,
+    false_positive_rate: Optional[float],
+    max_bloom_bytes: Optional[int]
+) -> int:
+    """
+    Write header, meta, sorted records and the Bloom filter to temp_path.
+
+    The filter is sized for capacity records and filled from their key
+    hashes, so it never needs the CSV.
+
+    Returns:
+        Number of records written
+    """
+    bloom = None
+    if false_positive_rate is not None:
+        bloom = BloomFilter.for_capacity(capacity, false_positive_rate, max_bloom_bytes)
+    meta = json.dumps(dict(
+        source=source.path.name,
+        bloom_fpr=false_positive_rate,
+        bloom_max_bytes=max_bloom_bytes,
+        **_source_meta(source)
+    )).encode('utf-8')
+    records_offset = HEADER.size + len(meta)
+    records_offset += -records_offset % 8
+
+    count = 0
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(meta), 0, records_offset, 0))
+        f.write(meta)
+        f.write(b'\0' * (records_offset - HEADER.size - len(meta)))
+        chunk = []
+        last_digest = None
+        for record in records:
+            chunk.append(record)
+            # Records are sorted, so each distinct key is added once
+            if bloom is not None and record[:HASH_BYTES] != last_digest:
+                last_digest = record[:HASH_BYTES]
+                bloom.add(last_digest)
+            if len(chunk) == WRITE_CHUNK_RECORDS:
+                f.write(b''.join(chunk))
+                count += len(chunk)
+                chunk = []
+        f.write(b''.join(chunk))
+        count += len(chunk)
+        bloom_offset = 0
+        if bloom is not None:
+            bloom_offset = f.tell()
+            f.write(bloom.to_bytes())
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(meta), count, records_offset, bloom_offset))
+    return count
+
+
+class KeyIndex:
+    """Read-only view of a .keyidx file with the DESIGNELEMENTS CSV it indexes."""
+
+    def __init__(self, index_path: Path, csv_path: Path):
+        self.index_path = Path(index_path)
+        self.csv_path = Path(csv_path)
+        self.row_reads = 0
+        self.bloom_negatives = 0
+        self.bloom: Optional[BloomFilter] = None
+        self._bloom_view: Optional[memoryview] = None
+        self._file = open(self.index_path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise KeyIndexError(f"{self.index_path.name} is empty")
+        try:
+            magic, version, meta_length, self.count, self.records_offset, bloom_offset = HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise KeyIndexError(f"{self.index_path.name} is not a version {FORMAT_VERSION} key index")
+            self.meta = json.loads(self._mmap[HEADER.size:HEADER.size + meta_length])
+            if bloom_offset:
+                self._bloom_view = memoryview(self._mmap)[bloom_offset:]
+                self.bloom = BloomFilter.from_buffer(self._bloom_view)
+        except (KeyIndexError, struct.error, ValueError):
+            self.close()
+            raise
+        self.positions = _column_positions(self.meta['fieldnames'])
+        self._csv = open(self.csv_path, 'rb')
+
+    def __len__(self) -> int:
+        return self.count
+
+    def is_current(self) -> bool:
+        """True if the CSV still matches what was indexed (nothing appended or rewritten)."""
+        current = _source_meta(snapshot_source(self.csv_path))
+        return all(self.meta.get(key) == value for key, value in current.items())
+
+    def _hash_at(self, i: int) -> bytes:
+        start = self.records_offset + i * RECORD.size
+        return self._mmap[start:start + HASH_BYTES]
+
+    def candidate_offsets(self, digest: bytes) -> List[int]:
+        """Row offsets whose key hash equals digest, last row first."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._hash_at(mid) < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        offsets = []
+        while lo < self.count and self._hash_at(lo) == digest:
+            offsets.append(RECORD.unpack_from(self._mmap, self.records_offset + lo * RECORD.size)[1])
+            lo += 1
+        return sorted(offsets, reverse=True)
+
+    def _row_at(self, offset: int) -> Optional[DesignElement]:
+        self.row_reads += 1
+        self._csv.seek(offset)
+        fields = next(csv.reader(_OffsetTap(self._csv, offset)), None)
+        return _to_element(fields, self.positions) if fields else None
+
+    def get_existing_element(self, project_id: str, name: str, element_type: str) -> Optional[DesignElement]:
+        """
+        Get an existing element (same signature as LookupDictionaries).
+
+        Hash matches are confirmed against the CSV row, so collisions
+        cannot produce a false answer.
+        """
+        digest = element_key_hash(project_id, name, element_type)
+        if self.bloom is not None and digest not in self.bloom:
+            self.bloom_negatives += 1
+            return None
+        key = (project_id.strip().lower(), name.strip().upper(), element_type.strip().upper())
+        for offset in self.candidate_offsets(digest):
+            element = self._row_at(offset)
+            if element is not None and (element.project_id.lower(), element.name.upper(), element.type.upper()) == key:
+                return element
+        return None
+
+    def element_exists(self, project_id: str, name: str, element_type: str) -> bool:
+        """Check if an element exists (same signature as LookupDictionaries)."""
+        return self.get_existing_element(project_id, name, element_type) is not None
+
+    def iter_records(self, start: int = 0) -> Iterator[bytes]:
+        """Records in hash order, from record number start."""
+        for i in range(start, self.count):
+            offset = self.records_offset + i * RECORD.size
+            yield self._mmap[offset:offset + RECORD.size]
+
+    def get_stats(self) -> Dict[str, float]:
+        stats = {'records': self.count, 'row_reads': self.row_reads}
+        if self.bloom is not None:
+            stats.update(self.bloom.get_stats())
+            stats['bloom_negatives'] = self.bloom_negatives
+        return stats
+
+    def close(self):
+        if self._bloom_view is not None:
+            self.bloom.data.release()
+            self.bloom = None
+            self._bloom_view.release()
+            self._bloom_view = None
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+        if getattr(self, '_csv', None) is not None:
+            self._csv.close()
+
+    def __enter__(self) -> 'KeyIndex':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def compact_key_index(
+    csv_path: Path,
+    index_path: Optional[Path] = None,
+    full: bool = False,
+    false_positive_rate: Optional[float] = DEFAULT_FALSE_POSITIVE_RATE,
+    max_bloom_bytes: Optional[int] = None
+) -> Dict[str, object]:
+    """
+    Create or bring up to date the key index of a DESIGNELEMENTS CSV.
+
+    If the CSV only grew since the index was written, the rows from the old
+    end of the last complete line onward are parsed and merged in (an
+    unterminated last row is re-read in case the append continued it).
+    Otherwise the whole file is indexed.
+
+    Args:
+        csv_path: Path to CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv
+        index_path: Index file (default: <csv>.keyidx)
+        full: Index the whole file even if an incremental update is possible
+        false_positive_rate: Bloom filter false-positive rate (None = no filter)
+        max_bloom_bytes: Optional memory cap for the Bloom filter
+
+    Returns:
+        Dictionary with 'mode' (current/incremental/full), 'rows_parsed'
+        and 'records'
+    """
+    csv_path = Path(csv_path)
+    index_path = Path(index_path) if index_path else index_path_for(csv_path)
+    temp_path = index_path.with_name(index_path.name + '.tmp')
+    source = snapshot_source(csv_path)
+
+    existing = None
+    if not full and index_path.exists():
+        try:
+            existing = KeyIndex(index_path, csv_path)
+        except (KeyIndexError, struct.error, ValueError):
+            existing = None
+
+    if existing is not None:
+        with existing:
+            same_bloom = (
+                existing.meta.get('bloom_fpr') == false_positive_rate
+                and existing.meta.get('bloom_max_bytes') == max_bloom_bytes
+            )
+            if same_bloom and existing.is_current():
+                return {'mode': 'current', 'rows_parsed': 0, 'records': existing.count}
+            resume = existing.meta['offset']
+            indexed = snapshot_source(csv_path, offset=resume) if source.offset >= resume else None
+            if (
+                indexed is not None
+                and indexed.prefix_digest == existing.meta['prefix_digest']
+                and indexed.tail_digest == existing.meta['tail_digest']
+                and indexed.fieldnames == existing.meta['fieldnames']
+            ):
+                # Records of rows from resume on (an unterminated last row
+                # that may have been continued) are replaced by a re-scan
+                new_records, rows = _scan_records(csv_path, resume, existing.positions)
+                kept = (r for r in existing.iter_records() if RECORD.unpack(r)[1] < resume)
+                count = _write_index(
+                    temp_path, source, heapq.merge(kept, new_records),
+                    existing.count + len(new_records), false_positive_rate, max_bloom_bytes
+                )
+                existing.close()
+                os.replace(temp_path, index_path)
+                return {'mode': 'incremental', 'rows_parsed': rows, 'records': count}
+
+    records, rows = _scan_records(csv_path, 0, _column_positions(source.fieldnames))
+    count = _write_index(temp_path, source, iter(records), len(records), false_positive_rate, max_bloom_bytes)
+    os.replace(temp_path, index_path)
+    return {'mode': 'full', 'rows_parsed': rows, 'records': count}
+
+
+def open_key_index(
+    csv_path: Path,
+    index_path: Optional[Path] = None,
+    update: bool = True,
+    false_positive_rate: Optional[float] = DEFAULT_FALSE_POSITIVE_RATE,
+    max_bloom_bytes: Optional[int] = None
+) -> KeyIndex:
+    """
+    Open the key index of a DESIGNELEMENTS CSV for lookups.
+
+    Args:
+        csv_path: Path to CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv
+        index_path: Index file (default: <csv>.keyidx)
+        update: Compact first so rows appended since the last compaction are found
+        false_positive_rate: Bloom filter settings used when compacting
+        max_bloom_bytes: Optional memory cap for the Bloom filter
+    """
+    index_path = Path(index_path) if index_path else index_path_for(Path(csv_path))
+    if update:
+        compact_key_index(Path(csv_path), index_path, false_positive_rate=false_positive_rate, max_bloom_bytes=max_bloom_bytes)
+    return KeyIndex(index_path, Path(csv_path))
+
+
+def main():
+    """Main entry point."""
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+    default_csv = base_path / "data" / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
+
+    parser = argparse.ArgumentParser(description="Sorted key index of DESIGNELEMENTS.csv for existence checks.")
+    parser.add_argument("--csv", default=None, help="DESIGNELEMENTS CSV (default: data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv).")
+    parser.add_argument("--index", default=None, help="Index file (default: <csv>.keyidx).")
+    parser.add_argument("--bloom-fpr", type=float, default=DEFAULT_FALSE_POSITIVE_RATE, help=f"Bloom filter false-positive rate (default {DEFAULT_FALSE_POSITIVE_RATE}).")
+    parser.add_argument("--bloom-max-kb", type=int, default=None, help="Cap the Bloom filter at this many KB.")
+    parser.add_argument("--no-bloom", action="store_true", help="Store no Bloom filter.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    compact_parser = sub.add_parser("compact", help="Create or update the index.")
+    compact_parser.add_argument("--full", action="store_true", help="Index the whole file again.")
+
+    lookup_parser = sub.add_parser("lookup", help="Look up one element through the index.")
+    lookup_parser.add_argument("--project", required=True, help="PROJECT_ID")
+    lookup_parser.add_argument("--name", required=True, help="Element NAME")
+    lookup_parser.add_argument("--type", required=True, help="Element TYPE")
+    lookup_parser.add_argument("--no-update", action="store_true", help="Do not pick up appended rows first.")
+
+    sub.add_parser("info", help="Show index size and whether it is current.")
+    args = parser.parse_args()
+
+    csv_path = Path(args.csv) if args.csv else default_csv
+    index_path = Path(args.index) if args.index else index_path_for(csv_path)
+    false_positive_rate = None if args.no_bloom else args.bloom_fpr
+    max_bloom_bytes = args.bloom_max_kb * 1024 if args.bloom_max_kb else None
+
+    print("="*80)
+    print("DESIGN ELEMENT KEY INDEX")
+    print("="*80)
+
+    if args.command == "compact":
+        start = time.perf_counter()
+        result = compact_key_index(
+            csv_path, index_path, full=args.full,
+            false_positive_rate=false_positive_rate, max_bloom_bytes=max_bloom_bytes
+        )
+        print(f"\n✅ {result['mode'].capitalize()}: {result['rows_parsed']:,} rows parsed, "
+              f"{result['records']:,} records in {time.perf_counter() - start:.2f} s")
+        print(f"💾 {index_path} ({index_path.stat().st_size:,} bytes)")
+
+    elif args.command == "lookup":
+        start = time.perf_counter()
+        with open_key_index(
+            csv_path, index_path, update=not args.no_update,
+            false_positive_rate=false_positive_rate, max_bloom_bytes=max_bloom_bytes
+        ) as index:
+            element = index.get_existing_element(args.project, args.name, args.type)
+            elapsed = time.perf_counter() - start
+            if element is None and index.bloom_negatives:
+                print(f"\n❌ Not found - ruled out by the Bloom filter ({elapsed * 1000:.2f} ms)")
+            elif element is None:
+                print(f"\n❌ Not found ({elapsed * 1000:.2f} ms, {index.row_reads} row reads)")
+            else:
+                print(f"\n✅ Found {element.type} {element.name} ({elapsed * 1000:.2f} ms, {index.row_reads} row reads)")
+                print(f"   ID: {element.id}")
+                print(f"   PARENT_ID: {element.parent_id or '(none)'}")
+
+    elif args.command == "info":
+        with KeyIndex(index_path, csv_path) as index:
+            print(f"\n📄 {index_path.name}: {len(index):,} records, indexed through byte {index.meta['offset']:,}")
+            print(f"   {'Current' if index.is_current() else 'Stale - run compact'}")
+            if index.bloom is not None:
+                print(f"   Bloom filter: {index.bloom.nbytes:,} bytes, {index.bloom.hashes} hashes, "
+                      f"expected false-positive rate {index.bloom.expected_false_positive_rate():.4%}")
+
+
+if __name__ == "__main__":
+    main()
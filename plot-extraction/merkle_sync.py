@@ -0,0 +1,485 @@
+"""
+Merkle Tree Delta Sync
+======================
+
+Builds hash trees over DESIGNELEMENTS rows along the element hierarchy and
+syncs only the parts that differ from a remote snapshot:
+1. Tree: ROOT → PROJECT → PLOT → BLOCK → TABLE/INVERTER leaves (rows whose
+   parent is not a PLOT/BLOCK of the same project hang under the
+   project's "~unattached" node)
+2. Node hash = hash of its own row + its children's and leaves' hashes
+3. Diff: equal node hashes end the descent, so unchanged projects and
+   blocks cost one comparison each; only differing blocks compare leaves
+4. Sync: new/changed rows of differing subtrees are uploaded with the
+   batched uploader (parent-first, checkpointed); rows missing locally are
+   reported, not deleted (rows moved to another parent are only sent)
+
+Trees are built from the CSV rows rather than from LookupDictionaries,
+which keeps one element per (PROJECT_ID, NAME, TYPE) and would hide
+repeated TABLE/INVERTER names in other blocks.
+
+Usage:
+    python merkle_sync.py snapshot --csv data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv --output output/remote_snapshot.json
+    python merkle_sync.py diff --csv data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv --remote output/remote_snapshot.json
+    python merkle_sync.py sync --csv data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv --remote output/remote_snapshot.json --url https://drs.example.com/api
+
+Date: October 18, 2026
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from uploader import (
+    BulkUploader,
+    UploadCheckpoint,
+    UploadError,
+    StandInServer,
+    load_elements,
+    upload_target,
+    print_stats,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_ENDPOINT
+)
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+SNAPSHOT_VERSION = 1
+
+UNATTACHED = "~unattached"
+
+Element = Dict[str, str]
+
+
+@dataclass
+class MerkleNode:
+    """A tree node; PLOT/BLOCK nodes carry the hash of their own row."""
+    key: str
+    kind: str                   # ROOT, PROJECT, PLOT, BLOCK, UNATTACHED
+    name: str = ""
+    row_hash: str = ""
+    hash: str = ""
+    blocks: int = 0             # BLOCK nodes in this subtree
+    children: Dict[str, 'MerkleNode'] = field(default_factory=dict)
+    leaves: Dict[str, str] = field(default_factory=dict)     # element id → row hash
+
+    def finalize(self) -> str:
+        """Compute hashes bottom-up; returns this node's hash."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{self.kind}\0{self.key}\0{self.row_hash}\0".encode('utf-8'))
+        self.blocks = 1 if self.kind == 'BLOCK' else 0
+        for key in sorted(self.children):
+            child = self.children[key]
+            digest.update(f"c\0{key}\0{child.finalize()}\0".encode('utf-8'))
+            self.blocks += child.blocks
+        for key in sorted(self.leaves):
+            digest.update(f"l\0{key}\0{self.leaves[key]}\0".encode('utf-8'))
+        self.hash = digest.hexdigest()
+        return self.hash
+
+    def element_ids(self) -> List[str]:
+        """IDs of every row in this subtree (own row, children, leaves)."""
+        ids = [self.key] if self.row_hash else []
+        for child in self.children.values():
+            ids.extend(child.element_ids())
+        ids.extend(self.leaves)
+        return ids
+
+    def to_dict(self) -> Dict:
+        node = {'key': self.key, 'kind': self.kind, 'name': self.name, 'hash': self.hash}
+        if self.row_hash:
+            node['row_hash'] = self.row_hash
+        if self.children:
+            node['children'] = [child.to_dict() for child in self.children.values()]
+        if self.leaves:
+            node['leaves'] = self.leaves
+        return node
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'MerkleNode':
+        node = cls(
+            key=data['key'],
+            kind=data['kind'],
+            name=data.get('name', ''),
+            row_hash=data.get('row_hash', ''),
+            hash=data['hash'],
+            leaves=dict(data.get('leaves', {}))
+        )
+        for child_data in data.get('children', []):
+            child = cls.from_dict(child_data)
+            node.children[child.key] = child
+        node.blocks = (1 if node.kind == 'BLOCK' else 0) + sum(c.blocks for c in node.children.values())
+        return node
+
+
+def row_hash(element: Element) -> str:
+    """
+    Hash one DESIGNELEMENTS row (IDs and TYPE case-normalized, values stripped).
+
+    Examples:
+        >>> a = row_hash({'ID': 'AB', 'PROJECT_ID': 'p', 'NAME': 'R1-S1', 'TYPE': 'table', 'PARENT_ID': 'b'})
+        >>> a == row_hash({'ID': 'ab ', 'PROJECT_ID': 'P', 'NAME': 'R1-S1', 'TYPE': 'TABLE', 'PARENT_ID': 'B'})
+        True
+        >>> a == row_hash({'ID': 'ab', 'PROJECT_ID': 'p', 'NAME': 'R1-S2', 'TYPE': 'TABLE', 'PARENT_ID': 'b'})
+        False
+    """
+    fields = (
+        element['ID'].strip().lower(),
+        element['PROJECT_ID'].strip().lower(),
+        element['NAME'].strip(),
+        element['TYPE'].strip().upper(),
+        element['PARENT_ID'].strip().lower()
+    )
+    return hashlib.blake2b('\0'.join(fields).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def build_tree(elements: Iterable[Element]) -> Tuple[MerkleNode, Dict[str, Element]]:
+    """
+    Build the hash tree of a set of DESIGNELEMENTS rows.
+
+    Args:
+        elements: Rows ({ID, PROJECT_ID, NAME, TYPE, PARENT_ID}); a repeated
+            ID keeps its last row
+
+    Returns:
+        (root node with hashes computed, {element id (lower): row})
+    """
+    rows: Dict[str, Element] = {}
+    for element in elements:
+        rows[element['ID'].strip().lower()] = element
+
+    root = MerkleNode(key="", kind='ROOT')
+    plots: Dict[str, MerkleNode] = {}
+    blocks: Dict[str, MerkleNode] = {}
+
+    def project(project_id: str) -> MerkleNode:
+        node = root.children.get(project_id)
+        if node is None:
+            node = root.children[project_id] = MerkleNode(key=project_id, kind='PROJECT')
+        return node
+
+    def unattached(project_id: str) -> MerkleNode:
+        parent = project(project_id)
+        node = parent.children.get(UNATTACHED)
+        if node is None:
+            node = parent.children[UNATTACHED] = MerkleNode(key=UNATTACHED, kind='UNATTACHED')
+        return node
+
+    by_type: Dict[str, List[Tuple[str, Element]]] = {'PLOT': [], 'BLOCK': [], 'OTHER': []}
+    for element_id, element in rows.items():
+        element_type = element['TYPE'].strip().upper()
+        by_type[element_type if element_type in ('PLOT', 'BLOCK') else 'OTHER'].append((element_id, element))
+
+    for element_id, element in by_type['PLOT']:
+        node = MerkleNode(key=element_id, kind='PLOT', name=element['NAME'].strip(), row_hash=row_hash(element))
+        project(element['PROJECT_ID'].strip().lower()).children[element_id] = node
+        plots[element_id] = node
+
+    for element_id, element in by_type['BLOCK']:
+        project_id = element['PROJECT_ID'].strip().lower()
+        node = MerkleNode(key=element_id, kind='BLOCK', name=element['NAME'].strip(), row_hash=row_hash(element))
+        parent_id = element['PARENT_ID'].strip().lower()
+        if parent_id in plots and rows[parent_id]['PROJECT_ID'].strip().lower() == project_id:
+            plots[parent_id].children[element_id] = node
+        else:
+            unattached(project_id).children[element_id] = node
+        blocks[element_id] = node
+
+    for element_id, element in by_type['OTHER']:
+        project_id = element['PROJECT_ID'].strip().lower()
+        parent_id = element['PARENT_ID'].strip().lower()
+        if parent_id in blocks and rows[parent_id]['PROJECT_ID'].strip().lower() == project_id:
+            blocks[parent_id].leaves[element_id] = row_hash(element)
+        else:
+            unattached(project_id).leaves[element_id] = row_hash(element)
+
+    root.finalize()
+    return root, rows
+
+
+@dataclass
+class SubtreeChange:
+    """Rows to send or report for one differing node."""
+    path: str
+    kind: str
+    upserts: List[str] = field(default_factory=list)
+    deletes: List[str] = field(default_factory=list)
+
+
+@dataclass
+class TreeDiff:
+    """Result of comparing a local tree with a remote one."""
+    comparisons: int = 0
+    blocks_unchanged: int = 0
+    blocks_changed: int = 0
+    changes: List[SubtreeChange] = field(default_factory=list)
+    moved: List[str] = field(default_factory=list)      # rows upserted under another parent
+
+    def upsert_ids(self) -> List[str]:
+        return [i for change in self.changes for i in change.upserts]
+
+    def delete_ids(self) -> List[str]:
+        return [i for change in self.changes for i in change.deletes]
+
+
+def diff_trees(local: MerkleNode, remote: Optional[MerkleNode]) -> TreeDiff:
+    """
+    Compare two trees, descending only into nodes whose hashes differ.
+
+    A row that moved to another parent shows up under both: it is sent
+    under its new parent and listed in moved, not as a remote-only row.
+
+        >>> def element(id, type, parent):
+        ...     return {'ID': id, 'PROJECT_ID': 'p', 'NAME': id, 'TYPE': type, 'PARENT_ID': parent}
+        >>> rows = [element('pl', 'PLOT', 'p'), element('b1', 'BLOCK', 'pl'), element('b2', 'BLOCK', 'pl')]
+        >>> remote, _ = build_tree(rows + [element('t1', 'TABLE', 'b1'), element('t2', 'TABLE', 'b1')])
+        >>> local, _ = build_tree(rows + [element('t1', 'TABLE', 'b2')])
+        >>> diff = diff_trees(local, remote)
+        >>> diff.upsert_ids(), diff.delete_ids(), diff.moved
+        (['t1'], ['t2'], ['t1'])
+
+    Args:
+        local: Local tree (build_tree)
+        remote: Remote tree (snapshot), None if the remote is empty
+
+    Returns:
+        TreeDiff
+    """
+    diff = TreeDiff()
+
+    def label(node: MerkleNode) -> str:
+        return node.name or node.key
+
+    def walk(local_node: Optional[MerkleNode], remote_node: Optional[MerkleNode], path: str):
+        diff.comparisons += 1
+        if local_node is not None and remote_node is not None and local_node.hash == remote_node.hash:
+            diff.blocks_unchanged += local_node.blocks
+            return
+
+        node = local_node if local_node is not None else remote_node
+        if node.kind == 'BLOCK':
+            diff.blocks_changed += 1
+
+        if remote_node is None:
+            diff.changes.append(SubtreeChange(path=path, kind=node.kind, upserts=local_node.element_ids()))
+            diff.blocks_changed += local_node.blocks - (1 if node.kind == 'BLOCK' else 0)
+            return
+        if local_node is None:
+            diff.changes.append(SubtreeChange(path=path, kind=node.kind, deletes=remote_node.element_ids()))
+            diff.blocks_changed += remote_node.blocks - (1 if node.kind == 'BLOCK' else 0)
+            return
+
+        change = SubtreeChange(path=path, kind=node.kind)
+        if local_node.row_hash != remote_node.row_hash:
+            change.upserts.append(local_node.key)
+        for element_id, leaf in local_node.leaves.items():
+            if remote_node.leaves.get(element_id) != leaf:
+                change.upserts.append(element_id)
+        change.deletes.extend(i for i in remote_node.leaves if i not in local_node.leaves)
+        if change.upserts or change.deletes:
+            diff.changes.append(change)
+
+        for key in sorted(set(local_node.children) | set(remote_node.children)):
+            local_child = local_node.children.get(key)
+            remote_child = remote_node.children.get(key)
+            child = local_child if local_child is not None else remote_child
+            walk(local_child, remote_child, f"{path}/{label(child)}" if path else label(child))
+
+    walk(local, remote, "")
+
+    upserts = set(diff.upsert_ids())
+    for change in diff.changes:
+        if any(i in upserts for i in change.deletes):
+            diff.moved.extend(i for i in change.deletes if i in upserts)
+            change.deletes = [i for i in change.deletes if i not in upserts]
+    return diff
+
+
+def save_snapshot(root: MerkleNode, snapshot_path: Path, source: str = ""):
+    """Write a tree as a snapshot JSON (temp file + rename)."""
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        'version': SNAPSHOT_VERSION,
+        'source': source,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'tree': root.to_dict()
+    }
+    temp_path = snapshot_path.with_suffix(snapshot_path.suffix + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, separators=(',', ':'))
+    os.replace(temp_path, snapshot_path)
+
+
+def load_snapshot(location: str) -> Optional[MerkleNode]:
+    """
+    Load a snapshot tree from a file or an http(s) URL.
+
+    Args:
+        location: Snapshot path or URL
+
+    Returns:
+        Root node, or None if the file does not exist (empty remote)
+    """
+    if location.startswith(('http://', 'https://')):
+        with urllib.request.urlopen(location, timeout=60) as response:
+            payload = json.load(response)
+    else:
+        path = Path(location)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+
+    if payload.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {payload.get('version')}")
+    return MerkleNode.from_dict(payload['tree'])
+
+
+def print_diff(diff: TreeDiff, local: MerkleNode, remote: Optional[MerkleNode], max_changes: int = 25):
+    """Print a tree diff."""
+    print(f"\n🌳 Local root:  {local.hash} ({len(local.children)} projects, {local.blocks} blocks)")
+    if remote is not None:
+        print(f"   Remote root: {remote.hash} ({len(remote.children)} projects, {remote.blocks} blocks)")
+    else:
+        print(f"   Remote root: (empty)")
+
+    print(f"\n🔍 {diff.comparisons} node comparisons")
+    print(f"   Blocks unchanged: {diff.blocks_unchanged}")
+    print(f"   Blocks changed:   {diff.blocks_changed}")
+    print(f"   Rows to send:     {len(diff.upsert_ids()):,}")
+    print(f"   Rows moved:       {len(diff.moved):,}")
+    print(f"   Rows only remote: {len(diff.delete_ids()):,}")
+
+    if not diff.changes:
+        print(f"\n✅ Trees are identical")
+        return
+    print(f"\n📋 Differing subtrees:")
+    for change in diff.changes[:max_changes]:
+        print(f"   {change.kind:<10} {change.path or '(root)'}: +/~{len(change.upserts)} -{len(change.deletes)}")
+    if len(diff.changes) > max_changes:
+        print(f"   ... and {len(diff.changes) - max_changes} more")
+
+
+def main():
+    """Main entry point."""
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+    default_csv = base_path / "data" / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
+    default_snapshot = base_path / "output" / "remote_snapshot.json"
+
+    parser = argparse.ArgumentParser(description="Merkle tree delta sync of design elements.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = subparsers.add_parser("snapshot", help="Write the tree of a CSV as a snapshot.")
+    snapshot_parser.add_argument("--csv", default=None)
+    snapshot_parser.add_argument("--output", default=None)
+
+    for name in ("diff", "sync"):
+        sub = subparsers.add_parser(name, help=f"{name.capitalize()} a CSV against a remote snapshot.")
+        sub.add_argument("--csv", default=None, help="Local DESIGNELEMENTS.csv.")
+        sub.add_argument("--remote", default=None, help="Remote snapshot (file or http(s) URL).")
+
+    sync_parser = subparsers.choices["sync"]
+    sync_parser.add_argument("--url", default=os.environ.get("DRS_API_URL"), help="API base URL (or DRS_API_URL).")
+    sync_parser.add_argument("--endpoint", default=DEFAULT_ENDPOINT)
+    sync_parser.add_argument("--token", default=os.environ.get("DRS_API_TOKEN"))
+    sync_parser.add_argument("--stand-in", action="store_true", help="Sync to a local stand-in server.")
+    sync_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    sync_parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    sync_parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: output/sync_checkpoint.json).")
+    sync_parser.add_argument("--update-snapshot", action="store_true", help="Write the local tree to --remote after a successful sync.")
+    args = parser.parse_args()
+
+    csv_path = Path(args.csv) if args.csv else default_csv
+
+    print("="*80)
+    print(f"MERKLE SYNC: {args.command.upper()}")
+    print("="*80)
+
+    started = time.perf_counter()
+    elements = load_elements(csv_path)
+    local, rows = build_tree(elements)
+    print(f"\n📄 {len(rows):,} rows from {csv_path.name}, tree built in {time.perf_counter() - started:.2f} s")
+
+    if args.command == "snapshot":
+        output = Path(args.output) if args.output else default_snapshot
+        save_snapshot(local, output, source=str(csv_path))
+        print(f"💾 Snapshot written to: {output} (root {local.hash})")
+        return
+
+    remote_location = args.remote or str(default_snapshot)
+    remote = load_snapshot(remote_location)
+    started = time.perf_counter()
+    diff = diff_trees(local, remote)
+    print_diff(diff, local, remote)
+    print(f"\n⏱️  Diff took {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    if args.command == "diff":
+        return
+
+    upserts = [rows[element_id] for element_id in diff.upsert_ids()]
+    if not upserts:
+        print("\n✅ Nothing to send")
+        return
+    if not args.url and not args.stand_in:
+        parser.error("--url (or DRS_API_URL) is required unless --stand-in is given")
+
+    server = None
+    if args.stand_in:
+        known_ids = remote.element_ids() + [p.key for p in remote.children.values()] if remote else []
+        known_ids += [e['PARENT_ID'] for e in upserts if e['TYPE'].strip().upper() == 'PLOT']
+        server = StandInServer(known_ids=known_ids, endpoint=args.endpoint).start()
+    url = server.url if server else args.url
+
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else base_path / "output" / "sync_checkpoint.json"
+    checkpoint = UploadCheckpoint(checkpoint_path, source=f"{local.hash}:{remote.hash if remote else ''}",
+                                  batch_size=args.batch_size, target=upload_target(url, args.endpoint))
+    if checkpoint.other_target:
+        if server:
+            server.stop()
+        print(f"\n❌ {checkpoint_path.name} was recorded for {checkpoint.other_target}")
+        print(f"   Delete it, or pass --checkpoint to use another file")
+        sys.exit(1)
+    if checkpoint.acked:
+        print(f"\n🔁 Resuming: {len(checkpoint.acked)} batches already acknowledged")
+
+    print(f"\n🌐 Sending {len(upserts):,} rows to {url}{args.endpoint}")
+    uploader = BulkUploader(url, endpoint=args.endpoint, token=args.token,
+                            batch_size=args.batch_size, concurrency=args.concurrency)
+    try:
+        stats = uploader.upload(upserts, checkpoint)
+    except UploadError as e:
+        print_stats(uploader.stats)
+        print(f"\n❌ Sync stopped: {e}")
+        print(f"   Re-run to resume ({len(checkpoint.acked)} batches acknowledged)")
+        sys.exit(1)
+    finally:
+        if server:
+            server.stop()
+
+    print_stats(stats)
+    checkpoint.clear()
+
+    if diff.delete_ids():
+        print(f"\n⚠️  {len(diff.delete_ids()):,} remote rows are not in the local CSV (not deleted)")
+    if args.update_snapshot and not remote_location.startswith(('http://', 'https://')):
+        save_snapshot(local, Path(remote_location), source=str(csv_path))
+        print(f"💾 Remote snapshot updated: {remote_location}")
+    print("\n✅ SYNC COMPLETED")
+
+
+if __name__ == "__main__":
+    main()
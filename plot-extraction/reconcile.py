@@ -0,0 +1,560 @@
+"""
+Source-to-Store Reconciliation
+==============================
+
+Checks that every TABLE/INVERTER row of each _DWGData.xlsx ended up in
+DESIGNELEMENTS.csv under the right BLOCK:
+1. Source names per block come from the row cache, found through the
+   extraction manifest's fingerprint (or a fingerprint of the file); only
+   workbooks never parsed before are opened with openpyxl
+2. Stored names per block come from one streaming pass over DESIGNELEMENTS
+3. Per block: missing (in source, not stored), extra (stored, not in source)
+   and misparented (stored under another block or parent of the same project)
+
+Usage:
+    python reconcile.py --data-path data --drawing-data-path drawing_data --plot A-16a
+
+Date: October 18, 2026
+"""
+
+import argparse
+import csv
+import json
+import sys
+from collections import Counter
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from transform_logic import (
+    folder_to_plot_name,
+    filename_to_block_name,
+    ExtractionFilter,
+    TransformationError
+)
+from lookup_builder import load_plots_projects_mapping
+from row_cache import RowCache, WorkbookRows, fingerprint_workbook, DEFAULT_MAX_BLANK_ROWS
+from extraction_manifest import ExtractionManifest
+from workbook_prefetch import inflate_workbook
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+# Parent label for stored elements whose parent is not a BLOCK row
+NOT_A_BLOCK = "(not a block)"
+
+
+@dataclass
+class Misparented:
+    """An element stored under another parent than its source block."""
+    type: str
+    name: str
+    found_under: str
+    count: int = 1
+
+
+@dataclass
+class BlockReconciliation:
+    """Source vs store for one block."""
+    plot_name: str
+    block_name: str
+    project_id: Optional[str]
+    source_file: Optional[str] = None
+    source_count: int = 0
+    stored_count: int = 0
+    missing: List[Tuple[str, str, int]] = field(default_factory=list)
+    extra: List[Tuple[str, str, int]] = field(default_factory=list)
+    misparented: List[Misparented] = field(default_factory=list)
+
+    def is_clean(self) -> bool:
+        return not (self.missing or self.extra or self.misparented)
+
+
+@dataclass
+class ReconciliationReport:
+    """Result of a reconciliation run."""
+    blocks: List[BlockReconciliation] = field(default_factory=list)
+    workbooks: int = 0
+    workbooks_from_cache: int = 0
+    workbooks_parsed: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    def totals(self) -> Dict[str, int]:
+        return {
+            'blocks': len(self.blocks),
+            'clean_blocks': sum(1 for b in self.blocks if b.is_clean()),
+            'missing': sum(c for b in self.blocks for _, _, c in b.missing),
+            'extra': sum(c for b in self.blocks for _, _, c in b.extra),
+            'misparented': sum(m.count for b in self.blocks for m in b.misparented),
+        }
+
+
+class SourceRows:
+    """Cleaned workbook rows, reused from the row cache whenever possible."""
+
+    def __init__(
+        self,
+        row_cache: RowCache,
+        manifest: Optional[ExtractionManifest] = None,
+        max_blank_rows: int = DEFAULT_MAX_BLANK_ROWS
+    ):
+        self.row_cache = row_cache
+        self.manifest = manifest
+        self.max_blank_rows = max_blank_rows
+        self.from_cache = 0
+        self.parsed = 0
+
+    def get(self, excel_path: Path) -> WorkbookRows:
+        """
+        Get the cleaned rows of a workbook.
+
+        Args:
+            excel_path: Path to Excel file
+
+        Returns:
+            WorkbookRows
+        """
+        record = self.manifest.get_file(excel_path) if self.manifest is not None else None
+        inflated = None
+        if record is not None and record.fingerprint:
+            fingerprint = record.fingerprint
+        else:
+            # Inflate once: on a miss the parser reads the same stored zip
+            inflated = inflate_workbook(excel_path)
+            fingerprint = fingerprint_workbook(inflated.open())
+
+        cached = self.row_cache.get(fingerprint, self.max_blank_rows)
+        if cached is not None:
+            self.from_cache += 1
+            return cached
+
+        # Imported here so fully cached runs never load openpyxl
+        from extract_design_elements import parse_workbook_rows
+        workbook_rows = parse_workbook_rows(
+            inflated.open() if inflated else excel_path, max_blank_rows=self.max_blank_rows
+        )
+        self.row_cache.put(fingerprint, workbook_rows, self.max_blank_rows)
+        self.parsed += 1
+        return workbook_rows
+
+
+def source_names(workbook_rows: WorkbookRows) -> Counter:
+    """
+    Count the TABLE/INVERTER names of a workbook.
+
+    Args:
+        workbook_rows: Cleaned rows
+
+    Returns:
+        Counter of (TYPE, NAME upper)
+
+    Examples:
+        >>> rows = WorkbookRows(rows_read=2, rows=[(2, 'R1-S1', 'I1'), (3, 'R1-S2', None)])
+        >>> sorted(source_names(rows).items())
+        [(('INVERTER', 'I1'), 1), (('TABLE', 'R1-S1'), 1), (('TABLE', 'R1-S2'), 1)]
+    """
+    names: Counter = Counter()
+    for _, table_name, inverter_name in workbook_rows.rows:
+        if table_name:
+            names['TABLE', table_name.upper()] += 1
+        if inverter_name:
+            names['INVERTER', inverter_name.upper()] += 1
+    return names
+
+
+@dataclass
+class StoredProject:
+    """Stored TABLE/INVERTER names of one project, grouped by parent block."""
+    blocks: Dict[str, List[str]] = field(default_factory=dict)          # block name (upper) → block IDs
+    by_parent: Dict[str, Counter] = field(default_factory=dict)         # parent label → names
+
+
+def load_stored_names(design_elements_csv: Path, project_ids: List[str]) -> Dict[str, StoredProject]:
+    """
+    Group stored TABLE/INVERTER names by parent block in one streaming pass.
+
+    Args:
+        design_elements_csv: Path to DESIGNELEMENTS.csv
+        project_ids: Projects to keep (others are skipped while reading)
+
+    Returns:
+        {PROJECT_ID (lower): StoredProject}; parents that are not BLOCK rows
+        of the project are grouped under NOT_A_BLOCK
+    """
+    wanted = {p.lower() for p in project_ids}
+    block_names: Dict[Tuple[str, str], str] = {}
+    children: Dict[Tuple[str, str], Counter] = {}
+    projects = {p: StoredProject() for p in wanted}
+
+    with open(design_elements_csv, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            project_id = (row.get('PROJECT_ID') or '').strip().lower()
+            if project_id not in wanted:
+                continue
+            element_type = (row.get('TYPE') or '').strip().upper()
+            name = (row.get('NAME') or '').strip().upper()
+            if element_type == 'BLOCK':
+                element_id = row['ID'].strip().lower()
+                block_names[project_id, element_id] = name
+                projects[project_id].blocks.setdefault(name, []).append(element_id)
+            elif element_type in ('TABLE', 'INVERTER'):
+                parent_id = (row.get('PARENT_ID') or '').strip().lower()
+                children.setdefault((project_id, parent_id), Counter())[element_type, name] += 1
+
+    for (project_id, parent_id), names in children.items():
+        label = block_names.get((project_id, parent_id), NOT_A_BLOCK)
+        by_parent = projects[project_id].by_parent
+        by_parent.setdefault(label, Counter()).update(names)
+
+    return projects
+
+
+def _as_list(names: Counter) -> List[Tuple[str, str, int]]:
+    return sorted((t, n, c) for (t, n), c in names.items() if c > 0)
+
+
+def diff_distinct(
+    source_blocks: List[Tuple[str, str, str, str, Counter]],
+    stored: Dict[str, StoredProject],
+    selection_active: bool = False
+) -> List[BlockReconciliation]:
+    """
+    Diff name sets per block the way a default extraction stores them.
+
+    Without --allow-name-duplicates the extractor stores each TABLE/INVERTER
+    name once per project, under the first block (in extraction order) whose
+    workbook has it. A source name therefore counts as present if it is
+    stored under any block of the project, and as misparented only if it is
+    not stored under its first source block.
+
+    Args:
+        source_blocks: (plot, block, project_id, filename, names) in extraction order
+        stored: Stored names from load_stored_names()
+        selection_active: Only some workbooks were selected; stored blocks
+            without a selected workbook are then not reported, and a name
+            stored only under such a block counts as present
+
+    Returns:
+        BlockReconciliation per source block (plus stored-only blocks when
+        nothing was deselected)
+
+    Examples:
+        >>> stored = {'p': StoredProject(by_parent={
+        ...     'BL01': Counter({('INVERTER', 'I01'): 1, ('TABLE', 'R01-T01'): 1}),
+        ...     'BL02': Counter({('TABLE', 'R01-T02'): 1}),
+        ...     'BL03': Counter({('TABLE', 'R09-T09'): 1})})}
+        >>> repeated = Counter({('INVERTER', 'I01'): 1, ('TABLE', 'R01-T01'): 1})
+        >>> blocks = diff_distinct([
+        ...     ('A-16a', 'BL01', 'p', 'bl01.xlsx', repeated),
+        ...     ('A-16a', 'BL02', 'p', 'bl02.xlsx', repeated + Counter({('TABLE', 'R01-T02'): 1})),
+        ...     ('A-16a', 'BL03', 'p', 'bl03.xlsx', Counter({('TABLE', 'R01-T03'): 1, ('TABLE', 'R01-T02'): 1}))],
+        ...     stored)
+        >>> [(b.block_name, b.missing, b.extra, [(m.name, m.found_under) for m in b.misparented]) for b in blocks]
+        [('BL01', [], [], []), ('BL02', [], [], []), ('BL03', [('TABLE', 'R01-T03', 1)], [('TABLE', 'R09-T09', 1)], [])]
+        >>> blocks = diff_distinct([
+        ...     ('A-16a', 'BL01', 'p', 'bl01.xlsx', repeated + Counter({('TABLE', 'R01-T02'): 1})),
+        ...     ('A-16a', 'BL02', 'p', 'bl02.xlsx', Counter({('TABLE', 'R01-T02'): 1}))],
+        ...     stored, selection_active=True)
+        >>> [(b.block_name, b.missing, b.extra, [(m.name, m.found_under) for m in b.misparented]) for b in blocks]
+        [('BL01', [], [], [('R01-T02', 'BL02')]), ('BL02', [], [], [])]
+        >>> blocks = diff_distinct([
+        ...     ('A-16a', 'BL02', 'p', 'bl02.xlsx', Counter({('TABLE', 'R01-T02'): 1, ('TABLE', 'R09-T09'): 1}))],
+        ...     stored, selection_active=True)
+        >>> [(b.block_name, b.missing, b.extra, b.misparented) for b in blocks]
+        [('BL02', [], [], [])]
+    """
+    blocks: List[BlockReconciliation] = []
+    by_project: Dict[str, List[Tuple[BlockReconciliation, set]]] = {}
+    for plot_name, block_name, project_id, filename, names in source_blocks:
+        block = BlockReconciliation(
+            plot_name=plot_name,
+            block_name=block_name,
+            project_id=project_id,
+            source_file=filename,
+            source_count=len(names),
+            stored_count=len(stored[project_id].by_parent.get(block_name.upper(), ()))
+        )
+        blocks.append(block)
+        by_project.setdefault(project_id, []).append((block, set(names)))
+
+    for project_id, project in stored.items():
+        source = by_project.get(project_id, [])
+        source_labels = {block.block_name.upper() for block, _ in source}
+
+        # Stored-only blocks are reported (as extra) unless some were deselected
+        reported = set(source_labels)
+        if not selection_active:
+            for label, names in project.by_parent.items():
+                if label not in reported:
+                    reported.add(label)
+                    blocks.append(BlockReconciliation(
+                        plot_name='?', block_name=label, project_id=project_id,
+                        stored_count=len(names)
+                    ))
+
+        stored_under: Dict[Tuple[str, str], List[str]] = {}
+        for label, names in sorted(project.by_parent.items()):
+            for key in names:
+                stored_under.setdefault(key, []).append(label)
+
+        # Each source name belongs under the first source block that has it
+        first_block: Dict[Tuple[str, str], BlockReconciliation] = {}
+        for block, names in source:
+            for key in names:
+                first_block.setdefault(key, block)
+
+        missing: Dict[int, Counter] = {}
+        accounted: Dict[Tuple[str, str], str] = {}
+        for key, block in first_block.items():
+            labels = stored_under.get(key, [])
+            expected = block.block_name.upper()
+            if expected in labels:
+                accounted[key] = expected
+            elif not labels:
+                missing.setdefault(id(block), Counter())[key] += 1
+            elif selection_active and all(l not in source_labels and l != NOT_A_BLOCK for l in labels):
+                # Possibly stored by a deselected block that comes first
+                accounted[key] = labels[0]
+            else:
+                accounted[key] = labels[0]
+                block.misparented.append(Misparented(key[0], key[1], labels[0]))
+
+        extra: Dict[str, Counter] = {}
+        for key, labels in stored_under.items():
+            for label in labels:
+                if label in reported and accounted.get(key) != label:
+                    extra.setdefault(label, Counter())[key] += 1
+
+        labelled = set()
+        for block in blocks:
+            if block.project_id != project_id:
+                continue
+            block.misparented.sort(key=lambda m: (m.type, m.name))
+            block.missing = _as_list(missing.get(id(block), Counter()))
+            # Extra names go to the first block reported under their parent
+            label = block.block_name.upper()
+            if label not in labelled:
+                labelled.add(label)
+                block.extra = _as_list(extra.get(label, Counter()))
+
+    return blocks
+
+
+def reconcile(
+    drawing_data_path: Path,
+    design_elements_csv: Path,
+    plot_projects: Dict[str, str],
+    row_cache: RowCache,
+    manifest: Optional[ExtractionManifest] = None,
+    selection: Optional[ExtractionFilter] = None,
+    distinct: bool = False,
+    max_blank_rows: int = DEFAULT_MAX_BLANK_ROWS
+) -> ReconciliationReport:
+    """
+    Diff source workbook names against DESIGNELEMENTS per block.
+
+    Args:
+        drawing_data_path: Path to drawing_data/ folder
+        design_elements_csv: Path to DESIGNELEMENTS.csv
+        plot_projects: {PLOT_NAME (upper): PROJECT_ID}
+        row_cache: RowCache with cleaned rows (updated for newly parsed workbooks)
+        manifest: Optional ExtractionManifest, to skip fingerprinting unchanged files
+        selection: Optional ExtractionFilter limiting plots/blocks/files
+        distinct: Compare name sets instead of counts (for extractions run
+            without --allow-name-duplicates, which store a name once per
+            project under its first block; see diff_distinct)
+        max_blank_rows: Empty-row run that ends a sheet, as used by the extraction
+
+    Returns:
+        ReconciliationReport
+    """
+    selection = selection or ExtractionFilter()
+    report = ReconciliationReport()
+    sources = SourceRows(row_cache, manifest, max_blank_rows)
+
+    # Source side: names per (project, block)
+    source_blocks: List[Tuple[str, str, Optional[str], str, Counter]] = []
+    for plot_folder, excel_files in selection.select_files(drawing_data_path).items():
+        plot_name = folder_to_plot_name(plot_folder.name)
+        if not plot_name:
+            report.errors.append(f"Failed to extract plot name from folder: {plot_folder.name}")
+            continue
+        project_id = plot_projects.get(plot_name.upper())
+        if not project_id:
+            report.errors.append(f"No PROJECT_ID found for plot: {plot_name}")
+            continue
+
+        for excel_path in excel_files:
+            block_name = filename_to_block_name(excel_path.name)
+            if not block_name:
+                report.errors.append(f"Failed to extract block name from: {excel_path.name}")
+                continue
+            report.workbooks += 1
+            names = source_names(sources.get(excel_path))
+            source_blocks.append((plot_name, block_name, project_id.lower(), excel_path.name, names))
+
+    report.workbooks_from_cache = sources.from_cache
+    report.workbooks_parsed = sources.parsed
+
+    # Store side: one pass for all involved projects
+    stored = load_stored_names(design_elements_csv, [p for _, _, p, _, _ in source_blocks])
+
+    if distinct:
+        report.blocks = diff_distinct(source_blocks, stored, selection.is_active())
+        report.blocks.sort(key=lambda b: (b.plot_name, b.block_name))
+        return report
+
+    # First diff each block on its own
+    leftovers: Dict[str, Dict[str, Counter]] = {}     # project → parent label → extra names
+    missing_names: List[Counter] = []                 # parallel to report.blocks
+    for plot_name, block_name, project_id, filename, names in source_blocks:
+        project = stored[project_id]
+        stored_names = Counter(project.by_parent.get(block_name.upper(), Counter()))
+        source = Counter(names)
+
+        block = BlockReconciliation(
+            plot_name=plot_name,
+            block_name=block_name,
+            project_id=project_id,
+            source_file=filename,
+            source_count=sum(source.values()),
+            stored_count=sum(stored_names.values())
+        )
+        leftovers.setdefault(project_id, {})[block_name.upper()] = stored_names - source
+        missing_names.append(source - stored_names)
+        report.blocks.append(block)
+
+    # Stored blocks (and non-block parents) without a source workbook are all extra
+    if not selection.is_active():
+        for project_id, project in stored.items():
+            seen = leftovers.setdefault(project_id, {})
+            for label, names in project.by_parent.items():
+                if label not in seen:
+                    seen[label] = Counter(names)
+                    report.blocks.append(BlockReconciliation(
+                        plot_name='?', block_name=label, project_id=project_id,
+                        stored_count=sum(seen[label].values())
+                    ))
+                    missing_names.append(Counter())
+    else:
+        for project_id, project in stored.items():
+            if NOT_A_BLOCK in project.by_parent:
+                leftovers.setdefault(project_id, {})[NOT_A_BLOCK] = Counter(project.by_parent[NOT_A_BLOCK])
+
+    # Missing names found as extra under another parent are misparented
+    for block, missing in zip(report.blocks, missing_names):
+        for label, extra in leftovers.get(block.project_id, {}).items():
+            if label == block.block_name.upper() or not missing:
+                continue
+            moved = missing & extra
+            for (element_type, name), count in sorted(moved.items()):
+                block.misparented.append(Misparented(element_type, name, label, count))
+            missing -= moved
+            extra -= moved
+        block.missing = _as_list(missing)
+
+    for block in report.blocks:
+        block.extra = _as_list(leftovers.get(block.project_id, {}).get(block.block_name.upper(), Counter()))
+
+    report.blocks.sort(key=lambda b: (b.plot_name, b.block_name))
+    return report
+
+
+def print_report(report: ReconciliationReport, max_names: int = 5):
+    """Print a reconciliation report."""
+    print("="*80)
+    print("SOURCE-TO-STORE RECONCILIATION")
+    print("="*80)
+    print(f"\n📄 Workbooks: {report.workbooks} ({report.workbooks_from_cache} from row cache, {report.workbooks_parsed} parsed)")
+
+    for block in report.blocks:
+        marker = "✅" if block.is_clean() else "⚠️ "
+        print(f"\n{marker} {block.plot_name} {block.block_name}: source={block.source_count:,} stored={block.stored_count:,}")
+        if block.missing:
+            names = ", ".join(f"{t} {n}" + (f" x{c}" if c > 1 else "") for t, n, c in block.missing[:max_names])
+            print(f"   Missing ({sum(c for _, _, c in block.missing)}): {names}{' ...' if len(block.missing) > max_names else ''}")
+        if block.extra:
+            names = ", ".join(f"{t} {n}" + (f" x{c}" if c > 1 else "") for t, n, c in block.extra[:max_names])
+            print(f"   Extra ({sum(c for _, _, c in block.extra)}): {names}{' ...' if len(block.extra) > max_names else ''}")
+        for moved in block.misparented[:max_names]:
+            print(f"   Misparented: {moved.type} {moved.name} x{moved.count} stored under {moved.found_under}")
+        if len(block.misparented) > max_names:
+            print(f"   ... and {len(block.misparented) - max_names} more misparented")
+
+    for error in report.errors:
+        print(f"\n❌ {error}")
+
+    totals = report.totals()
+    print(f"\n{'='*80}")
+    print(f"Blocks: {totals['blocks']} ({totals['clean_blocks']} clean)")
+    print(f"Missing: {totals['missing']:,}  Extra: {totals['extra']:,}  Misparented: {totals['misparented']:,}")
+    print("="*80)
+
+
+def main():
+    """Main entry point."""
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+
+    parser = argparse.ArgumentParser(description="Reconcile workbook rows against DESIGNELEMENTS per block.")
+    parser.add_argument("--data-path", default=None, help="Override path to data folder (lookup CSVs).")
+    parser.add_argument("--drawing-data-path", default=None, help="Override path to drawing_data folder.")
+    parser.add_argument("--csv", default=None, help="DESIGNELEMENTS.csv to reconcile (default: in data folder).")
+    parser.add_argument("--row-cache", default=None, help="Row cache JSON (default: output/row_cache.json).")
+    parser.add_argument("--manifest", default=None, help="Extraction manifest JSON (default: output/extraction_manifest.json).")
+    parser.add_argument("--output", default=None, help="Write the report as JSON to this file.")
+    parser.add_argument("--distinct", action="store_true", help="Compare name sets, not counts (extractions without --allow-name-duplicates).")
+    parser.add_argument("--max-blank-rows", type=int, default=DEFAULT_MAX_BLANK_ROWS, help=f"Empty-row run that ends a sheet, as in the extraction (0 = read to the end, default {DEFAULT_MAX_BLANK_ROWS}).")
+    parser.add_argument("--plot", default=None, help="Only these plots (comma separated).")
+    parser.add_argument("--block", default=None, help="Only these blocks (comma separated).")
+    parser.add_argument("--files", default=None, help="Only workbooks matching this glob.")
+    args = parser.parse_args()
+    if args.max_blank_rows < 0:
+        parser.error("--max-blank-rows must be 0 (read to the end) or more")
+
+    data_path = Path(args.data_path) if args.data_path else base_path / "data"
+    drawing_data_path = Path(args.drawing_data_path) if args.drawing_data_path else base_path / "drawing_data"
+    design_elements_csv = Path(args.csv) if args.csv else data_path / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
+    row_cache = RowCache(Path(args.row_cache) if args.row_cache else base_path / "output" / "row_cache.json")
+    manifest = ExtractionManifest(Path(args.manifest) if args.manifest else base_path / "output" / "extraction_manifest.json")
+
+    try:
+        selection = ExtractionFilter.from_args(args.plot, args.block, args.files)
+    except TransformationError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    plot_projects = {
+        plot_name.upper(): project_id
+        for project_id, plot_name in load_plots_projects_mapping(str(data_path / "CCTECH.DRS.ENTITIES-PLOTS-PROJECTS.csv")).values()
+    }
+
+    report = reconcile(
+        drawing_data_path,
+        design_elements_csv,
+        plot_projects,
+        row_cache,
+        manifest=manifest,
+        selection=selection,
+        distinct=args.distinct,
+        max_blank_rows=args.max_blank_rows
+    )
+    row_cache.save()
+    print_report(report)
+
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'totals': report.totals(), **asdict(report)}, f, indent=2)
+        print(f"\n💾 Report written to: {args.output}")
+
+    totals = report.totals()
+    sys.exit(0 if totals['blocks'] == totals['clean_blocks'] and not report.errors else 1)
+
+
+if __name__ == "__main__":
+    main()
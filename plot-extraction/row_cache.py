@@ -0,0 +1,208 @@
+"""
+Workbook Row Cache Module
+=========================
+
+Fingerprints drawing workbooks by their sheet content and caches the cleaned
+TABLE/INVERTER rows, so that block drawings which are copies of one another
+(apart from their Bxx- prefixes) are parsed only once:
+1. fingerprint_workbook: hash of sheet XML + shared strings, prefixes normalized
+2. RowCache: (fingerprint, max_blank_rows) → cleaned rows, persisted as JSON
+   between runs; rows cut off by one blank-row limit are not reused under another
+
+Date: October 18, 2026
+"""
+
+import hashlib
+import json
+import os
+import re
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# Bump when the row cleaning logic changes so stale cache entries are ignored
+# (v2: rows_read stops at the last data row; declared/last row recorded;
+#  v3: entries keyed by fingerprint and max_blank_rows;
+#  v4: bare block prefixes are not normalized)
+CACHE_VERSION = 4
+
+# Stop reading a sheet after this many consecutive empty rows
+DEFAULT_MAX_BLANK_ROWS = 100
+
+# Cell text starting with a block prefix (B01-, B4-, BO4-), as stripped by
+# transform_logic.extract_clean_name. Only text nodes are touched (">" anchor),
+# and only when a name follows: a bare "B01-" is kept whole by
+# extract_clean_name (after strip()), so it must keep its number here too.
+# Names other than printable ASCII are left alone (no reuse, but no collision).
+_BLOCK_PREFIX_IN_XML = re.compile(rb'>B[O]?\d+-(?=[!-;=-~])', re.IGNORECASE)
+
+# Per-sheet revision GUIDs written by Excel; they differ between copies
+_REVISION_UID = re.compile(rb'\sxr:uid="\{[0-9A-Fa-f-]+\}"')
+
+# Workbook members that determine the cleaned rows
+_SHEET_MEMBER = re.compile(r'^xl/worksheets/[^/]+\.xml$')
+_SHARED_STRINGS_MEMBER = 'xl/sharedStrings.xml'
+
+# (row_idx, table_name, inverter_name)
+CleanedRow = Tuple[int, Optional[str], Optional[str]]
+
+
+@dataclass
+class WorkbookRows:
+    """Cleaned rows read from one workbook."""
+    rows_read: int
+    rows: List[CleanedRow] = field(default_factory=list)
+    declared_rows: Optional[int] = None      # from the sheet's dimension tag
+    last_row: int = 1                        # last row with data (1 = header only)
+
+
+def normalize_sheet_xml(data: bytes) -> bytes:
+    """
+    Replace block prefixes in cell text with a placeholder.
+
+    Revision GUIDs (xr:uid) are dropped as well, since Excel assigns a new
+    one to every copy of a sheet.
+
+    Args:
+        data: Raw sheet or shared strings XML
+
+    Returns:
+        XML with every leading "Bxx-" in cell text rewritten to "B#-"
+
+    Examples:
+        >>> normalize_sheet_xml(b'<t>B01-R42-S01</t><t>BO4-I41</t>')
+        b'<t>B#-R42-S01</t><t>B#-I41</t>'
+        >>> normalize_sheet_xml(b'<t>B01-</t><t xml:space="preserve">B02- </t>')
+        b'<t>B01-</t><t xml:space="preserve">B02- </t>'
+    """
+    data = _REVISION_UID.sub(b'', data)
+    return _BLOCK_PREFIX_IN_XML.sub(b'>B#-', data)
+
+
+def fingerprint_workbook(excel_path: Path) -> str:
+    """
+    Fingerprint a workbook by its sheet content with block prefixes normalized.
+
+    Only the worksheet XML and shared strings are hashed; timestamps in
+    docProps and styling do not affect the fingerprint.
+
+    Args:
+        excel_path: Path to .xlsx file
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256(f"row-cache-v{CACHE_VERSION}".encode('ascii'))
+
+    with zipfile.ZipFile(excel_path) as zf:
+        members = sorted(
+            name for name in zf.namelist()
+            if _SHEET_MEMBER.match(name) or name == _SHARED_STRINGS_MEMBER
+        )
+        for name in members:
+            digest.update(b'\0' + name.encode('utf-8') + b'\0')
+            digest.update(normalize_sheet_xml(zf.read(name)))
+
+    return digest.hexdigest()
+
+
+def _entry_key(fingerprint: str, max_blank_rows: int) -> str:
+    return f"{fingerprint}/{max_blank_rows}"
+
+
+class RowCache:
+    """(Fingerprint, max_blank_rows) → cleaned rows, optionally persisted to a JSON file."""
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.entries: Dict[str, WorkbookRows] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+        if self.cache_path and self.cache_path.exists():
+            self._load()
+
+    def _load(self):
+        """Load entries from disk, ignoring files from another cache version."""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if payload.get('version') != CACHE_VERSION:
+            return
+
+        for key, entry in payload.get('entries', {}).items():
+            self.entries[key] = WorkbookRows(
+                rows_read=entry['rows_read'],
+                rows=[tuple(row) for row in entry['rows']],
+                declared_rows=entry['declared_rows'],
+                last_row=entry['last_row']
+            )
+
+    def get(self, fingerprint: str, max_blank_rows: int = DEFAULT_MAX_BLANK_ROWS) -> Optional[WorkbookRows]:
+        """
+        Get cached rows for a fingerprint.
+
+        Args:
+            fingerprint: Value from fingerprint_workbook()
+            max_blank_rows: Blank-row limit the rows must have been read with
+
+        Returns:
+            WorkbookRows or None if the workbook has not been parsed before
+            with this limit
+        """
+        entry = self.entries.get(_entry_key(fingerprint, max_blank_rows))
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, fingerprint: str, workbook_rows: WorkbookRows, max_blank_rows: int = DEFAULT_MAX_BLANK_ROWS):
+        """
+        Store cleaned rows for a fingerprint.
+
+        Args:
+            fingerprint: Value from fingerprint_workbook()
+            workbook_rows: Rows parsed from the workbook
+            max_blank_rows: Blank-row limit the rows were read with
+        """
+        self.entries[_entry_key(fingerprint, max_blank_rows)] = workbook_rows
+        self._dirty = True
+
+    def save(self):
+        """Write the cache to disk (temp file + rename) if it changed."""
+        if not self.cache_path or not self._dirty:
+            return
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'version': CACHE_VERSION,
+            'entries': {
+                key: {
+                    'rows_read': entry.rows_read,
+                    'rows': entry.rows,
+                    'declared_rows': entry.declared_rows,
+                    'last_row': entry.last_row
+                }
+                for key, entry in self.entries.items()
+            }
+        }
+        temp_path = self.cache_path.with_suffix(self.cache_path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'))
+        os.replace(temp_path, self.cache_path)
+        self._dirty = False
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache statistics."""
+        return {
+            'entries': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses
+        }
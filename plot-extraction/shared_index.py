@@ -0,0 +1,289 @@
+"""
+Shared-Memory Lookup Index
+==========================
+
+Flat, read-only copy of LookupDictionaries.existing_elements in one
+multiprocessing.shared_memory block, for duplicate checks in worker
+processes without pickling the dictionaries to each of them:
+1. The parent builds the index once (SharedLookupIndex.create)
+2. Workers attach by name (a short string) with zero copy, e.g. in a pool
+   initializer, and call element_exists / get_existing_element directly
+3. The parent closes and unlinks the block when the pool is done
+
+Block layout (arrays in native byte order; the block never leaves the machine):
+    header:  magic "DESHIX\\0\\1", version u32, rows u64, hashes offset u64,
+             rows offset u64, offsets offset u64, heap offset u64
+    hashes:  element_key_hash as u64, sorted (searched with bisect)
+    rows:    u32 element row per hash
+    offsets: u64 per field (ID, PROJECT_ID, NAME, TYPE, PARENT_ID per row) + end
+    heap:    UTF-8 field values
+
+Usage:
+    python shared_index.py --design-elements data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv --workers 4
+
+Date: October 18, 2026
+"""
+
+import argparse
+import pickle
+import struct
+import time
+from bisect import bisect_left
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from lookup_builder import DesignElement, LookupDictionaries, element_key_hash
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+MAGIC = b"DESHIX\0\1"
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sIQQQQQ')
+FIELDS = 5
+
+# Index a worker attached to in init_worker()
+_worker_index: Optional['SharedLookupIndex'] = None
+
+
+def _align(offset: int) -> int:
+    return offset + (-offset % 8)
+
+
+class SharedLookupIndex:
+    """Read-only existing-element lookups backed by a shared memory block."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.name = shm.name
+        self._buf = shm.buf
+        magic, version, self.rows, hashes_offset, rows_offset, offsets_offset, self.heap_offset = HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Shared memory block {shm.name} is not a version {FORMAT_VERSION} lookup index")
+        self._hashes = self._buf[hashes_offset:hashes_offset + self.rows * 8].cast('Q')
+        self._rows = self._buf[rows_offset:rows_offset + self.rows * 4].cast('I')
+        self._offsets = self._buf[offsets_offset:offsets_offset + (self.rows * FIELDS + 1) * 8].cast('Q')
+
+    @classmethod
+    def create(cls, lookups: LookupDictionaries, name: Optional[str] = None) -> 'SharedLookupIndex':
+        """
+        Build the index of lookups.existing_elements in a new shared memory block.
+
+        Args:
+            lookups: Loaded LookupDictionaries
+            name: Optional block name (default: chosen by the OS)
+
+        Returns:
+            SharedLookupIndex owning the block (close() and unlink() it when done)
+        """
+        elements = list(lookups.existing_elements.values())
+        records = sorted(
+            (int.from_bytes(element_key_hash(e.project_id, e.name, e.type), 'little'), row)
+            for row, e in enumerate(elements)
+        )
+        hashes = array('Q', [digest for digest, _ in records])
+        rows = array('I', [row for _, row in records])
+
+        offsets = array('Q', [0])
+        heap = bytearray()
+        for e in elements:
+            for value in (e.id, e.project_id, e.name, e.type, e.parent_id):
+                heap += value.encode('utf-8')
+                offsets.append(len(heap))
+        if hashes.itemsize != 8 or rows.itemsize != 4:
+            raise ValueError("array('Q') / array('I') are not 8 / 4 bytes on this platform")
+
+        hashes_offset = _align(HEADER.size)
+        rows_offset = hashes_offset + len(hashes) * 8
+        offsets_offset = _align(rows_offset + len(rows) * 4)
+        heap_offset = offsets_offset + len(offsets) * 8
+        size = max(1, heap_offset + len(heap))
+
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        buf = shm.buf
+        HEADER.pack_into(buf, 0, MAGIC, FORMAT_VERSION, len(elements), hashes_offset, rows_offset, offsets_offset, heap_offset)
+        for offset, values in ((hashes_offset, hashes), (rows_offset, rows), (offsets_offset, offsets)):
+            buf[offset:offset + len(values) * values.itemsize] = values.tobytes()
+        buf[heap_offset:heap_offset + len(heap)] = heap
+        del buf
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedLookupIndex':
+        """Attach to an index created by another process (zero copy)."""
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13 attaching also registers the block with the
+            # resource tracker; pool workers share the parent's tracker, so
+            # this is a no-op there and the owner's unlink() still applies
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    @property
+    def nbytes(self) -> int:
+        return self.shm.size
+
+    def element_at(self, row: int) -> DesignElement:
+        """Element stored in row (decoded from the shared heap)."""
+        base = row * FIELDS
+        offsets = self._offsets
+        start = self.heap_offset
+        values = [
+            self._buf[start + offsets[base + f]:start + offsets[base + f + 1]].tobytes().decode('utf-8')
+            for f in range(FIELDS)
+        ]
+        return DesignElement(*values)
+
+    def get_existing_element(self, project_id: str, name: str, element_type: str) -> Optional[DesignElement]:
+        """
+        Get existing design element (same signature as LookupDictionaries).
+
+        Hash matches are confirmed against the stored values.
+        """
+        digest = int.from_bytes(element_key_hash(project_id, name, element_type), 'little')
+        hashes = self._hashes
+        i = bisect_left(hashes, digest)
+        key = (project_id.lower(), name.upper(), element_type.upper())
+        while i < self.rows and hashes[i] == digest:
+            element = self.element_at(self._rows[i])
+            if (element.project_id.lower(), element.name.upper(), element.type.upper()) == key:
+                return element
+            i += 1
+        return None
+
+    def element_exists(self, project_id: str, name: str, element_type: str) -> bool:
+        """Check if a design element already exists (same signature as LookupDictionaries)."""
+        return self.get_existing_element(project_id, name, element_type) is not None
+
+    def close(self):
+        """Release this process's view; the owner also unlinks the block."""
+        if self._buf is None:
+            return
+        for view in (self._hashes, self._rows, self._offsets):
+            view.release()
+        self._hashes = self._rows = self._offsets = None
+        self._buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self) -> 'SharedLookupIndex':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def init_worker(index_name: str):
+    """Pool initializer: attach this worker to the shared index."""
+    global _worker_index
+    _worker_index = SharedLookupIndex.attach(index_name)
+
+
+def worker_index() -> SharedLookupIndex:
+    """The index attached by init_worker() in this worker process."""
+    if _worker_index is None:
+        raise RuntimeError("init_worker() was not run in this process")
+    return _worker_index
+
+
+def _check_keys(keys: List[Tuple[str, str, str]]) -> List[Optional[str]]:
+    index = worker_index()
+    return [
+        element.id if element is not None else None
+        for element in (index.get_existing_element(*key) for key in keys)
+    ]
+
+
+def _check_keys_pickled(args: Tuple[bytes, List[Tuple[str, str, str]]]) -> List[Optional[str]]:
+    lookups = pickle.loads(args[0])
+    return [
+        element.id if element is not None else None
+        for element in (lookups.get_existing_element(*key) for key in args[1])
+    ]
+
+
+def compare_startup(lookups: LookupDictionaries, workers: int, probe_keys: List[Tuple[str, str, str]]) -> Dict[str, float]:
+    """
+    Time the first pool task with pickled dictionaries vs. the shared index.
+
+    Both pools answer the same probes; their answers must match the
+    in-memory dictionaries.
+    """
+    expected = [
+        element.id if element is not None else None
+        for element in (lookups.get_existing_element(*key) for key in probe_keys)
+    ]
+    size = -(-len(probe_keys) // workers)
+    chunks = [probe_keys[i:i + size] for i in range(0, len(probe_keys), size)]
+    results = {}
+
+    started = time.perf_counter()
+    payload = pickle.dumps(lookups, protocol=pickle.HIGHEST_PROTOCOL)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_check_keys_pickled, (payload, chunk)) for chunk in chunks]
+        answers = [f.result() for f in futures]
+        results['pickled_seconds'] = time.perf_counter() - started
+    results['pickled_bytes'] = len(payload)
+    if [a for chunk in answers for a in chunk] != expected:
+        raise AssertionError("pickled lookups gave different answers")
+
+    started = time.perf_counter()
+    with SharedLookupIndex.create(lookups) as index:
+        results['shared_build_seconds'] = time.perf_counter() - started
+        results['shared_bytes'] = index.nbytes
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(index.name,)) as executor:
+            futures = [executor.submit(_check_keys, chunk) for chunk in chunks]
+            answers = [f.result() for f in futures]
+            results['shared_seconds'] = time.perf_counter() - started
+    if [a for chunk in answers for a in chunk] != expected:
+        raise AssertionError("shared index gave different answers")
+
+    return results
+
+
+def main():
+    """Main entry point."""
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+
+    parser = argparse.ArgumentParser(description="Compare pickled lookups with the shared-memory index in a process pool.")
+    parser.add_argument("--design-elements", default=None, help="DESIGNELEMENTS CSV (default: data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv).")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--probes", type=int, default=20000, help="Existing and new keys checked per run.")
+    args = parser.parse_args()
+
+    csv_path = Path(args.design_elements) if args.design_elements else base_path / "data" / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
+
+    print("="*80)
+    print("SHARED LOOKUP INDEX")
+    print("="*80)
+
+    lookups = LookupDictionaries()
+    lookups.load_design_elements(str(csv_path))
+    keys = list(lookups.existing_elements)
+    probe_keys = [keys[i % len(keys)] for i in range(args.probes // 2)]
+    probe_keys += [(p, n + '-NEW', t) for p, n, t in probe_keys]
+    print(f"\n📄 {len(keys):,} existing elements, {len(probe_keys):,} probes, {args.workers} workers")
+
+    results = compare_startup(lookups, args.workers, probe_keys)
+    print(f"\n   Pickled dictionaries: {results['pickled_bytes']:,} bytes per task, {results['pickled_seconds']:.2f} s")
+    print(f"   Shared index:         {results['shared_bytes']:,} bytes once, {results['shared_seconds']:.2f} s "
+          f"(build {results['shared_build_seconds']:.2f} s)")
+    print("\n✅ Both gave the same answers as the in-memory dictionaries")
+
+
+if __name__ == "__main__":
+    main()
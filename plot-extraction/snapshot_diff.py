@@ -0,0 +1,411 @@
+"""
+DESIGNELEMENTS Snapshot Diff
+============================
+
+Diffs two DESIGNELEMENTS CSVs (a backup and the live file) by ID and writes
+added/removed/changed rows as JSON Lines, streaming both files:
+1. Append fast path: if the old file is a byte prefix of the new one, only
+   the old file's last line is kept; the appended bytes are streamed (a row
+   glued onto an unterminated last line shows up as changed). Appended IDs
+   are checked against the unchanged rows through a sorted array of 64-bit
+   ID digests (8 bytes per old row); appends larger than a partition are
+   hash-partitioned like the rewrite path
+2. Rewrite path: both files are hash-partitioned by ID into temp files;
+   each partition is diffed in memory, so memory is bounded by the
+   partition size, not the file size
+
+A new row whose ID was already seen (earlier in the new file, or among the
+unchanged rows) is written as a "duplicate" record, not as added.
+
+Usage:
+    python snapshot_diff.py OLD.csv NEW.csv --output output/designelements_diff.jsonl
+    python snapshot_diff.py                    # newest backup vs live file
+
+Date: October 18, 2026
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import shutil
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+COMPARE_CHUNK_BYTES = 1 << 20
+
+# Target size of one partition in the rewrite path
+DEFAULT_PARTITION_BYTES = 32 * 1024 * 1024
+
+Row = List[str]
+
+
+@dataclass
+class DiffResult:
+    """Summary of one diff."""
+    old_path: str
+    new_path: str
+    mode: str = ""                  # "append" or "rewrite"
+    partitions: int = 0
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    duplicate_ids_old: int = 0
+    duplicate_ids_new: int = 0
+    seconds: float = 0.0
+
+    def total_differences(self) -> int:
+        return self.added + self.removed + self.changed
+
+
+def row_id(row: Row) -> str:
+    """Diff key of a row: its ID, case-insensitive."""
+    return row[0].strip().lower() if row else ""
+
+
+def _id_digest(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _normalized(row: Row) -> List[str]:
+    return [value.strip() for value in row]
+
+
+def common_prefix_length(old_path: Path, new_path: Path) -> int:
+    """
+    Length of the common byte prefix of two files (compared in 1 MB chunks).
+
+    Args:
+        old_path: Old file
+        new_path: New file
+
+    Returns:
+        Number of leading bytes that are equal
+    """
+    matched = 0
+    with open(old_path, 'rb') as old, open(new_path, 'rb') as new:
+        while True:
+            old_chunk = old.read(COMPARE_CHUNK_BYTES)
+            new_chunk = new.read(COMPARE_CHUNK_BYTES)
+            if not old_chunk or not new_chunk:
+                return matched
+            if old_chunk == new_chunk:
+                matched += len(old_chunk)
+                continue
+            limit = min(len(old_chunk), len(new_chunk))
+            i = 0
+            while i < limit and old_chunk[i] == new_chunk[i]:
+                i += 1
+            return matched + i
+
+
+def _read_range(path: Path, start: int, end: Optional[int] = None) -> bytes:
+    with open(path, 'rb') as f:
+        f.seek(start)
+        return f.read() if end is None else f.read(end - start)
+
+
+def _parse_rows(data: bytes) -> List[Row]:
+    return [row for row in csv.reader(io.StringIO(data.decode('utf-8'), newline='')) if row]
+
+
+def _csv_rows_from(path: Path, start: int) -> Iterator[Row]:
+    """Stream the CSV rows of a file from byte offset start (a line start)."""
+    with open(path, 'rb') as raw:
+        raw.seek(start)
+        with io.TextIOWrapper(raw, encoding='utf-8', newline='') as f:
+            for row in csv.reader(f):
+                if row:
+                    yield row
+
+
+class _DiffWriter:
+    """Writes diff records as JSON Lines and counts them."""
+
+    def __init__(self, result: DiffResult, columns: Row, output_path: Optional[Path]):
+        self.result = result
+        self.columns = columns
+        self.output = open(output_path, 'w', encoding='utf-8') if output_path else None
+
+    def _record(self, row: Row) -> Dict[str, str]:
+        record = {column: value for column, value in zip(self.columns, row)}
+        if len(row) != len(self.columns):
+            record['_fields'] = row
+        return record
+
+    def _write(self, payload: Dict):
+        if self.output:
+            self.output.write(json.dumps(payload) + '\n')
+
+    def added(self, row: Row):
+        self.result.added += 1
+        self._write({'op': 'added', 'id': row[0].strip(), 'row': self._record(row)})
+
+    def duplicate(self, row: Row):
+        self.result.duplicate_ids_new += 1
+        self._write({'op': 'duplicate', 'id': row[0].strip(), 'row': self._record(row)})
+
+    def removed(self, row: Row):
+        self.result.removed += 1
+        self._write({'op': 'removed', 'id': row[0].strip(), 'row': self._record(row)})
+
+    def compare(self, old: Row, new: Row):
+        old_values, new_values = _normalized(old), _normalized(new)
+        if old_values == new_values:
+            self.result.unchanged += 1
+            return
+        self.result.changed += 1
+        width = max(len(old_values), len(new_values))
+        changed_columns = [
+            self.columns[i] if i < len(self.columns) else f"field{i + 1}"
+            for i in range(width)
+            if (old_values[i] if i < len(old_values) else None) != (new_values[i] if i < len(new_values) else None)
+        ]
+        self._write({
+            'op': 'changed',
+            'id': new[0].strip(),
+            'columns': changed_columns,
+            'old': self._record(old),
+            'new': self._record(new)
+        })
+
+    def close(self):
+        if self.output:
+            self.output.close()
+
+
+def _diff_in_memory(
+    old_rows: Iterator[Row],
+    new_rows: Iterator[Row],
+    writer: _DiffWriter,
+    is_unchanged_id: Optional[Callable[[str], bool]] = None
+):
+    """
+    Diff one partition: old rows in a dict, new rows streamed.
+
+    The last old row of a repeated ID is compared; a new row whose ID was
+    already seen, or (append path) belongs to an unchanged row, is a duplicate.
+    """
+    old_by_id: Dict[str, Row] = {}
+    for row in old_rows:
+        key = row_id(row)
+        if key in old_by_id:
+            writer.result.duplicate_ids_old += 1
+        old_by_id[key] = row
+
+    seen = set()
+    for row in new_rows:
+        key = row_id(row)
+        if key in seen:
+            writer.duplicate(row)
+            continue
+        seen.add(key)
+        old = old_by_id.pop(key, None)
+        if old is not None:
+            writer.compare(old, row)
+        elif is_unchanged_id is not None and is_unchanged_id(key):
+            writer.duplicate(row)
+        else:
+            writer.added(row)
+
+    for row in old_by_id.values():
+        writer.removed(row)
+
+
+def _csv_rows(path: Path) -> Iterator[Row]:
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.reader(f):
+            if row:
+                yield row
+
+
+def _partition(path: Path, partitions: int, temp_dir: Path, tag: str) -> List[Path]:
+    """Split a CSV's data rows into partition files by hash of ID."""
+    rows = _csv_rows(path)
+    next(rows, None)
+    return _partition_rows(rows, partitions, temp_dir, tag)
+
+
+def _partition_rows(rows: Iterator[Row], partitions: int, temp_dir: Path, tag: str) -> List[Path]:
+    """Split rows into partition files by hash of ID."""
+    paths = [temp_dir / f"{tag}_{i:03d}.csv" for i in range(partitions)]
+    files = [open(p, 'w', encoding='utf-8', newline='') for p in paths]
+    try:
+        writers = [csv.writer(f) for f in files]
+        for row in rows:
+            writers[_id_digest(row_id(row)) % partitions].writerow(row)
+    finally:
+        for f in files:
+            f.close()
+    return paths
+
+
+def diff_snapshots(
+    old_path: Path,
+    new_path: Path,
+    output_path: Optional[Path] = None,
+    partition_bytes: int = DEFAULT_PARTITION_BYTES,
+    force_rewrite: bool = False
+) -> DiffResult:
+    """
+    Diff two DESIGNELEMENTS CSVs by ID.
+
+    Args:
+        old_path: Older CSV (e.g. a backup)
+        new_path: Newer CSV (e.g. the live file)
+        output_path: Optional JSON Lines output of the differences
+        partition_bytes: Target partition size for the rewrite path
+        force_rewrite: Skip the append fast path
+
+    Returns:
+        DiffResult
+    """
+    started = time.perf_counter()
+    result = DiffResult(old_path=str(old_path), new_path=str(new_path))
+    old_size = old_path.stat().st_size
+    new_size = new_path.stat().st_size
+
+    with open(new_path, 'r', encoding='utf-8', newline='') as f:
+        columns = next(csv.reader(f), [])
+    writer = _DiffWriter(result, [c.strip().upper() for c in columns], output_path)
+
+    try:
+        prefix = 0 if force_rewrite else common_prefix_length(old_path, new_path)
+        if not force_rewrite and prefix == old_size and old_size <= new_size:
+            # Append: everything before the old file's last line is unchanged
+            result.mode = "append"
+            head = _read_range(old_path, max(0, old_size - COMPARE_CHUNK_BYTES))
+            last_newline = head.rfind(b'\n')
+            if last_newline < 0 and old_size > len(head):
+                raise ValueError(f"Last line of {old_path.name} is longer than {COMPARE_CHUNK_BYTES} bytes")
+            boundary = old_size - len(head) + last_newline + 1
+            old_tail = _parse_rows(_read_range(old_path, boundary))
+            new_tail = _csv_rows_from(new_path, boundary)
+            if boundary == 0:       # header line itself is in the tail
+                old_tail = old_tail[1:]
+                next(new_tail, None)
+
+            # Digests of the unchanged rows' IDs (all old rows but the tail)
+            old_rows = _csv_rows(old_path)
+            next(old_rows, None)
+            digests = array('Q', (_id_digest(row_id(row)) for row in old_rows))
+            del digests[len(digests) - len(old_tail):]
+            result.unchanged += len(digests)
+            digests = array('Q', sorted(digests))
+
+            def is_unchanged_id(key: str) -> bool:
+                digest = _id_digest(key)
+                i = bisect_left(digests, digest)
+                return i < len(digests) and digests[i] == digest
+
+            partitions = max(1, -(-(new_size - boundary) // partition_bytes))
+            result.partitions = partitions
+            if partitions == 1:
+                _diff_in_memory(iter(old_tail), new_tail, writer, is_unchanged_id)
+            else:
+                temp_dir = Path(tempfile.mkdtemp(prefix="designelements_diff_"))
+                try:
+                    new_parts = _partition_rows(new_tail, partitions, temp_dir, "new")
+                    for i, new_part in enumerate(new_parts):
+                        old_part = (row for row in old_tail if _id_digest(row_id(row)) % partitions == i)
+                        _diff_in_memory(old_part, _csv_rows(new_part), writer, is_unchanged_id)
+                finally:
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+        else:
+            result.mode = "rewrite"
+            partitions = max(1, -(-max(old_size, new_size) // partition_bytes))
+            result.partitions = partitions
+            if partitions == 1:
+                old_rows, new_rows = _csv_rows(old_path), _csv_rows(new_path)
+                next(old_rows, None)
+                next(new_rows, None)
+                _diff_in_memory(old_rows, new_rows, writer)
+            else:
+                temp_dir = Path(tempfile.mkdtemp(prefix="designelements_diff_"))
+                try:
+                    old_parts = _partition(old_path, partitions, temp_dir, "old")
+                    new_parts = _partition(new_path, partitions, temp_dir, "new")
+                    for old_part, new_part in zip(old_parts, new_parts):
+                        _diff_in_memory(_csv_rows(old_part), _csv_rows(new_part), writer)
+                finally:
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+    finally:
+        writer.close()
+
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def latest_backup(csv_path: Path) -> Optional[Path]:
+    """Newest backup of a CSV (<stem>_backup_*.csv / <stem>_before_repair_*.csv) in its folder."""
+    candidates = list(csv_path.parent.glob(f"{csv_path.stem}_backup_*.csv"))
+    candidates += list(csv_path.parent.glob(f"{csv_path.stem}_before_repair_*.csv"))
+    return max(candidates, key=lambda p: p.stat().st_mtime) if candidates else None
+
+
+def print_result(result: DiffResult, output_path: Optional[Path]):
+    """Print a diff summary."""
+    print("="*80)
+    print("DESIGNELEMENTS DIFF")
+    print("="*80)
+    print(f"\n📄 Old: {result.old_path}")
+    print(f"📄 New: {result.new_path}")
+    mode = result.mode if result.partitions <= 1 else f"{result.mode}, {result.partitions} partition(s)"
+    print(f"\n🔍 Mode: {mode}, {result.seconds:.2f} s")
+    print(f"   Added:     {result.added:,}")
+    print(f"   Removed:   {result.removed:,}")
+    print(f"   Changed:   {result.changed:,}")
+    print(f"   Unchanged: {result.unchanged:,}")
+    if result.duplicate_ids_old or result.duplicate_ids_new:
+        print(f"   ⚠️  Repeated IDs: {result.duplicate_ids_old} in old (last one compared), "
+              f"{result.duplicate_ids_new} duplicate row(s) in new (first one compared)")
+    if output_path:
+        print(f"\n💾 Differences written to: {output_path}")
+
+
+def main():
+    """Main entry point."""
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+    live_csv = base_path / "data" / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
+
+    parser = argparse.ArgumentParser(description="Diff two DESIGNELEMENTS CSVs by ID.")
+    parser.add_argument("old", nargs="?", default=None, help="Older CSV (default: newest backup of the live file).")
+    parser.add_argument("new", nargs="?", default=None, help="Newer CSV (default: live DESIGNELEMENTS.csv).")
+    parser.add_argument("--output", default=None, help="JSON Lines output (default: output/designelements_diff.jsonl).")
+    parser.add_argument("--partition-mb", type=int, default=DEFAULT_PARTITION_BYTES // (1024 * 1024),
+                        help="Partition size for rewritten files (bounds memory).")
+    parser.add_argument("--rewrite", action="store_true", help="Skip the append fast path.")
+    args = parser.parse_args()
+    if args.partition_mb < 1:
+        parser.error("--partition-mb must be at least 1")
+
+    new_path = Path(args.new) if args.new else live_csv
+    old_path = Path(args.old) if args.old else latest_backup(new_path)
+    if old_path is None:
+        parser.error(f"No backup of {new_path.name} found; pass OLD explicitly")
+    output_path = Path(args.output) if args.output else base_path / "output" / "designelements_diff.jsonl"
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    result = diff_snapshots(old_path, new_path, output_path,
+                            partition_bytes=args.partition_mb * 1024 * 1024,
+                            force_rewrite=args.rewrite)
+    print_result(result, output_path)
+
+
+if __name__ == "__main__":
+    main()
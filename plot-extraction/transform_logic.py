@@ -6,13 +6,16 @@ This module provides functions to parse and transform:
 1. Folder names → Plot names
 2. Excel filenames → Block names
 3. Table/Inverter names → Clean names (strip block prefix)
+4. Plot/block/filename selections for partial extraction
 
 Date: November 14, 2025
 """
 
 import re
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, Tuple, Set, List
 
 
 class TransformationError(Exception):
@@ -250,6 +253,180 @@ def extract_table_and_inverter(row_data: Tuple[str, str]) -> Tuple[Optional[str]
     return table_clean, inverter_clean
 
 
+def normalize_plot_selector(value: str) -> Optional[str]:
+    """
+    Normalize a user-supplied plot name for selection.
+    
+    Args:
+        value: Plot name with or without hyphen, e.g. "A-16b", "A16b", "a16B"
+        
+    Returns:
+        Plot name like "A-16b" or None if pattern doesn't match
+        
+    Examples:
+        >>> normalize_plot_selector("A16b")
+        'A-16b'
+        >>> normalize_plot_selector("a-16B")
+        'A-16b'
+    """
+    match = re.match(r'^([A-Z])-?(\d+)([a-z]?)$', value.strip(), re.IGNORECASE)
+    if match:
+        letter, digits, suffix = match.groups()
+        return f"{letter.upper()}-{digits}{suffix.lower()}"
+    
+    return None
+
+
+def normalize_block_selector(value: str) -> Optional[int]:
+    """
+    Normalize a user-supplied block name to its block number.
+    
+    Args:
+        value: Block name like "BL10", "bl01" or just "10"
+        
+    Returns:
+        Block number (10, 1) or None if pattern doesn't match
+        
+    Examples:
+        >>> normalize_block_selector("BL01")
+        1
+        >>> normalize_block_selector("11")
+        11
+    """
+    match = re.match(r'^(?:BL)?(\d+)$', value.strip(), re.IGNORECASE)
+    return int(match.group(1)) if match else None
+
+
+@dataclass
+class ExtractionFilter:
+    """
+    Selection of plot folders and workbooks for a partial extraction.
+    
+    Matching uses only folder names and filenames, so nothing has to be
+    opened to decide whether a workbook is selected. Empty selectors match
+    everything.
+    """
+    plots: Optional[Set[str]] = None
+    blocks: Optional[Set[int]] = None
+    file_glob: Optional[str] = None
+    
+    @classmethod
+    def from_args(
+        cls,
+        plots: Optional[str] = None,
+        blocks: Optional[str] = None,
+        file_glob: Optional[str] = None
+    ) -> 'ExtractionFilter':
+        """
+        Build a filter from comma-separated command-line values.
+        
+        Args:
+            plots: e.g. "A-16b,A-16c"
+            blocks: e.g. "BL10,BL11"
+            file_glob: e.g. "*-BL1?-*.xlsx"
+            
+        Returns:
+            ExtractionFilter
+            
+        Raises:
+            TransformationError: If a plot or block selector cannot be parsed
+        """
+        plot_set = None
+        if plots:
+            plot_set = set()
+            for value in plots.split(','):
+                if not value.strip():
+                    continue
+                plot_name = normalize_plot_selector(value)
+                if not plot_name:
+                    raise TransformationError(f"Invalid plot selector: {value!r}")
+                plot_set.add(plot_name.upper())
+        
+        block_set = None
+        if blocks:
+            block_set = set()
+            for value in blocks.split(','):
+                if not value.strip():
+                    continue
+                block_number = normalize_block_selector(value)
+                if block_number is None:
+                    raise TransformationError(f"Invalid block selector: {value!r}")
+                block_set.add(block_number)
+        
+        return cls(plots=plot_set, blocks=block_set, file_glob=file_glob or None)
+    
+    def is_active(self) -> bool:
+        """True if any selector is set."""
+        return bool(self.plots or self.blocks or self.file_glob)
+    
+    def matches_folder(self, folder_name: str) -> bool:
+        """
+        Check whether a plot folder is selected.
+        
+        Args:
+            folder_name: Folder name like "A16b - 200 MW"
+            
+        Returns:
+            True if selected
+        """
+        if not self.plots:
+            return True
+        plot_name = folder_to_plot_name(folder_name)
+        return bool(plot_name) and plot_name.upper() in self.plots
+    
+    def matches_file(self, folder_name: str, filename: str) -> bool:
+        """
+        Check whether a workbook is selected.
+        
+        The glob is matched case-insensitively against the filename and
+        against "<folder>/<filename>".
+        
+        Args:
+            folder_name: Plot folder name
+            filename: Excel filename
+            
+        Returns:
+            True if selected
+        """
+        if not self.matches_folder(folder_name):
+            return False
+        
+        if self.blocks:
+            block_name = filename_to_block_name(filename)
+            if not block_name or int(block_name[2:]) not in self.blocks:
+                return False
+        
+        if self.file_glob:
+            pattern = self.file_glob.lower()
+            if not (fnmatchcase(filename.lower(), pattern)
+                    or fnmatchcase(f"{folder_name}/{filename}".lower(), pattern)):
+                return False
+        
+        return True
+    
+    def select_files(self, drawing_data_path: Path) -> Dict[Path, List[Path]]:
+        """
+        List the selected workbooks per plot folder.
+        
+        Args:
+            drawing_data_path: Path to drawing_data/ folder
+            
+        Returns:
+            {plot_folder: [excel_path, ...]} for folders with at least one selected file
+        """
+        selected = {}
+        for plot_folder in sorted(f for f in drawing_data_path.iterdir() if f.is_dir()):
+            if not self.matches_folder(plot_folder.name):
+                continue
+            files = [
+                excel_path for excel_path in sorted(plot_folder.glob("*.xlsx"))
+                if self.matches_file(plot_folder.name, excel_path.name)
+            ]
+            if files:
+                selected[plot_folder] = files
+        return selected
+
+
 # Test functions
 def run_tests():
     """Run unit tests for all transformation functions."""
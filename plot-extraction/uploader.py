@@ -0,0 +1,793 @@
+"""
+Design Element Uploader
+=======================
+
+Uploads new design elements (new_design_elements.csv) to the DRS entities
+API in batches:
+1. Parent-before-child order: PLOT → BLOCK → TABLE/INVERTER levels; a level
+   starts only after every batch of the previous one was acknowledged
+2. Pool of keep-alive HTTP connections shared by N concurrent senders
+3. Gzip request bodies, retries with exponential backoff (and Retry-After)
+4. Checkpoint file: an interrupted upload resumes at the next
+   unacknowledged batch (of the same file, batch size and endpoint URL)
+
+Each batch is POSTed as {"batch_id": ..., "elements": [{ID, PROJECT_ID,
+NAME, TYPE, PARENT_ID}, ...]} with the batch id as Idempotency-Key, so a
+batch re-sent after a lost response is not stored twice.
+
+StandInServer is a local stand-in for the API (for tests and benchmarks).
+
+Usage:
+    python uploader.py --url https://drs.example.com/api --csv output/new_design_elements.csv
+    python uploader.py --stand-in          # upload to a local stand-in server
+    python uploader.py --self-test
+
+Date: October 18, 2026
+"""
+
+import argparse
+import csv
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+COLUMNS = ('ID', 'PROJECT_ID', 'NAME', 'TYPE', 'PARENT_ID')
+
+DEFAULT_ENDPOINT = "/entities/designelements/batch"
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 0.5           # seconds, doubled per attempt
+MAX_BACKOFF = 30.0
+DEFAULT_TIMEOUT = 60.0
+
+# Responses worth retrying; any other non-2xx status fails the batch
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+CHECKPOINT_VERSION = 2
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+Element = Dict[str, str]
+
+
+class UploadError(Exception):
+    """Raised when a batch is rejected or runs out of retries."""
+    pass
+
+
+@dataclass
+class Batch:
+    """A batch of elements at one hierarchy level."""
+    index: int
+    level: int
+    batch_id: str
+    elements: List[Element]
+
+
+@dataclass
+class UploadStats:
+    """Statistics for one upload."""
+    elements: int = 0
+    batches: int = 0
+    batches_sent: int = 0
+    batches_skipped: int = 0
+    rows_sent: int = 0
+    retries: int = 0
+    raw_bytes: int = 0
+    sent_bytes: int = 0
+    connections_opened: int = 0
+    seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    def rows_per_second(self) -> float:
+        return self.rows_sent / self.seconds if self.seconds else 0.0
+
+
+def load_elements(csv_path: Path) -> List[Element]:
+    """
+    Load design elements from a CSV with the DESIGNELEMENTS columns.
+
+    Args:
+        csv_path: Path to new_design_elements.csv
+
+    Returns:
+        List of {ID, PROJECT_ID, NAME, TYPE, PARENT_ID} dictionaries
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        return [
+            {column: (row.get(column) or '').strip() for column in COLUMNS}
+            for row in csv.DictReader(f)
+        ]
+
+
+def hierarchy_levels(elements: List[Element]) -> List[List[Element]]:
+    """
+    Group elements into levels so every parent precedes its children.
+
+    A parent that is not in the list is assumed to exist remotely already.
+
+    Args:
+        elements: Elements to upload
+
+    Returns:
+        Levels (level 0 first), each in input order
+
+    Raises:
+        UploadError: If PARENT_ID links form a cycle
+
+    Examples:
+        >>> elements = [
+        ...     {'ID': 't1', 'PARENT_ID': 'b1'}, {'ID': 'b1', 'PARENT_ID': 'p1'},
+        ...     {'ID': 'p1', 'PARENT_ID': 'proj'}, {'ID': 'i1', 'PARENT_ID': 'b1'}]
+        >>> [[e['ID'] for e in level] for level in hierarchy_levels(elements)]
+        [['p1'], ['b1'], ['t1', 'i1']]
+    """
+    parent_of = {e['ID']: e['PARENT_ID'] for e in elements}
+    depth: Dict[str, int] = {}
+
+    for element_id in parent_of:
+        chain = []
+        current = element_id
+        while current in parent_of and current not in depth:
+            if current in chain:
+                raise UploadError(f"PARENT_ID cycle through {current}")
+            chain.append(current)
+            current = parent_of[current]
+        base = depth[current] + 1 if current in depth else 0
+        for offset, chained_id in enumerate(reversed(chain)):
+            depth[chained_id] = base + offset
+
+    levels: List[List[Element]] = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for element in elements:
+        levels[depth[element['ID']]].append(element)
+    return levels
+
+
+def make_batches(elements: List[Element], batch_size: int) -> List[Batch]:
+    """
+    Split elements into parent-first batches that never span two levels.
+
+    Batch ids are derived from the element IDs, so the same input and batch
+    size give the same batches (and checkpoint entries) on every run.
+
+    Args:
+        elements: Elements to upload
+        batch_size: Maximum elements per batch
+
+    Returns:
+        Batches in upload order
+    """
+    batches = []
+    for level, level_elements in enumerate(hierarchy_levels(elements)):
+        for start in range(0, len(level_elements), batch_size):
+            chunk = level_elements[start:start + batch_size]
+            digest = hashlib.blake2b(digest_size=16)
+            for element in chunk:
+                digest.update(element['ID'].encode('utf-8') + b'\n')
+            batches.append(Batch(index=len(batches), level=level, batch_id=digest.hexdigest(), elements=chunk))
+    return batches
+
+
+def source_key(csv_path: Path) -> str:
+    """Identify a source CSV by content (checkpoints are only valid for it)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(csv_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def upload_target(base_url: str, endpoint: str) -> str:
+    """
+    Normalized URL of the batch endpoint (checkpoints are only valid for it).
+
+    >>> upload_target('HTTPS://DRS.example.com:443/api/', 'entities/batch')
+    'https://drs.example.com/api/entities/batch'
+    >>> upload_target('http://127.0.0.1:8080', '/entities/batch')
+    'http://127.0.0.1:8080/entities/batch'
+    """
+    parsed = urllib.parse.urlsplit(base_url.strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or '').lower()
+    if ':' in host:
+        host = f"[{host}]"
+    port = parsed.port
+    netloc = host if port is None or port == DEFAULT_PORTS.get(scheme) else f"{host}:{port}"
+    return f"{scheme}://{netloc}{parsed.path.rstrip('/')}/{endpoint.lstrip('/')}"
+
+
+class UploadCheckpoint:
+    """Acknowledged batch ids, persisted (temp file + rename) after every ack."""
+
+    def __init__(self, checkpoint_path: Path, source: str, batch_size: int, target: str):
+        self.checkpoint_path = Path(checkpoint_path)
+        self.source = source
+        self.batch_size = batch_size
+        self.target = target
+        self.acked: Dict[str, int] = {}
+        self.discarded_stale = False
+        self.other_target: Optional[str] = None
+        self._lock = threading.Lock()
+
+        if self.checkpoint_path.exists():
+            self._load()
+
+    def _load(self):
+        """
+        Load acks, ignoring a checkpoint for another source or batch size.
+
+        A checkpoint recorded for another endpoint URL is not loaded either,
+        but kept: other_target names it, and the caller decides whether to
+        clear() it (the batches it lists were stored there, not here).
+        """
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if (payload.get('version') != CHECKPOINT_VERSION
+                or payload.get('source') != self.source
+                or payload.get('batch_size') != self.batch_size):
+            self.discarded_stale = True
+            return
+        if payload.get('target') != self.target:
+            self.other_target = payload.get('target')
+            return
+        self.acked = dict(payload.get('acked', {}))
+
+    def is_acked(self, batch_id: str) -> bool:
+        return batch_id in self.acked
+
+    def ack(self, batch_id: str, rows: int):
+        """Record an acknowledged batch and save."""
+        with self._lock:
+            self.acked[batch_id] = rows
+            self._save()
+
+    def _save(self):
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'version': CHECKPOINT_VERSION,
+            'source': self.source,
+            'batch_size': self.batch_size,
+            'target': self.target,
+            'acked': self.acked
+        }
+        temp_path = self.checkpoint_path.with_suffix(self.checkpoint_path.suffix + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def clear(self):
+        """Remove the checkpoint file (after a completed upload)."""
+        with self._lock:
+            self.acked = {}
+            if self.checkpoint_path.exists():
+                self.checkpoint_path.unlink()
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections to one host, reused across batches."""
+
+    def __init__(self, base_url: str, timeout: float = DEFAULT_TIMEOUT):
+        parsed = urllib.parse.urlsplit(base_url)
+        if parsed.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL: {base_url}")
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.base_path = parsed.path.rstrip('/')
+        self.timeout = timeout
+        self.opened = 0
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> http.client.HTTPConnection:
+        """Get an idle connection or open a new one."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            self.opened += 1
+        connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def release(self, connection: http.client.HTTPConnection):
+        """Return a healthy connection for reuse."""
+        self._idle.put(connection)
+
+    def discard(self, connection: http.client.HTTPConnection):
+        """Close a connection that failed or that the server will close."""
+        connection.close()
+
+    def close(self):
+        """Close every idle connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class BulkUploader:
+    """Uploads batches concurrently over pooled connections."""
+
+    def __init__(
+        self,
+        base_url: str,
+        endpoint: str = DEFAULT_ENDPOINT,
+        token: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        timeout: float = DEFAULT_TIMEOUT,
+        compress: bool = True
+    ):
+        self.pool = ConnectionPool(base_url, timeout=timeout)
+        self.path = self.pool.base_path + '/' + endpoint.lstrip('/')
+        self.token = token
+        self.batch_size = batch_size
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.compress = compress
+        self.stats = UploadStats()
+        self._stats_lock = threading.Lock()
+
+    def upload(self, elements: List[Element], checkpoint: Optional[UploadCheckpoint] = None) -> UploadStats:
+        """
+        Upload elements level by level, skipping batches acked in the checkpoint.
+
+        Args:
+            elements: Elements to upload
+            checkpoint: Optional UploadCheckpoint (updated after every ack)
+
+        Returns:
+            UploadStats
+
+        Raises:
+            UploadError: If a batch fails; acknowledged batches stay in the
+                checkpoint and are skipped by the next run
+        """
+        started = time.perf_counter()
+        batches = make_batches(elements, self.batch_size)
+        self.stats.elements = len(elements)
+        self.stats.batches = len(batches)
+
+        levels: Dict[int, List[Batch]] = {}
+        for batch in batches:
+            if checkpoint is not None and checkpoint.is_acked(batch.batch_id):
+                self.stats.batches_skipped += 1
+            else:
+                levels.setdefault(batch.level, []).append(batch)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                for level in sorted(levels):
+                    self._upload_level(executor, levels[level], checkpoint)
+        finally:
+            self.pool.close()
+            self.stats.connections_opened = self.pool.opened
+            self.stats.seconds = time.perf_counter() - started
+
+        return self.stats
+
+    def _upload_level(self, executor: ThreadPoolExecutor, batches: List[Batch], checkpoint: Optional[UploadCheckpoint]):
+        """Send one level's batches concurrently; stop at the first failure."""
+        futures = {executor.submit(self._send_batch, batch): batch for batch in batches}
+        failure = None
+        for future in as_completed(futures):
+            batch = futures[future]
+            try:
+                future.result()
+            except UploadError as e:
+                if failure is None:
+                    failure = e
+                    for pending in futures:
+                        pending.cancel()
+                self.stats.errors.append(str(e))
+                continue
+            except CancelledError:
+                continue    # not started before an earlier failure
+            if checkpoint is not None:
+                checkpoint.ack(batch.batch_id, len(batch.elements))
+        if failure is not None:
+            raise failure
+
+    def _send_batch(self, batch: Batch):
+        """POST one batch, retrying transient failures with backoff."""
+        raw = json.dumps({'batch_id': batch.batch_id, 'elements': batch.elements}, separators=(',', ':')).encode('utf-8')
+        body = gzip.compress(raw, compresslevel=5) if self.compress else raw
+        headers = {
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            'Idempotency-Key': batch.batch_id,
+            'Connection': 'keep-alive'
+        }
+        if self.compress:
+            headers['Content-Encoding'] = 'gzip'
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                status, response, retry_after = self._post(body, headers)
+            except (OSError, http.client.HTTPException) as e:
+                problem = f"{type(e).__name__}: {e}"
+            else:
+                if 200 <= status < 300:
+                    with self._stats_lock:
+                        self.stats.batches_sent += 1
+                        self.stats.rows_sent += len(batch.elements)
+                        self.stats.raw_bytes += len(raw)
+                        self.stats.sent_bytes += len(body)
+                    return
+                problem = f"HTTP {status}: {response[:200].decode('utf-8', 'replace')}"
+                if status not in RETRY_STATUSES:
+                    raise UploadError(f"Batch {batch.index} (level {batch.level}) rejected: {problem}")
+
+            if attempt == self.max_retries:
+                raise UploadError(f"Batch {batch.index} (level {batch.level}) failed after {attempt + 1} attempts: {problem}")
+            with self._stats_lock:
+                self.stats.retries += 1
+            delay = retry_after if retry_after is not None else self.backoff * (2 ** attempt)
+            time.sleep(min(MAX_BACKOFF, delay) * (1 + random.random() * 0.25))
+
+    def _post(self, body: bytes, headers: Dict[str, str]) -> Tuple[int, bytes, Optional[float]]:
+        """POST on a pooled connection; returns (status, body, Retry-After seconds)."""
+        connection = self.pool.acquire()
+        try:
+            connection.request('POST', self.path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+        except Exception:
+            self.pool.discard(connection)
+            raise
+
+        if response.will_close:
+            self.pool.discard(connection)
+        else:
+            self.pool.release(connection)
+
+        retry_after = response.getheader('Retry-After')
+        try:
+            retry_after = float(retry_after) if retry_after is not None else None
+        except ValueError:
+            retry_after = None
+        return response.status, data, retry_after
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Request handler of StandInServer (state lives on the server)."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True      # headers and body are separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, payload: Dict):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if status == 503:
+            self.send_header('Retry-After', '0')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        stand_in: StandInServer = self.server.stand_in
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path != stand_in.path:
+            self._reply(404, {'error': f"unknown endpoint {self.path}"})
+            return
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        payload = json.loads(body)
+        elements = payload.get('elements', [])
+
+        request_no = stand_in.record_request(self.client_address)
+        if stand_in.latency or stand_in.row_latency:
+            time.sleep(stand_in.latency + stand_in.row_latency * len(elements))
+        if stand_in.fail_every and request_no % stand_in.fail_every == 0:
+            self._reply(503, {'error': 'injected failure'})
+            return
+        if stand_in.reject_from and request_no >= stand_in.reject_from:
+            self._reply(400, {'error': 'injected rejection'})
+            return
+
+        status, reply = stand_in.store(self.headers.get('Idempotency-Key') or payload.get('batch_id'), elements)
+        self._reply(status, reply)
+
+
+class StandInServer:
+    """
+    Local stand-in for the DRS entities batch endpoint.
+
+    Stores elements by ID, answers a repeated Idempotency-Key without storing
+    again, and rejects (409) elements whose parent is neither stored nor in
+    known_ids. Latency and failures can be injected.
+    """
+
+    def __init__(
+        self,
+        known_ids: Iterable[str] = (),
+        endpoint: str = DEFAULT_ENDPOINT,
+        latency: float = 0.0,
+        row_latency: float = 0.0,
+        fail_every: int = 0,
+        reject_from: int = 0,
+        port: int = 0
+    ):
+        self.path = '/' + endpoint.lstrip('/')
+        self.known_ids = {i.lower() for i in known_ids}
+        self.latency = latency
+        self.row_latency = row_latency
+        self.fail_every = fail_every
+        self.reject_from = reject_from
+        self.elements: Dict[str, Element] = {}
+        self.batches: Dict[str, int] = {}
+        self.requests = 0
+        self.duplicate_batches = 0
+        self.clients = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.stand_in = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_request(self, client_address) -> int:
+        with self._lock:
+            self.requests += 1
+            self.clients.add(client_address)
+            return self.requests
+
+    def store(self, batch_id: Optional[str], elements: List[Element]) -> Tuple[int, Dict]:
+        """Store a batch; returns (HTTP status, reply)."""
+        with self._lock:
+            if batch_id and batch_id in self.batches:
+                self.duplicate_batches += 1
+                return 200, {'accepted': self.batches[batch_id], 'duplicate': True}
+            batch_ids = {e['ID'].lower() for e in elements}
+            for element in elements:
+                parent_id = element.get('PARENT_ID', '').lower()
+                if parent_id and parent_id not in self.known_ids and parent_id not in self.elements and parent_id not in batch_ids:
+                    return 409, {'error': 'unknown parent', 'id': element['ID'], 'parent_id': element['PARENT_ID']}
+            for element in elements:
+                self.elements[element['ID'].lower()] = element
+            if batch_id:
+                self.batches[batch_id] = len(elements)
+            return 200, {'accepted': len(elements)}
+
+    def start(self) -> 'StandInServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def external_parent_ids(elements: List[Element]) -> List[str]:
+    """PARENT_IDs not in the list (must already exist remotely)."""
+    ids = {e['ID'] for e in elements}
+    return sorted({e['PARENT_ID'] for e in elements if e['PARENT_ID'] and e['PARENT_ID'] not in ids})
+
+
+def print_stats(stats: UploadStats):
+    """Print upload statistics."""
+    print(f"\n📊 Upload Stats:")
+    print(f"   Elements:  {stats.elements:,} in {stats.batches} batches")
+    print(f"   Sent:      {stats.batches_sent} batches, {stats.rows_sent:,} rows")
+    print(f"   Skipped:   {stats.batches_skipped} batches (acknowledged in checkpoint)")
+    print(f"   Retries:   {stats.retries}")
+    print(f"   Bytes:     {stats.sent_bytes:,} sent ({stats.raw_bytes:,} uncompressed)")
+    print(f"   Connections opened: {stats.connections_opened}")
+    print(f"   Time:      {stats.seconds:.2f} s ({stats.rows_per_second():,.0f} rows/s)")
+
+
+def _sample_elements(blocks: int = 3, tables: int = 40) -> List[Element]:
+    """Synthetic PLOT → BLOCK → TABLE/INVERTER elements for run_tests()."""
+    project_id = 'proj-1'
+    elements = [{'ID': 'plot-1', 'PROJECT_ID': project_id, 'NAME': 'A-16x', 'TYPE': 'PLOT', 'PARENT_ID': project_id}]
+    for b in range(1, blocks + 1):
+        block_id = f"block-{b}"
+        for t in range(1, tables + 1):
+            elements.append({'ID': f"{block_id}-t{t}", 'PROJECT_ID': project_id, 'NAME': f"R{t}-S01", 'TYPE': 'TABLE', 'PARENT_ID': block_id})
+        elements.append({'ID': f"{block_id}-i1", 'PROJECT_ID': project_id, 'NAME': 'I1', 'TYPE': 'INVERTER', 'PARENT_ID': block_id})
+        elements.append({'ID': block_id, 'PROJECT_ID': project_id, 'NAME': f"BL{b:02d}", 'TYPE': 'BLOCK', 'PARENT_ID': 'plot-1'})
+    return elements
+
+
+def run_tests():
+    """Run upload tests against a stand-in server."""
+    print("="*80)
+    print("UPLOADER TESTS")
+    print("="*80)
+
+    elements = _sample_elements()
+    external = external_parent_ids(elements)
+    results = []
+
+    def check(label, ok):
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} {label}")
+
+    # Test 1: parent-first batches
+    batches = make_batches(elements, batch_size=25)
+    seen = set(external)
+    ordered = True
+    for batch in batches:
+        ordered &= all(e['PARENT_ID'] in seen for e in batch.elements)
+        seen.update(e['ID'] for e in batch.elements)
+    check(f"{len(batches)} batches in parent-first order", ordered)
+    check("Batch ids are stable", [b.batch_id for b in batches] == [b.batch_id for b in make_batches(elements, 25)])
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Test 2: plain upload over pooled connections
+        with StandInServer(known_ids=external) as server:
+            stats = BulkUploader(server.url, batch_size=25, concurrency=4).upload(elements)
+            check(f"All {len(elements)} elements stored", len(server.elements) == len(elements))
+            check(f"{stats.connections_opened} connections for {server.requests} requests",
+                  stats.connections_opened <= 4 and server.requests == len(batches))
+            check("Bodies are gzip-compressed", stats.sent_bytes < stats.raw_bytes)
+
+        # Test 3: transient failures are retried
+        with StandInServer(known_ids=external, fail_every=3) as server:
+            stats = BulkUploader(server.url, batch_size=25, concurrency=2, backoff=0.01).upload(elements)
+            check(f"Retried {stats.retries} injected failures", stats.retries > 0 and len(server.elements) == len(elements))
+
+        # Test 4: interrupted upload resumes at the next unacknowledged batch
+        checkpoint_path = Path(temp_dir) / "upload_checkpoint.json"
+        with StandInServer(known_ids=external, reject_from=4) as server:
+            target = upload_target(server.url, DEFAULT_ENDPOINT)
+            checkpoint = UploadCheckpoint(checkpoint_path, source='sample', batch_size=25, target=target)
+            try:
+                BulkUploader(server.url, batch_size=25, concurrency=1).upload(elements, checkpoint)
+                check("Upload interrupted", False)
+            except UploadError:
+                check(f"Upload interrupted after {len(checkpoint.acked)} acknowledged batches", len(checkpoint.acked) == 3)
+
+            server.reject_from = 0
+            resumed = UploadCheckpoint(checkpoint_path, source='sample', batch_size=25, target=target)
+            stats = BulkUploader(server.url, batch_size=25, concurrency=4).upload(elements, resumed)
+            check(f"Resumed: {stats.batches_skipped} skipped, {stats.batches_sent} sent",
+                  stats.batches_skipped == 3 and stats.batches_sent == len(batches) - 3)
+            check("No batch stored twice", server.duplicate_batches == 0 and len(server.elements) == len(elements))
+
+        # Test 5: checkpoint of another source is ignored
+        other = UploadCheckpoint(checkpoint_path, source='other', batch_size=25, target=target)
+        check("Stale checkpoint ignored", other.discarded_stale and not other.acked)
+
+        # Test 6: checkpoint of another endpoint URL is not resumed
+        elsewhere = UploadCheckpoint(checkpoint_path, source='sample', batch_size=25,
+                                     target=upload_target('https://drs.example.com/api', DEFAULT_ENDPOINT))
+        check("Checkpoint of another endpoint not resumed", elsewhere.other_target == target and not elsewhere.acked)
+
+    print("\n" + "="*80)
+    print(f"{'✅ ALL TESTS PASSED' if all(results) else '❌ SOME TESTS FAILED'} ({sum(results)}/{len(results)})")
+    print("="*80)
+    return all(results)
+
+
+def main():
+    """Main entry point."""
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+
+    parser = argparse.ArgumentParser(description="Upload new design elements to the DRS entities API.")
+    parser.add_argument("--csv", default=None, help="Elements to upload (default: output/new_design_elements.csv).")
+    parser.add_argument("--url", default=os.environ.get("DRS_API_URL"), help="API base URL (or DRS_API_URL).")
+    parser.add_argument("--endpoint", default=DEFAULT_ENDPOINT, help=f"Batch endpoint path (default: {DEFAULT_ENDPOINT}).")
+    parser.add_argument("--token", default=os.environ.get("DRS_API_TOKEN"), help="Bearer token (or DRS_API_TOKEN).")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES)
+    parser.add_argument("--no-gzip", action="store_true", help="Send uncompressed request bodies.")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: output/upload_checkpoint.json).")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and upload every batch.")
+    parser.add_argument("--stand-in", action="store_true", help="Upload to a local stand-in server instead of --url.")
+    parser.add_argument("--self-test", action="store_true", help="Run the uploader tests and exit.")
+    args = parser.parse_args()
+
+    if args.self_test:
+        sys.exit(0 if run_tests() else 1)
+
+    csv_path = Path(args.csv) if args.csv else base_path / "output" / "new_design_elements.csv"
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else base_path / "output" / "upload_checkpoint.json"
+    if not args.url and not args.stand_in:
+        parser.error("--url (or DRS_API_URL) is required unless --stand-in is given")
+
+    print("="*80)
+    print("DESIGN ELEMENT UPLOAD")
+    print("="*80)
+
+    elements = load_elements(csv_path)
+    print(f"\n📄 {len(elements):,} elements from {csv_path.name}")
+
+    # A stand-in starts empty on a new port, so its checkpoints never resume
+    server = StandInServer(known_ids=external_parent_ids(elements), endpoint=args.endpoint).start() if args.stand_in else None
+    url = server.url if server else args.url
+
+    checkpoint = UploadCheckpoint(checkpoint_path, source_key(csv_path), args.batch_size, upload_target(url, args.endpoint))
+    if args.restart:
+        checkpoint.clear()
+    elif checkpoint.other_target:
+        if server:
+            server.stop()
+        print(f"\n❌ {checkpoint_path.name} was recorded for {checkpoint.other_target}")
+        print(f"   Pass --restart to discard it, or --checkpoint to use another file")
+        sys.exit(1)
+    elif checkpoint.discarded_stale:
+        print(f"⚠️  Checkpoint is for another file or batch size, starting over")
+    elif checkpoint.acked:
+        print(f"🔁 Resuming: {len(checkpoint.acked)} batches already acknowledged")
+
+    print(f"🌐 Uploading to {url}{args.endpoint} ({args.concurrency} connections, batches of {args.batch_size})")
+
+    uploader = BulkUploader(
+        url,
+        endpoint=args.endpoint,
+        token=args.token,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        max_retries=args.max_retries,
+        compress=not args.no_gzip
+    )
+    try:
+        stats = uploader.upload(elements, checkpoint)
+    except UploadError as e:
+        print_stats(uploader.stats)
+        print(f"\n❌ Upload stopped: {e}")
+        print(f"   Re-run to resume ({len(checkpoint.acked)} batches acknowledged in {checkpoint_path.name})")
+        sys.exit(1)
+    finally:
+        if server:
+            server.stop()
+
+    print_stats(stats)
+    checkpoint.clear()
+    print("\n✅ UPLOAD COMPLETED")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Verification Engine
+===================
+
+Counts DESIGNELEMENTS rows per (project, type, block) in one streaming pass,
+for every project listed in PLOTS-PROJECTS:
+1. Total rows and counts per TYPE
+2. Per project: counts per TYPE and per BLOCK (TABLE/INVERTER children)
+3. All PLOT rows (for PLOT presence checks)
+
+Cost is one read of the file regardless of how many projects are verified.
+Writes verification_summary.txt (same format as before) plus a JSON file
+with the per-block detail.
+
+Usage:
+    python verification.py --csv data/CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv --output-dir output
+
+Date: October 18, 2026
+"""
+
+import argparse
+import csv
+import json
+from collections import Counter
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from lookup_builder import load_plots_projects_mapping
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+ELEMENT_TYPES = ('PLOT', 'BLOCK', 'TABLE', 'INVERTER')
+
+# Block name used for children whose parent is not a BLOCK row
+NO_BLOCK = "(no block)"
+
+
+@dataclass
+class ProjectCounts:
+    """Counts for one project."""
+    project_id: str
+    plot_name: Optional[str] = None
+    total: int = 0
+    types: Dict[str, int] = field(default_factory=dict)
+    blocks: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def count(self, element_type: str) -> int:
+        return self.types.get(element_type, 0)
+
+
+@dataclass
+class VerificationResult:
+    """Result of one verification pass."""
+    csv_path: str
+    total_rows: int = 0
+    type_counts: Dict[str, int] = field(default_factory=dict)
+    projects: Dict[str, ProjectCounts] = field(default_factory=dict)
+    plots: List[Dict[str, str]] = field(default_factory=list)
+
+    def project_for_plot(self, plot_name: str) -> Optional[ProjectCounts]:
+        """Get the counts of the project a plot belongs to (case-insensitive)."""
+        for project in self.projects.values():
+            if project.plot_name and project.plot_name.upper() == plot_name.upper():
+                return project
+        return None
+
+
+def load_project_names(plots_projects_csv: Path) -> Dict[str, str]:
+    """
+    Load the projects to verify from PLOTS-PROJECTS.csv.
+
+    Args:
+        plots_projects_csv: Path to CCTECH.DRS.ENTITIES-PLOTS-PROJECTS.csv
+
+    Returns:
+        Dictionary: {PROJECT_ID (lower): PLOT_NAME}, in file order
+    """
+    return {
+        project_id.lower(): plot_name
+        for project_id, plot_name in load_plots_projects_mapping(str(plots_projects_csv)).values()
+    }
+
+
+def verify_design_elements(
+    design_elements_csv: Path,
+    project_names: Optional[Dict[str, str]] = None
+) -> VerificationResult:
+    """
+    Count DESIGNELEMENTS rows per project, type and block in one pass.
+
+    Args:
+        design_elements_csv: Path to DESIGNELEMENTS.csv (or new_design_elements.csv)
+        project_names: {PROJECT_ID (lower): PLOT_NAME} of projects to report;
+            None reports every project found in the file
+
+    Returns:
+        VerificationResult
+    """
+    result = VerificationResult(csv_path=str(design_elements_csv))
+    type_counts: Counter = Counter()
+    project_type_counts: Counter = Counter()          # (project, type)
+    parent_type_counts: Counter = Counter()           # (project, parent id, type)
+    block_names: Dict[Tuple[str, str], str] = {}      # (project, block id) → name
+
+    with open(design_elements_csv, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = [h.strip().upper() for h in next(reader, [])]
+        id_col, project_col, name_col, type_col, parent_col = (
+            header.index(c) for c in ('ID', 'PROJECT_ID', 'NAME', 'TYPE', 'PARENT_ID')
+        )
+        width = max(id_col, project_col, name_col, type_col, parent_col) + 1
+
+        for row in reader:
+            if len(row) < width:
+                continue
+            result.total_rows += 1
+            project_id = row[project_col].strip().lower()
+            element_type = row[type_col].strip()
+            type_counts[element_type] += 1
+            project_type_counts[project_id, element_type] += 1
+
+            if element_type == 'BLOCK':
+                block_names[project_id, row[id_col].strip().lower()] = row[name_col].strip()
+            elif element_type == 'PLOT':
+                result.plots.append({
+                    'ID': row[id_col].strip(),
+                    'PROJECT_ID': row[project_col].strip(),
+                    'NAME': row[name_col].strip(),
+                    'PARENT_ID': row[parent_col].strip()
+                })
+            else:
+                parent_type_counts[project_id, row[parent_col].strip().lower(), element_type] += 1
+
+    result.type_counts = dict(type_counts)
+
+    if project_names is None:
+        project_names = {project_id: None for project_id, _ in project_type_counts}
+    for project_id, plot_name in project_names.items():
+        result.projects[project_id] = ProjectCounts(project_id=project_id, plot_name=plot_name)
+
+    for (project_id, element_type), count in project_type_counts.items():
+        project = result.projects.get(project_id)
+        if project is not None:
+            project.types[element_type] = count
+            project.total += count
+
+    for (project_id, parent_id, element_type), count in parent_type_counts.items():
+        project = result.projects.get(project_id)
+        if project is None:
+            continue
+        block_name = block_names.get((project_id, parent_id), NO_BLOCK)
+        block = project.blocks.setdefault(block_name, {})
+        block[element_type] = block.get(element_type, 0) + count
+
+    for project in result.projects.values():
+        project.blocks = dict(sorted(project.blocks.items()))
+
+    return result
+
+
+def summary_lines(result: VerificationResult) -> List[str]:
+    """
+    Format a result as the lines of verification_summary.txt.
+
+    Args:
+        result: VerificationResult
+
+    Returns:
+        List of lines (without newlines)
+    """
+    lines = [f"Final row count: {result.total_rows}", "Type counts:"]
+    for element_type, count in result.type_counts.items():
+        lines.append(f"  {element_type}: {count}")
+    lines.append("Plot breakdown:")
+    for project in result.projects.values():
+        counts = " ".join(f"{t}={project.count(t)}" for t in ELEMENT_TYPES)
+        lines.append(f"  {project.plot_name or project.project_id}: total={project.total} {counts}")
+    return lines
+
+
+def write_summary(result: VerificationResult, output_dir: Path) -> Tuple[Path, Path]:
+    """
+    Write verification_summary.txt and verification_summary.json.
+
+    Args:
+        result: VerificationResult
+        output_dir: Output folder
+
+    Returns:
+        (text path, JSON path)
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    text_path = output_dir / "verification_summary.txt"
+    json_path = output_dir / "verification_summary.json"
+
+    with open(text_path, 'w', encoding='utf-8') as f:
+        for line in summary_lines(result):
+            f.write(f"{line}\n")
+
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(asdict(result), f, indent=2)
+
+    return text_path, json_path
+
+
+def print_verification(result: VerificationResult):
+    """Print a verification result."""
+    print("="*80)
+    print("FINAL VERIFICATION")
+    print("="*80)
+
+    print(f"\nFinal row count (csv reader): {result.total_rows:,}")
+
+    print(f"\nBreakdown by TYPE:")
+    for element_type, count in result.type_counts.items():
+        print(f"   {element_type}: {count:,}")
+
+    print(f"\nTotal: {sum(result.type_counts.values()):,}")
+
+    print(f"\n{'='*80}")
+    print(f"VERIFICATION: {len(result.projects)} Plot(s) from PLOTS-PROJECTS")
+    print("="*80)
+
+    for project in result.projects.values():
+        marker = "✅" if project.total else "❌"
+        print(f"\n{marker} {project.plot_name or project.project_id}:")
+        print(f"   Total elements: {project.total:,}")
+        print("   " + ", ".join(f"{t}s: {project.count(t)}" for t in ELEMENT_TYPES))
+
+
+def main():
+    """Main entry point."""
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+
+    parser = argparse.ArgumentParser(description="Verify DESIGNELEMENTS counts per project, type and block.")
+    parser.add_argument("--csv", default=None, help="DESIGNELEMENTS.csv to verify.")
+    parser.add_argument("--plots-projects", default=None, help="PLOTS-PROJECTS.csv listing the projects to verify.")
+    parser.add_argument("--output-dir", default=None, help="Folder for verification_summary.txt/.json.")
+    args = parser.parse_args()
+
+    data_path = base_path / "data"
+    csv_path = Path(args.csv) if args.csv else data_path / "CCTECH.DRS.ENTITIES-DESIGNELEMENTS.csv"
+    plots_projects_csv = Path(args.plots_projects) if args.plots_projects else data_path / "CCTECH.DRS.ENTITIES-PLOTS-PROJECTS.csv"
+    output_dir = Path(args.output_dir) if args.output_dir else base_path / "output"
+
+    result = verify_design_elements(csv_path, load_project_names(plots_projects_csv))
+    print_verification(result)
+
+    text_path, json_path = write_summary(result, output_dir)
+    print(f"\n💾 Summary written to: {text_path}")
+    print(f"💾 Details written to: {json_path}")
+
+
+if __name__ == "__main__":
+    main()
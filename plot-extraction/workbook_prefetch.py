@@ -0,0 +1,160 @@
+"""
+Workbook Prefetch
+=================
+
+Thread-pool stage that inflates the next workbooks of an extraction into
+memory while the current one is parsed:
+1. An .xlsx is a zip, and decompressing its sheet XML and shared strings is
+   most of the cost of opening it; zlib (and file reads) release the GIL,
+   so threads decompress in parallel without spawning processes
+2. inflate_workbook() reads a workbook once and rewrites the members the
+   sheet reader needs into an uncompressed (stored) in-memory zip
+3. prefetch_workbooks() keeps up to `depth` workbooks in flight on a
+   ThreadPoolExecutor and yields them in their original order
+
+The in-memory zip is opened by openpyxl, fingerprint_workbook and
+sheet_xml_size like the file itself, so the parsed rows are the same.
+Images, drawings and printer settings are left out; the read-only sheet
+reader never opens them.
+
+Date: October 18, 2026
+"""
+
+import io
+import os
+import re
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+
+# Workbooks in flight per prefetch thread
+PREFETCH_DEPTH_PER_WORKER = 2
+
+# Members the read-only sheet reader never opens
+_SKIPPED_MEMBER = re.compile(r'^(xl/(media|drawings|printerSettings|embeddings)/|docProps/thumbnail)')
+
+
+@dataclass
+class InflatedWorkbook:
+    """A workbook read and decompressed ahead of parsing."""
+    path: Path                  # or a drawing_archive.ArchivePath
+    data: bytes                 # stored zip with the members the reader needs
+    size: int                   # of the .xlsx file when it was read
+    mtime: float
+    sheet_xml_bytes: int        # uncompressed sheet XML + shared strings
+    seconds: float              # read + inflate time (in a prefetch thread)
+
+    def open(self) -> io.BytesIO:
+        """A fresh file object over the in-memory zip."""
+        return io.BytesIO(self.data)
+
+
+def inflate_workbook(excel_path: Path) -> InflatedWorkbook:
+    """
+    Read a workbook and decompress the members the sheet reader needs.
+
+    Args:
+        excel_path: Path to .xlsx file
+
+    Returns:
+        InflatedWorkbook
+    """
+    started = time.perf_counter()
+    with open(excel_path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        raw = f.read()
+    return inflate_workbook_data(excel_path, raw, stat.st_size, stat.st_mtime, started)
+
+
+def inflate_workbook_data(
+    excel_path,
+    raw: bytes,
+    size: int,
+    mtime: float,
+    started: Optional[float] = None
+) -> InflatedWorkbook:
+    """
+    Decompress the members the sheet reader needs from a workbook's bytes.
+
+    Args:
+        excel_path: Where the bytes came from (a Path, or an archive member)
+        raw: The .xlsx file contents
+        size: File size to record
+        mtime: Modification time to record
+        started: perf_counter() when reading began (default: now)
+
+    Returns:
+        InflatedWorkbook
+    """
+    if started is None:
+        started = time.perf_counter()
+    sheet_xml_bytes = 0
+    out = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(raw)) as source, zipfile.ZipFile(out, 'w', zipfile.ZIP_STORED) as target:
+        for info in source.infolist():
+            if info.is_dir() or _SKIPPED_MEMBER.match(info.filename):
+                continue
+            if (info.filename.startswith('xl/worksheets/') and info.filename.endswith('.xml')) \
+                    or info.filename == 'xl/sharedStrings.xml':
+                sheet_xml_bytes += info.file_size
+            stored = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+            target.writestr(stored, source.read(info))
+
+    return InflatedWorkbook(
+        path=excel_path,
+        data=out.getvalue(),
+        size=size,
+        mtime=mtime,
+        sheet_xml_bytes=sheet_xml_bytes,
+        seconds=time.perf_counter() - started
+    )
+
+
+def prefetch_workbooks(
+    excel_paths: Iterable[Path],
+    executor: Executor,
+    depth: int,
+    loader: Callable[[Path], InflatedWorkbook] = inflate_workbook
+) -> Iterator[Tuple[Path, Optional[InflatedWorkbook]]]:
+    """
+    Inflate workbooks ahead of the consumer, in order.
+
+    A workbook that cannot be read or inflated is yielded with None, so the
+    consumer opens the file itself and reports the error as usual.
+
+    Args:
+        excel_paths: Workbooks in processing order
+        executor: Thread pool running the loader
+        depth: Workbooks in flight (including the one being yielded)
+        loader: Reads and inflates one workbook (default: inflate_workbook)
+
+    Yields:
+        (excel_path, InflatedWorkbook or None)
+    """
+    paths = iter(excel_paths)
+    pending = deque()
+    for excel_path in paths:
+        pending.append((excel_path, executor.submit(loader, excel_path)))
+        if len(pending) >= max(1, depth):
+            break
+
+    try:
+        while pending:
+            excel_path, future = pending.popleft()
+            next_path = next(paths, None)
+            if next_path is not None:
+                pending.append((next_path, executor.submit(loader, next_path)))
+            try:
+                inflated = future.result()
+            except Exception:
+                inflated = None
+            yield excel_path, inflated
+    finally:
+        # Consumer stopped early: drop what has not started yet
+        for _, future in pending:
+            future.cancel()
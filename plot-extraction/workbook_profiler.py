@@ -0,0 +1,422 @@
+"""
+Workbook Schema Profiler
+========================
+
+Profiles every _DWGData.xlsx under drawing_data/ in parallel, one streaming
+pass per workbook, and writes a corpus report (JSON + CSV):
+1. Sheet names, declared dimension vs real used rows/columns
+2. Header values (row 1)
+3. Per column: value-pattern histogram (TABLE / INVERTER / other names,
+   numbers, missing or mismatched block prefixes)
+4. Blank rows inside the data and empty trailing rows
+
+Header variants and pattern outliers across the corpus are summarized, so
+schema drift in a new phase shows up at a glance.
+
+Usage:
+    python workbook_profiler.py --drawing-data-path drawing_data --output-dir output --workers 4
+
+Date: October 18, 2026
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import openpyxl
+
+from transform_logic import (
+    folder_to_plot_name,
+    filename_to_block_name,
+    filename_to_plot_name,
+    ExtractionFilter,
+    TransformationError
+)
+
+# ASCII-safe print wrapper to avoid UnicodeEncodeError on Windows consoles
+import builtins as _b
+def _safe_print(*args, **kwargs):
+    safe_args = [str(a).encode('ascii','ignore').decode() for a in args]
+    return _b.print(*safe_args, **kwargs)
+print = _safe_print
+
+
+# Same prefix rule as transform_logic.extract_clean_name
+_PREFIX = re.compile(r'^B(O)?(\d+)-(.+)$', re.IGNORECASE)
+_TABLE = re.compile(r'^R\d+-[ST]\d+$', re.IGNORECASE)
+_INVERTER = re.compile(r'^I\d+$', re.IGNORECASE)
+
+# Sample values kept per column for unusual patterns
+MAX_SAMPLES = 3
+
+
+@dataclass
+class ColumnProfile:
+    """Value patterns of one column (data rows only)."""
+    index: int
+    header: Optional[str]
+    non_empty: int = 0
+    patterns: Dict[str, int] = field(default_factory=dict)
+    samples: Dict[str, List[str]] = field(default_factory=dict)
+
+
+@dataclass
+class SheetProfile:
+    """One worksheet."""
+    name: str
+    declared_rows: Optional[int]
+    declared_columns: Optional[int]
+    rows_scanned: int = 0
+    used_rows: int = 0
+    used_columns: int = 0
+    blank_rows_inside: int = 0
+    trailing_empty_rows: int = 0
+    header: List[Optional[str]] = field(default_factory=list)
+    columns: List[ColumnProfile] = field(default_factory=list)
+
+
+@dataclass
+class WorkbookProfile:
+    """One workbook."""
+    key: str
+    folder: str
+    filename: str
+    size: int
+    plot_name: Optional[str]
+    filename_plot: Optional[str]
+    block_name: Optional[str]
+    active_sheet: Optional[str] = None
+    sheets: List[SheetProfile] = field(default_factory=list)
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def classify_value(value, block_number: Optional[int]) -> List[str]:
+    """
+    Classify a cell value for the pattern histogram.
+
+    Args:
+        value: Cell value (non-empty)
+        block_number: Block number from the filename (for prefix checks)
+
+    Returns:
+        Pattern labels: one of TABLE/INVERTER/OTHER_NAME/NUMBER, plus prefix
+        labels (NO_PREFIX, PREFIX_MISMATCH, BO_PREFIX) and WHITESPACE
+
+    Examples:
+        >>> classify_value('B01-R42-S01', 1)
+        ['TABLE']
+        >>> classify_value('B02-I45', 1)
+        ['INVERTER', 'PREFIX_MISMATCH']
+        >>> classify_value('BO4-R31-S01', 4)
+        ['TABLE', 'BO_PREFIX']
+        >>> classify_value('R1-S1 ', None)
+        ['TABLE', 'NO_PREFIX', 'WHITESPACE']
+        >>> classify_value(12.5, 1)
+        ['NUMBER']
+    """
+    if isinstance(value, (int, float)):
+        return ['NUMBER']
+
+    text = str(value)
+    stripped = text.strip()
+    labels = []
+    match = _PREFIX.match(stripped)
+    name = match.group(3) if match else stripped
+
+    if _TABLE.match(name):
+        labels.append('TABLE')
+    elif _INVERTER.match(name):
+        labels.append('INVERTER')
+    else:
+        labels.append('OTHER_NAME')
+
+    if not match:
+        labels.append('NO_PREFIX')
+    else:
+        if block_number is not None and int(match.group(2)) != block_number:
+            labels.append('PREFIX_MISMATCH')
+        if match.group(1):
+            labels.append('BO_PREFIX')
+
+    if text != stripped:
+        labels.append('WHITESPACE')
+    return labels
+
+
+def profile_workbook(excel_path: Path) -> WorkbookProfile:
+    """
+    Profile one workbook in a single streaming pass per sheet.
+
+    The declared dimension is recorded, then ignored (reset_dimensions), so
+    rows beyond a wrong dimension tag are still seen.
+
+    Args:
+        excel_path: Path to .xlsx file
+
+    Returns:
+        WorkbookProfile (error set if the file could not be read)
+    """
+    excel_path = Path(excel_path)
+    block_name = filename_to_block_name(excel_path.name)
+    block_number = int(block_name[2:]) if block_name else None
+    profile = WorkbookProfile(
+        key=f"{excel_path.parent.name}/{excel_path.name}",
+        folder=excel_path.parent.name,
+        filename=excel_path.name,
+        size=excel_path.stat().st_size,
+        plot_name=folder_to_plot_name(excel_path.parent.name),
+        filename_plot=filename_to_plot_name(excel_path.name),
+        block_name=block_name
+    )
+
+    started = time.perf_counter()
+    try:
+        wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    except Exception as e:
+        profile.error = f"{type(e).__name__}: {e}"
+        return profile
+
+    try:
+        profile.active_sheet = wb.active.title if wb.active is not None else None
+        for ws in wb.worksheets:
+            sheet = SheetProfile(
+                name=ws.title,
+                declared_rows=ws.max_row,
+                declared_columns=ws.max_column
+            )
+            ws.reset_dimensions()
+
+            columns: Dict[int, ColumnProfile] = {}
+            blank_streak = 0
+            for row_idx, row in enumerate(ws.iter_rows(values_only=True), start=1):
+                sheet.rows_scanned = row_idx
+                filled = [(i, v) for i, v in enumerate(row, start=1) if v is not None and str(v).strip()]
+                if row_idx == 1:
+                    sheet.header = [None if v is None else str(v).strip() for v in row]
+                    if filled:
+                        sheet.used_rows = 1
+                        sheet.used_columns = filled[-1][0]
+                    continue
+                if not filled:
+                    blank_streak += 1
+                    continue
+
+                sheet.blank_rows_inside += blank_streak
+                blank_streak = 0
+                sheet.used_rows = row_idx
+                sheet.used_columns = max(sheet.used_columns, filled[-1][0])
+
+                for col_idx, value in filled:
+                    column = columns.get(col_idx)
+                    if column is None:
+                        header = sheet.header[col_idx - 1] if col_idx <= len(sheet.header) else None
+                        column = columns[col_idx] = ColumnProfile(index=col_idx, header=header)
+                    column.non_empty += 1
+                    for label in classify_value(value, block_number):
+                        column.patterns[label] = column.patterns.get(label, 0) + 1
+                        if label in ('OTHER_NAME', 'PREFIX_MISMATCH', 'NUMBER'):
+                            samples = column.samples.setdefault(label, [])
+                            if len(samples) < MAX_SAMPLES:
+                                samples.append(str(value))
+
+            sheet.trailing_empty_rows = blank_streak
+            sheet.columns = [columns[i] for i in sorted(columns)]
+            profile.sheets.append(sheet)
+    except Exception as e:
+        profile.error = f"{type(e).__name__}: {e}"
+    finally:
+        wb.close()
+
+    profile.seconds = time.perf_counter() - started
+    return profile
+
+
+def summarize_corpus(profiles: List[WorkbookProfile]) -> Dict:
+    """
+    Summarize schema variants and outliers across workbooks.
+
+    Args:
+        profiles: WorkbookProfile list
+
+    Returns:
+        Dictionary with header/sheet variants, totals and per-file issues
+    """
+    header_variants = Counter()
+    sheet_variants = Counter()
+    pattern_totals = Counter()
+    issues: Dict[str, List[str]] = {}
+
+    for profile in profiles:
+        problems = []
+        if profile.error:
+            problems.append(profile.error)
+        if not profile.filename_plot:
+            problems.append("No plot name in filename")
+        elif profile.plot_name and profile.plot_name.upper() != profile.filename_plot.upper():
+            problems.append(f"Plot mismatch: folder={profile.plot_name}, file={profile.filename_plot}")
+        if not profile.block_name:
+            problems.append("No block name in filename")
+
+        sheet_variants[tuple(s.name for s in profile.sheets)] += 1
+        for sheet in profile.sheets:
+            header = tuple(h for h in sheet.header[:sheet.used_columns])
+            if sheet.name == profile.active_sheet:
+                header_variants[header] += 1
+            for column in sheet.columns:
+                pattern_totals.update(column.patterns)
+                for label in ('OTHER_NAME', 'PREFIX_MISMATCH', 'NO_PREFIX', 'NUMBER', 'WHITESPACE'):
+                    if column.patterns.get(label):
+                        problems.append(f"{sheet.name} col {column.index} ({column.header}): {column.patterns[label]} {label}")
+            if sheet.declared_rows is not None and sheet.declared_rows != sheet.used_rows:
+                problems.append(f"{sheet.name}: declared {sheet.declared_rows} rows, data ends at {sheet.used_rows}")
+        if problems:
+            issues[profile.key] = problems
+
+    majority_header = header_variants.most_common(1)[0][0] if header_variants else ()
+    return {
+        'workbooks': len(profiles),
+        'rows_scanned': sum(s.rows_scanned for p in profiles for s in p.sheets),
+        'used_rows': sum(s.used_rows for p in profiles for s in p.sheets),
+        'header_variants': [{'header': list(h), 'files': c} for h, c in header_variants.most_common()],
+        'majority_header': list(majority_header),
+        'sheet_name_variants': [{'sheets': list(s), 'files': c} for s, c in sheet_variants.most_common()],
+        'pattern_totals': dict(pattern_totals),
+        'issues': issues
+    }
+
+
+def profile_corpus(drawing_data_path: Path, workers: Optional[int] = None,
+                   selection: Optional[ExtractionFilter] = None) -> List[WorkbookProfile]:
+    """
+    Profile every selected workbook under drawing_data/.
+
+    Args:
+        drawing_data_path: Path to drawing_data/ folder
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        selection: Optional ExtractionFilter limiting plots/blocks/files
+
+    Returns:
+        WorkbookProfile list in folder/file order
+    """
+    selection = selection or ExtractionFilter()
+    files = [f for files in selection.select_files(drawing_data_path).values() for f in files]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(files) < 2:
+        return [profile_workbook(f) for f in files]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(files))) as pool:
+        return list(pool.map(profile_workbook, files, chunksize=4))
+
+
+def write_reports(profiles: List[WorkbookProfile], summary: Dict, output_dir: Path):
+    """
+    Write workbook_profile.json and workbook_profile.csv (one row per sheet).
+
+    Args:
+        profiles: WorkbookProfile list
+        summary: Output of summarize_corpus()
+        output_dir: Output folder
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with open(output_dir / "workbook_profile.json", 'w', encoding='utf-8') as f:
+        json.dump({
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'summary': summary,
+            'workbooks': [asdict(p) for p in profiles]
+        }, f, indent=1)
+
+    labels = sorted({label for p in profiles for s in p.sheets for c in s.columns for label in c.patterns})
+    with open(output_dir / "workbook_profile.csv", 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['FILE', 'SHEET', 'ACTIVE', 'DECLARED_ROWS', 'USED_ROWS', 'ROWS_SCANNED',
+                         'TRAILING_EMPTY_ROWS', 'BLANK_ROWS_INSIDE', 'USED_COLUMNS', 'HEADER'] + labels + ['ERROR'])
+        for profile in profiles:
+            if not profile.sheets:
+                writer.writerow([profile.key] + [''] * (9 + len(labels)) + [profile.error or ''])
+            for sheet in profile.sheets:
+                totals = Counter()
+                for column in sheet.columns:
+                    totals.update(column.patterns)
+                writer.writerow([
+                    profile.key, sheet.name, sheet.name == profile.active_sheet,
+                    sheet.declared_rows, sheet.used_rows, sheet.rows_scanned,
+                    sheet.trailing_empty_rows, sheet.blank_rows_inside, sheet.used_columns,
+                    ' | '.join('' if h is None else h for h in sheet.header[:sheet.used_columns])
+                ] + [totals.get(label, 0) for label in labels] + [profile.error or ''])
+
+
+def print_summary(summary: Dict, seconds: float, max_issues: int = 20):
+    """Print the corpus summary."""
+    print("="*80)
+    print("WORKBOOK SCHEMA PROFILE")
+    print("="*80)
+    print(f"\n📄 Workbooks: {summary['workbooks']} in {seconds:.2f} s")
+    print(f"   Rows scanned: {summary['rows_scanned']:,} (data ends after {summary['used_rows']:,})")
+
+    print(f"\n📋 Header variants (active sheet):")
+    for variant in summary['header_variants']:
+        print(f"   {variant['files']:>4} file(s): {variant['header']}")
+
+    print(f"\n📋 Sheet name variants:")
+    for variant in summary['sheet_name_variants']:
+        print(f"   {variant['files']:>4} file(s): {variant['sheets']}")
+
+    print(f"\n🔍 Value patterns:")
+    for label, count in sorted(summary['pattern_totals'].items()):
+        print(f"   {label:<16} {count:,}")
+
+    issues = summary['issues']
+    if not issues:
+        print(f"\n✅ No schema drift or pattern outliers found")
+        return
+    print(f"\n⚠️  {len(issues)} workbook(s) with findings:")
+    for key, problems in list(issues.items())[:max_issues]:
+        print(f"   {key}")
+        for problem in problems[:5]:
+            print(f"      - {problem}")
+    if len(issues) > max_issues:
+        print(f"   ... and {len(issues) - max_issues} more (see workbook_profile.json)")
+
+
+def main():
+    """Main entry point."""
+    base_path = Path(r"c:\Users\Shamshad choudhary\Documents\Pulse-Data-Uploading-Scripts\plot-extraction")
+
+    parser = argparse.ArgumentParser(description="Profile the schema of every drawing workbook.")
+    parser.add_argument("--drawing-data-path", default=None, help="Override path to drawing_data folder.")
+    parser.add_argument("--output-dir", default=None, help="Folder for workbook_profile.json/.csv.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--plot", default=None, help="Only these plots (comma separated).")
+    parser.add_argument("--block", default=None, help="Only these blocks (comma separated).")
+    parser.add_argument("--files", default=None, help="Only workbooks matching this glob.")
+    args = parser.parse_args()
+
+    drawing_data_path = Path(args.drawing_data_path) if args.drawing_data_path else base_path / "drawing_data"
+    output_dir = Path(args.output_dir) if args.output_dir else base_path / "output"
+    try:
+        selection = ExtractionFilter.from_args(args.plot, args.block, args.files)
+    except TransformationError as e:
+        parser.error(str(e))
+
+    started = time.perf_counter()
+    profiles = profile_corpus(drawing_data_path, workers=args.workers, selection=selection)
+    summary = summarize_corpus(profiles)
+    seconds = time.perf_counter() - started
+
+    print_summary(summary, seconds)
+    write_reports(profiles, summary, output_dir)
+    print(f"\n💾 Report written to: {output_dir / 'workbook_profile.json'} (+ .csv)")
+
+
+if __name__ == "__main__":
+    main()